@@ -0,0 +1,90 @@
+import jwt
+from django.conf import settings
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from .utils import metrics
+from .utils.server_timing import get_server_timing
+from .utils.token_cache import get_token_cache
+
+# Accepted without a signature while DEBUG is on, for local frontend testing
+DEV_TEST_TOKEN = 'test-token'
+DEV_TEST_CLAIMS = {'user_id': 'test_user', 'role': 'service_role'}
+
+
+class TokenUser:
+    """
+    In-memory principal built from verified JWT claims.
+
+    Nothing is looked up in the user table; the claims are the whole identity.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+    is_staff = False
+    is_superuser = False
+
+    def __init__(self, claims):
+        self.claims = claims
+        self.id = self.pk = claims.get('user_id')
+        self.username = str(self.id)
+        self.role = claims.get('role')
+
+    def __str__(self):
+        return self.username
+
+    def __eq__(self, other):
+        return isinstance(other, TokenUser) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+def verify_token(token):
+    """Return the verified claims of ``token``, or None if it is not valid"""
+    # In dev mode, accept test-token
+    if settings.DEBUG and token == DEV_TEST_TOKEN:
+        return dict(DEV_TEST_CLAIMS)
+
+    # Tokens verified earlier are answered from the cache
+    cache = get_token_cache()
+    claims = cache.get(token, settings.JWT_SECRET)
+    if claims is not None:
+        metrics.inc('jwt_verify_cache_total', {'result': 'hit'})
+        return claims
+    metrics.inc('jwt_verify_cache_total', {'result': 'miss'})
+
+    try:
+        claims = jwt.decode(token, settings.JWT_SECRET, algorithms=['HS256'])
+    except jwt.InvalidTokenError:
+        return None
+    cache.put(token, settings.JWT_SECRET, claims)
+    return claims
+
+
+class StatelessJWTAuthentication(BaseAuthentication):
+    """
+    Authenticate ``Authorization: Bearer <token>`` without touching the database.
+
+    Requests without a bearer token stay anonymous so views can decide how to
+    answer; a bearer token that fails verification is rejected with 401.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        parts = header.split(' ')
+        if len(parts) != 2 or parts[0] != self.keyword or not parts[1]:
+            return None
+
+        token = parts[1]
+        with get_server_timing(request).measure('auth', 'Token check'):
+            claims = verify_token(token)
+        if claims is None:
+            raise AuthenticationFailed({
+                "error": "Invalid token",
+                "message": "Please provide a valid token"
+            })
+        return TokenUser(claims), token
+
+    def authenticate_header(self, request):
+        return f'{self.keyword} realm="api"'
@@ -0,0 +1,21 @@
+"""
+Micro-benchmarks run with ``python manage.py benchmark [name ...]``.
+
+Each module listed in ``BENCHMARKS`` exposes ``run(iterations)`` returning a
+list of result rows (dicts) that the command prints as a table. The
+``endpoints`` cases also run under pytest against a stored baseline (see
+``api_app/tests/benchmarks``).
+"""
+
+BENCHMARKS = {
+    'jwt_batch': 'api_app.benchmarks.jwt_batch',
+    'user_store': 'api_app.benchmarks.user_store',
+    'password_offload': 'api_app.benchmarks.password_offload',
+    'middleware_stack': 'api_app.benchmarks.middleware_stack',
+    'worker_classes': 'api_app.benchmarks.worker_classes',
+    'json_encoding': 'api_app.benchmarks.json_encoding',
+    'constant_responses': 'api_app.benchmarks.constant_responses',
+    'compression': 'api_app.benchmarks.compression',
+    'throttle': 'api_app.benchmarks.throttle',
+    'endpoints': 'api_app.benchmarks.endpoints',
+}
@@ -0,0 +1,75 @@
+"""
+Stored benchmark baselines and the regression check against them.
+
+Timings are stored as measured and divided by the time of a fixed
+calibration workload, and compared on the latter. A baseline recorded on a
+laptop therefore still means something on a slower CI machine.
+"""
+import json
+import os
+import platform
+from .timing import time_per_call
+
+CALIBRATION_ITERATIONS = 2000
+
+
+def _calibration_work():
+    # Mixed interpreter work (loops, dicts, strings) like a view's own code
+    items = {str(i): i * i for i in range(50)}
+    return sorted(items, key=items.get)
+
+
+def calibrate(iterations=CALIBRATION_ITERATIONS):
+    """Return seconds per call of the calibration workload on this machine"""
+    return time_per_call(_calibration_work, iterations)
+
+
+def load_baseline(path):
+    """Return the stored baseline, or None if there is none yet"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, timings, calibration):
+    """Store ``timings`` (case -> seconds per call) measured alongside ``calibration``"""
+    baseline = {
+        'python': platform.python_version(),
+        'calibration_us': round(calibration * 1e6, 3),
+        'cases': {
+            name: {'per_call_us': round(seconds * 1e6, 3), 'relative': round(seconds / calibration, 3)}
+            for name, seconds in sorted(timings.items())
+        },
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+    return baseline
+
+
+def find_regressions(baseline, timings, calibration, threshold):
+    """
+    Return the cases in ``timings`` slower than the baseline by more than ``threshold``.
+
+    ``threshold`` is a fraction: 0.3 flags a case 30% slower than its stored
+    time, after both are scaled by their machine's calibration time. Cases
+    missing from the baseline are not checked.
+    """
+    regressions = []
+    for name, seconds in timings.items():
+        stored = baseline['cases'].get(name)
+        if stored is None:
+            continue
+        relative = seconds / calibration
+        change = relative / stored['relative'] - 1
+        if change > threshold:
+            regressions.append({
+                'case': name,
+                'baseline_us': stored['per_call_us'],
+                'per_call_us': round(seconds * 1e6, 3),
+                'change': f"{change:+.0%}",
+            })
+    return regressions
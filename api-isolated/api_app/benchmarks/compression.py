@@ -0,0 +1,83 @@
+import itertools
+from django.conf import settings
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from ..utils import compression
+from ..views.generate_jwt_token import generate_jwt_token
+from .timing import time_per_call
+
+# (label, encoding, level); the middleware's defaults are gzip 6 and br 4
+SETTINGS = [
+    ('gzip-1', 'gzip', {'gzip_level': 1}),
+    ('gzip-6', 'gzip', {'gzip_level': 6}),
+    ('br-4', 'br', {'brotli_quality': 4}),
+    ('br-11', 'br', {'brotli_quality': 11}),
+]
+BULK_USERS = 50
+
+
+def _payloads():
+    """Uncompressed bodies of the API's real responses, largest first"""
+    client = Client()
+    token = generate_jwt_token()
+    usernames = (f"bench_gzip_{i}" for i in itertools.count())
+    auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    def body(response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    # Cheap inline hashing: only the response bytes matter here
+    with override_settings(PASSWORD_HASH_ITERATIONS=1000, PASSWORD_HASH_OFFLOAD=False):
+        bulk = body(client.post(
+            reverse('test_user_lifecycle_bulk') + '?timings=1',
+            [{'username': next(usernames), 'password': 'pw'} for _ in range(BULK_USERS)],
+            content_type='application/json', **auth
+        ))
+        lifecycle = body(client.post(
+            reverse('test_user_lifecycle'),
+            {'username': next(usernames), 'password': 'pw'},
+            content_type='application/json', **auth
+        ))
+    return [
+        ('GET /api/auth/token/?count=100', body(client.get(reverse('get_test_token'), {'count': 100}))),
+        (f'POST /api/auth/test/bulk/ ({BULK_USERS} users)', bulk),
+        ('GET /api/metrics/', body(client.get(reverse('metrics')))),
+        ('POST /api/auth/test/', lifecycle),
+        ('GET /api/', body(client.get(reverse('index')))),
+    ]
+
+
+def run(iterations):
+    """CPU cost per response against bytes saved, for each encoding and level"""
+    available = compression.available_encodings()
+    rows = []
+    for label, data in _payloads():
+        if len(data) < settings.COMPRESSION_MIN_SIZE:
+            rows.append({'payload': label, 'bytes': len(data), 'encoding': f'none (< {settings.COMPRESSION_MIN_SIZE})'})
+            continue
+        cases = [
+            (name, lambda encoding=encoding, levels=levels: compression.compress(data, encoding, **levels))
+            for name, encoding, levels in SETTINGS if encoding in available
+        ]
+        if label.startswith('POST /api/auth/test/bulk/'):
+            # What the middleware really does to the stream: flush every line
+            lines = data.splitlines(keepends=True)
+            cases += [
+                (f'{encoding} per line', lambda encoding=encoding: b''.join(compression.stream_compressor(lines, encoding)))
+                for encoding in available
+            ]
+        for name, compress in cases:
+            compressed = compress()
+            per_call = time_per_call(compress, iterations)
+            saved = len(data) - len(compressed)
+            rows.append({
+                'payload': label,
+                'bytes': len(data),
+                'encoding': name,
+                'compressed': len(compressed),
+                'saved_pct': f"{100 * saved / len(data):.0f}",
+                'cpu_us': f"{per_call * 1e6:.1f}",
+                'us_per_kb_saved': f"{per_call * 1e6 / (saved / 1024):.1f}" if saved > 0 else '',
+            })
+    return rows
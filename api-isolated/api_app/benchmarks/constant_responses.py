@@ -0,0 +1,30 @@
+from django.test import Client, RequestFactory
+from ..views.get_api_message import APITest, api_message
+from .timing import time_per_call
+
+
+def run(iterations):
+    """Compare DRF dispatch with the pre-encoded view, at the view and through the stack"""
+    factory = RequestFactory()
+    client = Client()
+    drf_view = APITest.as_view()
+    revalidate = {'HTTP_IF_NONE_MATCH': api_message.etag}
+    # Requests are built once so the view columns time the views alone
+    plain, conditional = factory.get('/api/'), factory.get('/api/', **revalidate)
+
+    cases = [
+        ('APITest (DRF)', lambda: drf_view(plain), None),
+        ('api_message', lambda: api_message(plain), lambda: client.get('/api/')),
+        ('api_message 304', lambda: api_message(conditional), lambda: client.get('/api/', **revalidate)),
+    ]
+    baseline = time_per_call(cases[0][1], iterations)
+    rows = []
+    for label, view_call, client_call in cases:
+        per_view = time_per_call(view_call, iterations)
+        rows.append({
+            'path': label,
+            'view_us': f"{per_view * 1e6:.1f}",
+            'full_stack_us': f"{time_per_call(client_call, iterations) * 1e6:.1f}" if client_call else '',
+            'speedup': f"{baseline / per_view:.1f}x",
+        })
+    return rows
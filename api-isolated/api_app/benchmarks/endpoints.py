@@ -0,0 +1,115 @@
+import itertools
+import time
+from contextlib import contextmanager
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+from ..authentication import verify_token
+from ..utils import supabase_prober
+from ..utils.supabase_prober import SupabaseProber
+from ..views.generate_jwt_token import generate_jwt_token
+from ..views.generate_user_lifecycle import run_lifecycle
+from ..views.get_api_message import APITest
+from ..views.get_supabase_health import snapshot_response
+from .timing import time_per_call
+
+
+def _healthy_snapshot():
+    return {
+        'connected': True,
+        'error': '',
+        'checked_at': time.time(),
+        'checked_monotonic': time.monotonic(),
+        'latency_ms': 1.0,
+        'bytes_transferred': 0,
+        'strategy': 'head',
+        'circuit_state': 'closed',
+    }
+
+
+def _usernames(prefix):
+    return (f"{prefix}_{time.monotonic_ns()}_{i}" for i in itertools.count())
+
+
+def _lifecycle_request(client, token):
+    url = reverse('test_user_lifecycle')
+    usernames = _usernames('bench_view')
+    return lambda: client.post(
+        url,
+        {'username': next(usernames), 'password': 'pw'},
+        content_type='application/json',
+        HTTP_AUTHORIZATION=f'Bearer {token}'
+    )
+
+
+def _lifecycle_call(client, token):
+    usernames = _usernames('bench_call')
+    return lambda: run_lifecycle(next(usernames), 'pw')
+
+
+def _api_test_view(client, token):
+    # No longer routed (api_message serves its URLs), so called directly
+    view, request = APITest.as_view(), APIRequestFactory().get('/api/test/')
+    return lambda: view(request)
+
+
+# name -> (divisor of the iteration count, factory taking a Client and a token)
+CASES = {
+    'APITest': (10, _api_test_view),
+    'GET /api/': (10, lambda client, token: lambda: client.get(reverse('index'))),
+    'GET /api/health/': (10, lambda client, token: lambda: client.get(reverse('health_check'))),
+    'GET /api/auth/token/': (10, lambda client, token: lambda: client.get(reverse('get_test_token'))),
+    'POST /api/auth/test/': (50, _lifecycle_request),
+    'generate_jwt_token()': (1, lambda client, token: generate_jwt_token),
+    'verify_token() cached': (1, lambda client, token: lambda: verify_token(token)),
+    'snapshot_response()': (1, lambda client, token: lambda: snapshot_response(_healthy_snapshot())),
+    'run_lifecycle()': (50, _lifecycle_call),
+}
+
+
+@contextmanager
+def benchmark_environment():
+    """
+    Settings and a canned Supabase snapshot that keep the cases off the network.
+
+    Password hashing is cheap and inline and throttling is off, so the
+    lifecycle and token cases time the views rather than PBKDF2 or 429s.
+    """
+    prober = SupabaseProber(interval=3600, probe=_healthy_snapshot)
+    original = supabase_prober._prober
+    supabase_prober._prober = prober
+    try:
+        with override_settings(
+            PASSWORD_HASH_ITERATIONS=1000,
+            PASSWORD_HASH_OFFLOAD=False,
+            THROTTLE_ENABLED=False,
+            SUPABASE_URL='https://benchmark.supabase.co',
+            SUPABASE_KEY='benchmark-key',
+        ):
+            yield
+    finally:
+        prober.stop()
+        supabase_prober._prober = original
+
+
+def measure(iterations, names=None):
+    """Return best-of-5 seconds per call for each case (or just ``names``)"""
+    timings = {}
+    with benchmark_environment():
+        client, token = Client(), generate_jwt_token()
+        for name in names or CASES:
+            divisor, factory = CASES[name]
+            call = factory(client, token)
+            # The first call builds middleware chains and fills caches
+            call()
+            timings[name] = time_per_call(call, max(iterations // divisor, 1))
+    return timings
+
+
+def run(iterations):
+    """Time the main views through the test client and their hot functions directly"""
+    return [
+        {'case': name, 'per_call_us': f"{seconds * 1e6:.1f}"}
+        for name, seconds in measure(iterations).items()
+    ]
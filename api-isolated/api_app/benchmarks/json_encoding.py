@@ -0,0 +1,87 @@
+import io
+import json
+import time
+from django.http import JsonResponse
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from ..parsers import FastJSONParser
+from ..renderers import FastJSONRenderer
+from ..utils import fast_json
+from ..utils.fast_json import FastJsonResponse
+from ..views.generate_jwt_token import token_request
+from ..views.get_supabase_health import snapshot_response
+from .timing import time_per_call
+
+
+def _payloads():
+    """(endpoint, encoder family, body) for the body each endpoint actually sends"""
+    batch, _ = token_request({'count': 100})
+    health, _ = snapshot_response({
+        'connected': True,
+        'error': '',
+        'checked_at': time.time(),
+        'checked_monotonic': time.monotonic(),
+        'latency_ms': 12.5,
+        'strategy': 'head',
+        'bytes_transferred': 312,
+    })
+    return [
+        ('GET /api/', 'django', {"message": "API is working!"}),
+        ('404 handler', 'django', {'error': '404 error, Not Found'}),
+        ('GET /api/test-config/', 'django', {
+            'supabase_url': 'https://example.supabase.co',
+            'has_key': True,
+            'has_jwt_secret': True,
+            'has_anon_key': False,
+            'env_file_loaded': True,
+            'transport': {'pool_connections': 10, 'pool_maxsize': 20, 'retries': 2, 'connect_timeout': 3.05, 'read_timeout': 10.0},
+        }),
+        ('GET /api/health/', 'drf', health),
+        ('GET /api/auth/token/', 'drf', token_request({})[0]),
+        ('GET /api/auth/token/?count=100', 'drf', batch),
+        ('POST /api/auth/test/', 'drf', {
+            "message": "User lifecycle test completed successfully",
+            "details": {
+                "signup": "success", "signin": "success", "delete": "success",
+                "timings_ms": {"auth": 0.05, "signup": 41.2, "signin": 40.9, "delete": 0.01},
+            },
+        }),
+    ]
+
+
+def _row(label, baseline, fast, size, iterations):
+    before = time_per_call(baseline, iterations)
+    after = time_per_call(fast, iterations)
+    return {
+        'payload': label,
+        'bytes': size,
+        'stdlib_us': f"{before * 1e6:.1f}",
+        f'{fast_json.backend()}_us': f"{after * 1e6:.1f}",
+        'speedup': f"{before / after:.1f}x",
+    }
+
+
+def run(iterations):
+    """Compare per-payload cost of the stock JSON encoders with the fast_json layer"""
+    rows = []
+    drf_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+    for label, family, body in _payloads():
+        if family == 'drf':
+            baseline = lambda body=body: drf_renderer.render(body)
+            fast = lambda body=body: fast_renderer.render(body)
+        else:
+            baseline = lambda body=body: JsonResponse(body)
+            fast = lambda body=body: FastJsonResponse(body)
+        rows.append(_row(label, baseline, fast, len(fast()) if family == 'drf' else len(fast().content), iterations))
+
+    # The lifecycle and token POST bodies go through the parser
+    request_body = json.dumps({'username': 'bench_user', 'password': 'pw-123456'}).encode()
+    drf_parser, fast_parser = JSONParser(), FastJSONParser()
+    rows.append(_row(
+        'parse POST /api/auth/test/',
+        lambda: drf_parser.parse(io.BytesIO(request_body)),
+        lambda: fast_parser.parse(io.BytesIO(request_body)),
+        len(request_body),
+        iterations,
+    ))
+    return rows
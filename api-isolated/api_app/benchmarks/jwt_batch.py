@@ -0,0 +1,25 @@
+from django.test import Client
+from django.urls import reverse
+from ..views.generate_jwt_token import generate_jwt_token, generate_jwt_tokens
+from .timing import time_per_call
+
+BATCH_SIZE = 100
+
+
+def run(iterations):
+    """Compare per-token cost of single-token and batch minting"""
+    client = Client()
+    url = reverse('get_test_token')
+    rounds = max(iterations // BATCH_SIZE, 1)
+
+    single = time_per_call(generate_jwt_token, iterations)
+    batch = time_per_call(lambda: generate_jwt_tokens(BATCH_SIZE), rounds) / BATCH_SIZE
+    single_http = time_per_call(lambda: client.get(url), max(iterations // 10, 1))
+    batch_http = time_per_call(lambda: client.get(url, {'count': BATCH_SIZE}), rounds) / BATCH_SIZE
+
+    return [
+        {'path': 'generate_jwt_token()', 'per_token_us': f"{single * 1e6:.1f}", 'speedup': '1.0x'},
+        {'path': f'generate_jwt_tokens({BATCH_SIZE})', 'per_token_us': f"{batch * 1e6:.1f}", 'speedup': f"{single / batch:.1f}x"},
+        {'path': 'GET /api/auth/token/', 'per_token_us': f"{single_http * 1e6:.1f}", 'speedup': '1.0x'},
+        {'path': f'GET /api/auth/token/?count={BATCH_SIZE}', 'per_token_us': f"{batch_http * 1e6:.1f}", 'speedup': f"{single_http / batch_http:.1f}x"},
+    ]
@@ -0,0 +1,51 @@
+import itertools
+from django.conf import settings
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from ..views.generate_jwt_token import generate_jwt_token
+from .timing import time_per_call
+
+
+def _endpoints():
+    """(label, call factory) pairs; each factory takes a Client and returns a no-arg callable"""
+    token = generate_jwt_token()
+    usernames = (f"bench_stack_{i}" for i in itertools.count())
+
+    def lifecycle(client):
+        url = reverse('test_user_lifecycle')
+        return lambda: client.post(
+            url,
+            {'username': next(usernames), 'password': 'pw'},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+    return [
+        ('GET /api/', lambda client: lambda: client.get(reverse('index'))),
+        ('GET /api/auth/token/', lambda client: lambda: client.get(reverse('get_test_token'))),
+        ('POST /api/auth/test/', lifecycle),
+    ]
+
+
+def run(iterations):
+    """Compare per-request cost of the full and API-only middleware stacks"""
+    stacks = [('full', settings.FULL_MIDDLEWARE), ('api_only', settings.API_ONLY_MIDDLEWARE)]
+    rows = []
+    # Cheap inline hashing so the lifecycle row measures the stack, not PBKDF2
+    with override_settings(PASSWORD_HASH_ITERATIONS=1000, PASSWORD_HASH_OFFLOAD=False):
+        for label, factory in _endpoints():
+            per_request = {}
+            for stack, middleware in stacks:
+                # The client builds its middleware chain on its first request
+                with override_settings(MIDDLEWARE=middleware):
+                    per_request[stack] = time_per_call(factory(Client()), iterations)
+            full, slim = per_request['full'], per_request['api_only']
+            rows.append({
+                'endpoint': label,
+                'full_us': f"{full * 1e6:.1f}",
+                'api_only_us': f"{slim * 1e6:.1f}",
+                'saved_us': f"{(full - slim) * 1e6:.1f}",
+                'speedup': f"{full / slim:.2f}x",
+            })
+    return rows
@@ -0,0 +1,51 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from ..views.generate_jwt_token import generate_jwt_token
+
+THREADS = 8
+WORK_FACTOR = 100_000
+
+
+def _lifecycle_throughput(requests_count):
+    url = reverse('test_user_lifecycle')
+    headers = {'HTTP_AUTHORIZATION': f'Bearer {generate_jwt_token()}'}
+
+    def one(index):
+        started = time.perf_counter()
+        response = Client().post(
+            url,
+            data=json.dumps({'username': f'bench_hash_{index}_{time.time_ns()}', 'password': 'pw'}),
+            content_type='application/json',
+            **headers
+        )
+        assert response.status_code == 200, response.content
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        started = time.perf_counter()
+        latencies = sorted(executor.map(one, range(requests_count)))
+        elapsed = time.perf_counter() - started
+    return requests_count / elapsed, latencies[len(latencies) // 2]
+
+
+def run(iterations):
+    """Compare lifecycle request throughput with hashing inline vs offloaded"""
+    requests_count = max(min(iterations, 64), THREADS)
+    rows = []
+    for offload in (False, True):
+        with override_settings(PASSWORD_HASH_OFFLOAD=offload, PASSWORD_HASH_ITERATIONS=WORK_FACTOR):
+            # Warm up (starts the pool when offloading)
+            _lifecycle_throughput(THREADS)
+            throughput, median = _lifecycle_throughput(requests_count)
+        rows.append({
+            'hashing': 'process pool' if offload else 'inline',
+            'work_factor': WORK_FACTOR,
+            'threads': THREADS,
+            'requests_per_s': f"{throughput:.1f}",
+            'p50_ms': f"{median * 1000:.1f}",
+        })
+    return rows
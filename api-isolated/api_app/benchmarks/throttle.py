@@ -0,0 +1,64 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from ..throttling import AuthTokenThrottle
+from ..utils.token_bucket import SQLiteTokenBuckets
+from .timing import time_per_call
+
+PROCESSES = 4
+# High enough that the buckets never run dry while being timed
+OPEN_RATES = {'auth_token': '1000000/s', 'auth_token_global': '1000000/s'}
+
+
+def _contended(path, iterations, start, results):
+    buckets = SQLiteTokenBuckets(path)
+    while time.time() < start:
+        pass
+    started = time.perf_counter()
+    for i in range(iterations):
+        buckets.take(f"client:{os.getpid()}:{i % 10}", 1e6, 1e6)
+        buckets.take('global', 1e6, 1e6)
+    results.put(time.perf_counter() - started)
+
+
+def run(iterations):
+    """Per-request cost of the token-bucket throttle, alone and with workers contending"""
+    # Same filesystem as the default THROTTLE_SQLITE_PATH
+    directory = tempfile.mkdtemp(prefix='antelope-throttle-bench-', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    path = os.path.join(directory, 'throttle.sqlite3')
+    buckets = SQLiteTokenBuckets(path, sweep_every=0)
+    request = RequestFactory().get('/api/auth/token/', REMOTE_ADDR='203.0.113.7')
+    rows = []
+
+    allowed = time_per_call(lambda: buckets.take('client:a', 1e6, 1e6), iterations)
+    rows.append({'case': 'take() allowed', 'per_request_us': f"{allowed * 1e6:.1f}"})
+
+    buckets.take('client:empty', 1e-9, 1)
+    denied = time_per_call(lambda: buckets.take('client:empty', 1e-9, 1), iterations)
+    rows.append({'case': 'take() denied', 'per_request_us': f"{denied * 1e6:.1f}"})
+
+    with override_settings(THROTTLE_ENABLED=True, THROTTLE_SQLITE_PATH=path, THROTTLE_RATES=OPEN_RATES):
+        throttle = time_per_call(lambda: AuthTokenThrottle().allow_request(request, None), iterations)
+    rows.append({'case': 'AuthTokenThrottle (client + global)', 'per_request_us': f"{throttle * 1e6:.1f}"})
+
+    # Forked workers hitting the same file, as gunicorn's would
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    start = time.time() + 0.5
+    workers = [context.Process(target=_contended, args=(path, iterations, start, results)) for _ in range(PROCESSES)]
+    for worker in workers:
+        worker.start()
+    elapsed = [results.get(timeout=120) for _ in workers]
+    for worker in workers:
+        worker.join()
+    shutil.rmtree(directory, ignore_errors=True)
+    rows.append({
+        'case': f'client + global, {PROCESSES} processes contending',
+        # Wall time over all requests: what the dyno as a whole pays per request
+        'per_request_us': f"{max(elapsed) / (PROCESSES * iterations) * 1e6:.1f}",
+    })
+    return rows
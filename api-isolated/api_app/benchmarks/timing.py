@@ -0,0 +1,25 @@
+import time
+
+
+def time_per_call(func, iterations, repeat=5):
+    """Return the best-of-``repeat`` wall time per call of ``func`` in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - started) / iterations)
+    return best
+
+
+def format_table(rows):
+    """Render result rows as an aligned plain-text table"""
+    if not rows:
+        return ''
+    columns = list(rows[0].keys())
+    cells = [[str(row.get(column, '')) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[i]) for line in cells)) for i, column in enumerate(columns)]
+    lines = ['  '.join(column.ljust(width) for column, width in zip(columns, widths))]
+    lines.append('  '.join('-' * width for width in widths))
+    lines.extend('  '.join(cell.ljust(width) for cell, width in zip(line, widths)) for line in cells)
+    return '\n'.join(lines)
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from ..user_stores import LockStripedUserStore, SQLiteUserStore, SupabaseUserStore
+
+THREADS = 8
+
+
+def _lifecycle(store, username):
+    store.create(username, {'password': 'pw', 'created_at': time.time()})
+    store.get(username)
+    store.delete(username)
+
+
+def _throughput(store, iterations):
+    """Run ``iterations`` signup/signin/delete cycles on THREADS threads"""
+    store.clear()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        started = time.perf_counter()
+        list(executor.map(lambda i: _lifecycle(store, f"bench_user_{i}"), range(iterations)))
+        elapsed = time.perf_counter() - started
+    return iterations / elapsed
+
+
+def run(iterations):
+    """Compare concurrent lifecycle throughput of each user store backend"""
+    with tempfile.TemporaryDirectory() as directory:
+        stores = [
+            ('LockStripedUserStore', LockStripedUserStore()),
+            ('SQLiteUserStore', SQLiteUserStore(path=os.path.join(directory, 'bench.sqlite3'))),
+        ]
+        # Only hit Supabase when it is the configured backend
+        if settings.USER_STORE_BACKEND.endswith('SupabaseUserStore'):
+            stores.append(('SupabaseUserStore', SupabaseUserStore()))
+
+        rows = []
+        for name, store in stores:
+            cycles_per_second = _throughput(store, iterations)
+            rows.append({
+                'backend': name,
+                'threads': THREADS,
+                'lifecycles_per_s': f"{cycles_per_second:,.0f}",
+                'per_lifecycle_us': f"{1e6 / cycles_per_second:.1f}",
+            })
+        return rows
@@ -0,0 +1,115 @@
+import os
+import signal
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from django.conf import settings
+from ..views.generate_jwt_token import generate_jwt_token
+
+CONCURRENCY = 16
+WORKER_CLASSES = ('sync', 'gthread', 'uvicorn')
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(worker_class, port):
+    """Start gunicorn with the project's config and wait until it answers"""
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE='api_project.settings',
+        GUNICORN_WORKER_CLASS=worker_class,
+        PORT=str(port),
+        # Every load client shares one address
+        THROTTLE_ENABLED='False',
+    )
+    server = subprocess.Popen(
+        ['gunicorn', '--config', 'gunicorn.conf.py'],
+        cwd=settings.BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/api/", timeout=5)
+            return server
+        except requests.RequestException:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"gunicorn ({worker_class}) did not start")
+
+
+def _load(method, url, iterations, request_kwargs):
+    """Send ``iterations`` requests from CONCURRENCY keep-alive clients"""
+    local = threading.local()
+    latencies = []
+    errors = []
+
+    def one(index):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=30, **request_kwargs(index))
+            ok = response.status_code < 500
+        except requests.RequestException:
+            ok = False
+        latencies.append(time.perf_counter() - started)
+        if not ok:
+            errors.append(1)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        list(executor.map(one, range(iterations)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'rps': f"{iterations / elapsed:.0f}",
+        'p50_ms': f"{latencies[len(latencies) // 2] * 1000:.1f}",
+        'p99_ms': f"{latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000:.1f}",
+        'errors': len(errors),
+    }
+
+
+def run(iterations):
+    """
+    Load-test each gunicorn worker class against the API's local endpoints.
+
+    Starts the real server with gunicorn.conf.py (so workers are auto-sized
+    for this machine) and skips endpoints that need Supabase.
+    """
+    token = generate_jwt_token()
+    endpoints = [
+        ('GET /api/', 'GET', '/api/', lambda index: {}),
+        ('GET /api/auth/token/', 'GET', '/api/auth/token/', lambda index: {}),
+        ('POST /api/auth/test/', 'POST', '/api/auth/test/', lambda index: {
+            'json': {'username': f"load_{time.monotonic_ns()}_{index}", 'password': 'pw'},
+            'headers': {'Authorization': f'Bearer {token}'},
+        }),
+    ]
+
+    rows = []
+    for worker_class in WORKER_CLASSES:
+        port = _free_port()
+        server = _start_server(worker_class, port)
+        try:
+            for label, method, path, request_kwargs in endpoints:
+                url = f"http://127.0.0.1:{port}{path}"
+                # Warm every worker's imports and connections first
+                _load(method, url, CONCURRENCY * 2, request_kwargs)
+                result = _load(method, url, iterations, request_kwargs)
+                rows.append({'worker_class': worker_class, 'endpoint': label, **result})
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+    return rows
@@ -0,0 +1 @@
+"""Custom Django database backends."""
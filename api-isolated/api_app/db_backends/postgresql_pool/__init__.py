@@ -0,0 +1 @@
+"""PostgreSQL backend that borrows connections from an in-process pool."""
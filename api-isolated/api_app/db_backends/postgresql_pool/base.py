@@ -0,0 +1,38 @@
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from .pool import PoolTimeout, get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Django's PostgreSQL backend with connections borrowed from ``pool.get_pool``.
+
+    Configured by ``api_project.database.database_config(mode='pool')``,
+    which puts the pool's sizing under ``DATABASES[alias]['POOL']``.
+    """
+
+    def _pool(self):
+        return get_pool(
+            self.alias,
+            self.settings_dict.get('POOL', {}),
+            health_checks=self.settings_dict.get('CONN_HEALTH_CHECKS', True),
+        )
+
+    def get_new_connection(self, conn_params):
+        try:
+            connection = self._pool().getconn(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        except PoolTimeout as e:
+            # Surfaces as django.db.OperationalError like a failed connect
+            raise self.Database.OperationalError(str(e)) from e
+        # The parent only sets this when it opens a connection
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                # Closed inside atomic() the wrapper keeps its reference, so
+                # the connection must not go back to be shared
+                self._pool().putconn(self.connection, discard=self.in_atomic_block)
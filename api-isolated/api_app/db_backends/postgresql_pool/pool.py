@@ -0,0 +1,182 @@
+"""
+Bounded, thread-safe pool of psycopg2 connections.
+
+One pool per database alias per worker process. Django "closes" a pooled
+connection at the end of every request (CONN_MAX_AGE is 0 in pool mode),
+which hands it back here instead of tearing down the TCP and TLS session,
+so a worker holds at most ``max_size`` server connections no matter how many
+requests or threads it serves. Threads outside a request (executors,
+background jobs) get no request_finished, so they must close the
+connection themselves to return it.
+"""
+import collections
+import logging
+import os
+import threading
+import time
+from psycopg2 import extensions
+from ...utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection frees up within the pool's timeout"""
+
+
+class ConnectionPool:
+    """
+    Hands out at most ``max_size`` connections, opening them lazily.
+
+    Idle connections are reused most-recently-returned first, closed once
+    idle for longer than ``max_idle`` seconds, and (with ``health_checks``)
+    pinged before being handed out so a connection the server or a pooler
+    dropped is replaced instead of failing the request.
+    """
+
+    def __init__(self, alias, max_size=10, timeout=5.0, max_idle=300, health_checks=True, clock=time.monotonic):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_checks = health_checks
+        self._clock = clock
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle = collections.deque()
+        self._in_use = 0
+
+    def getconn(self, connect):
+        """Return an idle connection, or one from ``connect()`` if none is usable"""
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            self._record_checkout('timeout', started)
+            raise PoolTimeout(
+                f"No connection free in the '{self.alias}' pool after {self.timeout}s "
+                f"({self.max_size} in use)"
+            )
+        try:
+            connection = self._take_idle()
+            outcome = 'reused'
+            if connection is None:
+                connection = connect()
+                outcome = 'new'
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_use += 1
+        self._record_checkout(outcome, started)
+        return connection
+
+    def putconn(self, connection, discard=False):
+        """Return a connection; broken ones (or ``discard=True``) are closed instead"""
+        try:
+            if discard or connection.closed or not self._reset(connection):
+                self._close(connection, 'broken')
+            else:
+                with self._lock:
+                    self._idle.append((connection, self._clock()))
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+            self._record_sizes()
+
+    def closeall(self):
+        """Close every idle connection; checked-out ones close when returned"""
+        with self._lock:
+            idle, self._idle = list(self._idle), collections.deque()
+        for connection, _ in idle:
+            self._close(connection, 'shutdown')
+        self._record_sizes()
+
+    def stats(self):
+        with self._lock:
+            return {'idle': len(self._idle), 'in_use': self._in_use, 'max_size': self.max_size}
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection, returned_at = self._idle.pop()
+            if connection.closed:
+                self._close(connection, 'closed')
+            elif self.max_idle and self._clock() - returned_at > self.max_idle:
+                self._close(connection, 'idle_timeout')
+            elif self.health_checks and not self._is_usable(connection):
+                self._close(connection, 'unhealthy')
+            else:
+                return connection
+
+    def _is_usable(self, connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not connection.autocommit:
+                connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, connection):
+        # A request that errored mid-transaction must not leak it to the next one
+        try:
+            if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            return connection.info.transaction_status == extensions.TRANSACTION_STATUS_IDLE
+        except Exception:
+            return False
+
+    def _close(self, connection, reason):
+        try:
+            connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {str(e)}")
+        metrics.inc('db_pool_discards_total', {'alias': self.alias, 'reason': reason})
+
+    def _record_checkout(self, outcome, started):
+        metrics.inc('db_pool_checkouts_total', {'alias': self.alias, 'outcome': outcome})
+        metrics.observe('db_pool_wait_seconds', time.perf_counter() - started, {'alias': self.alias})
+        self._record_sizes()
+
+    def _record_sizes(self):
+        stats = self.stats()
+        metrics.set_gauge('db_pool_connections', stats['idle'], {'alias': self.alias, 'state': 'idle'})
+        metrics.set_gauge('db_pool_connections', stats['in_use'], {'alias': self.alias, 'state': 'in_use'})
+
+
+_pools = {}
+_pools_pid = None
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, options, health_checks=True):
+    """Return this process's pool for ``alias``, starting afresh after a fork"""
+    global _pools, _pools_pid
+    pid = os.getpid()
+    with _pools_lock:
+        if _pools_pid != pid:
+            # Inherited sockets belong to the parent; closing them here
+            # would terminate the parent's sessions, so just forget them
+            _pools = {}
+            _pools_pid = pid
+        pool = _pools.get(alias)
+        if pool is None:
+            pool = _pools[alias] = ConnectionPool(
+                alias,
+                max_size=options.get('max_size', 10),
+                timeout=options.get('timeout', 5.0),
+                max_idle=options.get('max_idle', 300),
+                health_checks=health_checks,
+            )
+        return pool
+
+
+def close_pools():
+    """Close the idle connections of every pool in this process"""
+    with _pools_lock:
+        pools = list(_pools.values()) if _pools_pid == os.getpid() else []
+    for pool in pools:
+        pool.closeall()
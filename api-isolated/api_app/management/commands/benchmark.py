@@ -0,0 +1,28 @@
+from importlib import import_module
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from api_app.benchmarks import BENCHMARKS
+from api_app.benchmarks.timing import format_table
+
+
+class Command(BaseCommand):
+    help = 'Run API micro-benchmarks and print a per-benchmark results table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+        parser.add_argument('--iterations', type=int, default=1000, help='Calls per timed run')
+
+    def handle(self, *args, **options):
+        names = options['names'] or list(BENCHMARKS)
+        unknown = [name for name in names if name not in BENCHMARKS]
+        if unknown:
+            raise CommandError(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+        # Benchmarks drive views through Django's test client, from one
+        # address that the auth throttles would otherwise start refusing
+        with override_settings(ALLOWED_HOSTS=['testserver', *settings.ALLOWED_HOSTS], THROTTLE_ENABLED=False):
+            for name in names:
+                rows = import_module(BENCHMARKS[name]).run(options['iterations'])
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n{name}"))
+                self.stdout.write(format_table(rows))
@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api_app.benchmarks.timing import format_table
+
+# What a worker does before serving its first request: import settings, set
+# up apps, build the WSGI handler (middleware) and load the URLconf. Django
+# loads settings, middleware and URLconfs through importlib, which
+# -X importtime does not report, so those are imported explicitly first.
+BOOT_SCRIPT = """
+import os
+import time
+started = time.perf_counter()
+__import__(os.environ['DJANGO_SETTINGS_MODULE'])
+import django
+django.setup(set_prefix=False)
+from django.conf import settings
+for path in settings.MIDDLEWARE:
+    __import__(path.rsplit('.', 1)[0])
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+__import__(settings.ROOT_URLCONF)
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(f"boot_ms={(time.perf_counter() - started) * 1000:.1f}")
+"""
+
+PROJECT_PACKAGES = ('api_app', 'api_project')
+
+
+def parse_importtime(output):
+    """Parse ``-X importtime`` stderr into (module, self_us, cumulative_us) tuples"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        rows.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Report per-module import time of a cold worker boot (python -X importtime)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=25, help='Rows to show, slowest cumulative first')
+        parser.add_argument('--project-only', action='store_true', help=f"Only show {' / '.join(PROJECT_PACKAGES)} modules")
+        parser.add_argument('--sort', choices=['cumulative', 'self'], default='cumulative')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Boot failed:\n{result.stderr[-2000:]}")
+
+        rows = parse_importtime(result.stderr)
+        if options['project_only']:
+            rows = [row for row in rows if row[0].split('.')[0] in PROJECT_PACKAGES]
+        rows.sort(key=lambda row: row[2] if options['sort'] == 'cumulative' else row[1], reverse=True)
+
+        total_us = sum(row[1] for row in parse_importtime(result.stderr))
+        boot = next((line for line in result.stdout.splitlines() if line.startswith('boot_ms=')), 'boot_ms=?')
+        self.stdout.write(format_table([
+            {'module': module, 'self_ms': f"{self_us / 1000:.1f}", 'cumulative_ms': f"{cumulative_us / 1000:.1f}"}
+            for module, self_us, cumulative_us in rows[:options['limit']]
+        ]))
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\n{len(rows)} modules, {total_us / 1000:.1f} ms importing, {boot.split('=')[1]} ms to first-request readiness"
+        ))
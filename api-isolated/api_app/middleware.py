@@ -0,0 +1,156 @@
+import abc
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from whitenoise.middleware import WhiteNoiseMiddleware
+from .utils import compression, metrics
+from .utils.server_timing import ServerTiming
+
+
+class _DualModeMiddleware(abc.ABC):
+    """
+    Base for middleware that runs natively under both WSGI and ASGI.
+
+    A sync-only middleware makes Django run the rest of the stack through
+    a single-thread adapter under ASGI, which would serialise async views.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        return self.finish(request, response, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        return self.finish(request, response, started)
+
+    @abc.abstractmethod
+    def finish(self, request, response, started):
+        """Post-process ``response``; ``started`` is the request's perf_counter start"""
+
+
+class MetricsMiddleware(_DualModeMiddleware):
+    """Record request count, status code and latency per URL name"""
+
+    def finish(self, request, response, started):
+        elapsed = time.perf_counter() - started
+        match = getattr(request, 'resolver_match', None)
+        view = match.url_name if match and match.url_name else 'unmatched'
+        metrics.inc('http_requests_total', {'view': view, 'method': request.method, 'status': str(response.status_code)})
+        metrics.observe('http_request_duration_seconds', elapsed, {'view': view})
+        # Throttled to one small file write per METRICS_FLUSH_INTERVAL, cheap
+        # enough to run inline on the event loop too
+        metrics.flush()
+        return response
+
+
+class ServerTimingMiddleware(_DualModeMiddleware):
+    """Emit steps recorded through ``get_server_timing`` as a Server-Timing header"""
+
+    def finish(self, request, response, started):
+        timing = getattr(request, 'server_timing', None)
+        if timing is not None and timing.entries:
+            steps = timing.header_value()
+            total = ServerTiming()
+            total.add('total', time.perf_counter() - started)
+            response['Server-Timing'] = f"{steps}, {total.header_value()}"
+        return response
+
+
+class CompressionMiddleware(_DualModeMiddleware):
+    """
+    gzip or Brotli for dynamic text responses, negotiated by Accept-Encoding.
+
+    Bodies under COMPRESSION_MIN_SIZE go out as they are; streaming bodies
+    are compressed chunk by chunk. Responses that already carry a
+    Content-Encoding (WhiteNoise's precompressed files) are left alone, as
+    are partial ones: their Content-Range counts uncompressed bytes.
+    """
+
+    def finish(self, request, response, started):
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.has_header('Content-Encoding')
+            or response.has_header('Content-Range')
+            or not compression.is_compressible(response.get('Content-Type'))
+        ):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        levels = {
+            'gzip_level': settings.COMPRESSION_GZIP_LEVEL,
+            'brotli_quality': settings.COMPRESSION_BROTLI_QUALITY,
+        }
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.astream_compressor(response.streaming_content, encoding, **levels)
+            else:
+                response.streaming_content = compression.stream_compressor(response.streaming_content, encoding, **levels)
+            del response['Content-Length']
+        else:
+            compressed = compression.compress(response.content, encoding, **levels)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # The bytes differ per encoding, so a strong validator would be wrong
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can sit in an async middleware stack.
+
+    WhiteNoise's own middleware is sync-only; under ASGI this version only
+    leaves the event loop (for the file lookup) when the path is under the
+    static prefix, and passes every API request straight through.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if request.path_info.startswith(self.static_prefix):
+            response = await sync_to_async(self._serve_static, thread_sensitive=False)(request)
+            if response is not None:
+                return response
+        return await self.get_response(request)
+
+    def _serve_static(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        return self.serve(static_file, request) if static_file is not None else None
@@ -0,0 +1,21 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from .renderers import FastJSONRenderer
+from .utils.fast_json import loads
+
+
+class FastJSONParser(JSONParser):
+    """DRF's JSONParser decoded with ``fast_json.loads``"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        try:
+            body = stream.read()
+            # orjson only reads UTF-8; anything else is decoded first
+            if encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+                body = body.decode(encoding)
+            return loads(body)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
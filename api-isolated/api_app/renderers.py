@@ -0,0 +1,25 @@
+from rest_framework.renderers import JSONRenderer
+from .utils.fast_json import dumps
+
+# Escaped by DRF so responses stay a strict JavaScript subset
+_LINE_SEPARATORS = ('\u2028'.encode(), '\u2029'.encode())
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    DRF's JSONRenderer encoded with ``fast_json.dumps``.
+
+    Pretty-printing (``Accept: application/json; indent=4`` or the browsable
+    API) is rare and needs arbitrary indents, so it still uses the parent.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = dumps(data, default=self.encoder_class().default)
+        if _LINE_SEPARATORS[0] in ret or _LINE_SEPARATORS[1] in ret:
+            ret = ret.replace(_LINE_SEPARATORS[0], b'\\u2028').replace(_LINE_SEPARATORS[1], b'\\u2029')
+        return ret
@@ -0,0 +1 @@
+"""API-only settings profile tests"""
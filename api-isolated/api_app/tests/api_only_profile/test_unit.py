@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from django.conf import settings
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from api_app.views.generate_jwt_token import generate_jwt_token
+
+pytestmark = pytest.mark.unit
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+PROFILE_SCRIPT = """
+import json
+import django
+from django.conf import settings
+django.setup()
+from django.test import Client
+settings.ALLOWED_HOSTS = ['testserver']
+client = Client()
+print(json.dumps({
+    'apps': settings.INSTALLED_APPS,
+    'middleware': settings.MIDDLEWARE,
+    'admin_status': client.get('/admin/').status_code,
+    'api_status': client.get('/api/').status_code,
+}))
+"""
+
+def load_profile(**env):
+    """Import the real settings in a fresh interpreter with ``env`` applied"""
+    result = subprocess.run(
+        [sys.executable, '-c', PROFILE_SCRIPT],
+        cwd=PROJECT_DIR,
+        env={
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'api_project.settings',
+            'SUPABASE_URL': 'https://test.supabase.co',
+            'SUPABASE_KEY': 'test-key',
+            **env,
+        },
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_api_only_profile_drops_admin_stack():
+    """Test that DJANGO_API_ONLY removes admin apps, middleware and URL"""
+    profile = load_profile(DJANGO_API_ONLY='True')
+
+    assert 'django.contrib.sessions' not in profile['apps']
+    assert 'django.contrib.admin' not in profile['apps']
+    assert 'django.middleware.csrf.CsrfViewMiddleware' not in profile['middleware']
+    assert profile['middleware'][0] == 'api_app.middleware.MetricsMiddleware'
+    assert profile['admin_status'] == 404
+    assert profile['api_status'] == 200
+
+def test_api_only_profile_can_keep_admin():
+    """Test that DJANGO_ENABLE_ADMIN brings back the full stack"""
+    profile = load_profile(DJANGO_API_ONLY='True', DJANGO_ENABLE_ADMIN='True')
+
+    assert 'django.contrib.admin' in profile['apps']
+    assert 'django.contrib.sessions.middleware.SessionMiddleware' in profile['middleware']
+    assert profile['admin_status'] == 302
+
+def test_api_only_middleware_serves_endpoints():
+    """Test that token and anonymous endpoints work on the slim stack"""
+    with override_settings(MIDDLEWARE=settings.API_ONLY_MIDDLEWARE):
+        client = Client()
+        index = client.get(reverse('index'))
+        lifecycle = client.post(
+            reverse('test_user_lifecycle'),
+            {'username': 'slim_stack_user', 'password': 'pw'},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token()}'
+        )
+
+    assert index.status_code == status.HTTP_200_OK
+    assert 'X-Frame-Options' not in index
+    assert lifecycle.status_code == status.HTTP_200_OK
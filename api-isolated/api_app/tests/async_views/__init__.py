@@ -0,0 +1 @@
+"""Tests for the async views served under ASGI."""
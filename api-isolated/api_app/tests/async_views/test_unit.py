@@ -0,0 +1,327 @@
+import asyncio
+import importlib
+import json
+import threading
+import time
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import clear_url_caches, resolve, reverse
+from rest_framework import status
+import api_app.urls
+import api_project.urls
+from api_app import middleware
+from api_app.utils import circuit_breaker, supabase_async_transport, supabase_prober
+from api_app.utils.circuit_breaker import CircuitBreaker
+from api_app.utils.supabase_prober import SupabaseProber
+from api_app.views import generate_user_lifecycle
+from api_app.views.generate_jwt_token import generate_jwt_token
+from ..utils.local_http import local_http_server
+
+pytestmark = pytest.mark.unit
+
+
+def _reload_urls():
+    # The root URLconf's include() caches the app's patterns, so rebuild both
+    importlib.reload(api_app.urls)
+    importlib.reload(api_project.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_urls():
+    """Route the API's URLs to the async views, as asgi.py does"""
+    try:
+        with override_settings(ASYNC_VIEWS=True):
+            _reload_urls()
+            yield
+    finally:
+        _reload_urls()
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_urls_resolve_to_async_views(async_urls):
+    """Test that every dual-mode URL resolves to a coroutine view without importing it"""
+    for name in ('index', 'api-test', 'health_check', 'get_test_token', 'test_user_lifecycle', 'test_user_lifecycle_bulk'):
+        assert iscoroutinefunction(resolve(reverse(name)).func), name
+
+
+def test_urls_resolve_to_sync_views_by_default():
+    """Test that WSGI keeps the DRF views"""
+    assert not iscoroutinefunction(resolve(reverse('health_check')).func)
+
+
+def test_middleware_is_async_capable():
+    """Test that the project's middleware does not force a sync hop under ASGI"""
+    for cls in (middleware.StaticFilesMiddleware, middleware.MetricsMiddleware, middleware.ServerTimingMiddleware):
+        assert cls.async_capable is True
+
+
+def test_middleware_must_implement_finish():
+    """Test that a dual-mode middleware without finish() fails when Django builds the stack"""
+    class Incomplete(middleware._DualModeMiddleware):
+        pass
+
+    with pytest.raises(TypeError, match='abstract'):
+        Incomplete(lambda request: None)
+
+
+def test_async_api_message(async_urls):
+    """Test that the async index answers like APITest"""
+    response = _run(AsyncClient().get(reverse('index')))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"message": "API is working!"}
+
+
+def test_async_api_message_rejects_post(async_urls):
+    """Test that unsupported methods get DRF's 405 body"""
+    response = _run(AsyncClient().post(reverse('index')))
+
+    assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+    assert response.json() == {"detail": 'Method "POST" not allowed.'}
+
+
+def test_async_token_batch(async_urls):
+    """Test that the async token view mints a batch"""
+    response = _run(AsyncClient().get(reverse('get_test_token'), {'count': 3}))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()['tokens']) == 3
+
+
+def test_async_token_bad_json(async_urls):
+    """Test that a malformed JSON body is a 400"""
+    response = _run(AsyncClient().post(
+        reverse('get_test_token'), data='{', content_type='application/json'
+    ))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_async_token_non_object_body(async_urls):
+    """Test that a JSON body that is not an object gets the sync view's 400"""
+    response = _run(AsyncClient().post(
+        reverse('get_test_token'), data='[1, 2]', content_type='application/json'
+    ))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()['error'] == 'Invalid token request'
+
+
+def test_async_user_lifecycle_success(async_urls):
+    """Test the async lifecycle end to end, including Server-Timing"""
+    response = _run(AsyncClient().post(
+        reverse('test_user_lifecycle') + '?timings=1',
+        data={'username': f"async_user_{time.monotonic_ns()}", 'password': 'pw-123456'},
+        content_type='application/json',
+        headers={'Authorization': f'Bearer {generate_jwt_token()}'}
+    ))
+
+    assert response.status_code == status.HTTP_200_OK
+    details = response.json()['details']
+    assert (details['signup'], details['signin'], details['delete']) == ('success', 'success', 'success')
+    assert set(details['timings_ms']) >= {'auth', 'signup', 'signin', 'delete'}
+    steps = [part.strip().split(';')[0] for part in response['Server-Timing'].split(',')]
+    assert steps == ['auth', 'signup', 'signin', 'delete', 'total']
+
+
+def test_async_user_lifecycle_non_object_body(async_urls):
+    """Test that a JSON body that is not an object is a 400, as in the sync view"""
+    response = _run(AsyncClient().post(
+        reverse('test_user_lifecycle'),
+        data='["user", "pw"]',
+        content_type='application/json',
+        headers={'Authorization': f'Bearer {generate_jwt_token()}'}
+    ))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "JSON body must be an object"}
+
+
+@pytest.mark.parametrize('header', ['', 'Bearer not-a-token'])
+def test_async_user_lifecycle_rejects_bad_token(async_urls, header):
+    """Test that a missing or invalid token is a 401"""
+    response = _run(AsyncClient().post(
+        reverse('test_user_lifecycle'),
+        data={'username': 'nobody', 'password': 'pw'},
+        content_type='application/json',
+        headers={'Authorization': header}
+    ))
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+
+def _lifecycle_statuses(post):
+    """Statuses for a valid, an invalid and a missing token once the throttle is spent"""
+    headers = (f'Bearer {generate_jwt_token()}', 'Bearer not-a-token', '')
+    return [post(header).status_code for header in headers]
+
+
+def test_async_user_lifecycle_authenticates_before_throttling(async_urls, tmp_path):
+    """Test that both paths give a bad token 401 and a missing one 429 once throttled, as DRF does"""
+    def throttled(name):
+        return override_settings(
+            THROTTLE_ENABLED=True,
+            THROTTLE_SQLITE_PATH=str(tmp_path / name),
+            THROTTLE_BURST_SECONDS=1,
+            THROTTLE_RATES={**settings.THROTTLE_RATES, 'auth_test': '1/m', 'auth_test_global': '10/m'},
+        )
+
+    def async_post(header):
+        return _run(AsyncClient().post(
+            reverse('test_user_lifecycle'),
+            data={'username': f"throttled_{time.monotonic_ns()}", 'password': 'pw'},
+            content_type='application/json',
+            headers={'Authorization': header}
+        ))
+
+    def sync_post(header):
+        return Client().post(
+            '/api/auth/test/',
+            data={'username': f"throttled_{time.monotonic_ns()}", 'password': 'pw'},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=header
+        )
+
+    with throttled('async.sqlite3'):
+        async_statuses = _lifecycle_statuses(async_post)
+    with override_settings(ASYNC_VIEWS=False):
+        _reload_urls()
+        with throttled('sync.sqlite3'):
+            sync_statuses = _lifecycle_statuses(sync_post)
+
+    expected = [status.HTTP_200_OK, status.HTTP_401_UNAUTHORIZED, status.HTTP_429_TOO_MANY_REQUESTS]
+    assert async_statuses == sync_statuses == expected
+
+
+def _bulk_lines(response):
+    async def read():
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    return [json.loads(line) for line in _run(read()).splitlines()]
+
+
+def test_async_bulk_streams_from_an_async_generator(async_urls):
+    """Test that the async bulk view streams one NDJSON line per user plus a summary"""
+    users = [{'username': f"async_bulk_{time.monotonic_ns()}_{i}", 'password': 'pw'} for i in range(5)]
+    response = _run(AsyncClient().post(
+        reverse('test_user_lifecycle_bulk'),
+        data=json.dumps(users),
+        content_type='application/json',
+        headers={'Authorization': f'Bearer {generate_jwt_token()}'}
+    ))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert response.is_async
+    lines = _bulk_lines(response)
+    assert sorted(line['index'] for line in lines[:-1]) == list(range(5))
+    assert lines[-1]['summary'] == {'total': 5, 'succeeded': 5, 'failed': 0}
+
+
+def test_async_bulk_ndjson_reports_bad_lines(async_urls):
+    """Test that NDJSON bodies are read line by line on the async path too"""
+    body = '\n'.join([json.dumps({'username': f"async_ndjson_{time.monotonic_ns()}", 'password': 'pw'}), '{not json'])
+    response = _run(AsyncClient().post(
+        reverse('test_user_lifecycle_bulk'),
+        data=body,
+        content_type='application/x-ndjson',
+        headers={'Authorization': f'Bearer {generate_jwt_token()}'}
+    ))
+
+    lines = _bulk_lines(response)
+    assert {line['index']: line['status'] for line in lines[:-1]} == {0: 200, 1: 400}
+    assert lines[-1]['summary'] == {'total': 2, 'succeeded': 1, 'failed': 1}
+
+
+@pytest.mark.parametrize('data,error', [('{"users": 3}', 'Invalid payload'), ('[{}, {}, {}]', 'Too many users')])
+def test_async_bulk_rejects_bad_payloads(async_urls, data, error):
+    with override_settings(LIFECYCLE_BULK_MAX_USERS=2):
+        response = _run(AsyncClient().post(
+            reverse('test_user_lifecycle_bulk'),
+            data=data,
+            content_type='application/json',
+            headers={'Authorization': f'Bearer {generate_jwt_token()}'}
+        ))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()['error'] == error
+
+
+def test_async_bulk_sends_lines_before_the_last_user_finishes(async_urls, monkeypatch):
+    """Test that the ASGI handler sends each result as it lands instead of buffering the stream"""
+    first_line_sent = threading.Event()
+    saw_first_line = []
+    run_bulk_item = generate_user_lifecycle._run_bulk_item
+
+    def second_waits_for_first_line(index, item, include_timings=False):
+        if index == 1:
+            saw_first_line.append(first_line_sent.wait(timeout=2))
+        return run_bulk_item(index, item, include_timings)
+
+    monkeypatch.setattr(generate_user_lifecycle, '_run_bulk_item', second_waits_for_first_line)
+    body = json.dumps([{'username': f"async_stream_{time.monotonic_ns()}_{i}", 'password': 'pw'} for i in range(2)]).encode()
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'POST', 'scheme': 'http', 'path': '/api/auth/test/bulk/', 'raw_path': b'/api/auth/test/bulk/',
+        'query_string': b'', 'root_path': '', 'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+        'headers': [
+            (b'host', b'testserver'),
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (b'authorization', f'Bearer {generate_jwt_token()}'.encode()),
+        ],
+    }
+    bodies = []
+
+    async def serve():
+        received = asyncio.Event()
+
+        async def receive():
+            if received.is_set():
+                await asyncio.Event().wait()
+            received.set()
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.body' and message.get('body'):
+                bodies.append(message['body'])
+                first_line_sent.set()
+
+        with override_settings(LIFECYCLE_BULK_WORKERS=1):
+            await ASGIHandler()(scope, receive, send)
+
+    _run(serve())
+
+    assert [json.loads(body).get('index') for body in bodies] == [0, 1, None]
+    # A buffered stream sends nothing until every user is done, so the
+    # second one would have waited out its timeout
+    assert saw_first_line == [True]
+
+def test_async_health_check_probes_without_blocking(async_urls, local_http_server, monkeypatch):
+    """Test that the async health check awaits an httpx probe of Supabase"""
+    monkeypatch.setattr(circuit_breaker, '_supabase_breaker', CircuitBreaker('test'))
+    monkeypatch.setattr(supabase_prober, '_prober', SupabaseProber(interval=0))
+
+    async def check():
+        try:
+            return await AsyncClient().get(reverse('health_check'))
+        finally:
+            await supabase_async_transport.close_async_client()
+
+    with override_settings(SUPABASE_URL=local_http_server.url, SUPABASE_HEALTH_PROBE_STRATEGY='head'):
+        response = _run(check())
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data['status'] == 'healthy'
+    assert data['supabase_connected'] is True
+    assert local_http_server.requests == [('HEAD', '/rest/v1/')]
@@ -0,0 +1 @@
+"""Stateless JWT authentication tests"""
@@ -0,0 +1,76 @@
+import json
+import pytest
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from api_app.authentication import StatelessJWTAuthentication, TokenUser
+from api_app.views.generate_jwt_token import generate_jwt_token, generate_jwt_tokens
+
+pytestmark = pytest.mark.unit
+
+factory = APIRequestFactory()
+
+def authenticate(header):
+    request = factory.get('/api/', HTTP_AUTHORIZATION=header)
+    return StatelessJWTAuthentication().authenticate(request)
+
+def test_valid_token_builds_principal_from_claims():
+    """Test that a valid token yields a TokenUser carrying its claims"""
+    token = generate_jwt_tokens(1, user_id='alice', role='tester')[0]
+    user, auth = authenticate(f'Bearer {token}')
+
+    assert isinstance(user, TokenUser)
+    assert user.is_authenticated
+    assert user.id == 'alice'
+    assert user.role == 'tester'
+    assert auth == token
+
+def test_missing_bearer_header_is_anonymous():
+    """Test that non-bearer headers leave the request unauthenticated"""
+    assert authenticate('') is None
+    assert authenticate('Basic dXNlcjpwYXNz') is None
+
+def test_invalid_token_is_rejected():
+    """Test that a bearer token failing verification raises AuthenticationFailed"""
+    with pytest.raises(AuthenticationFailed):
+        authenticate('Bearer not-a-jwt')
+
+def test_dev_test_token_only_in_debug():
+    """Test that the dev test-token is accepted only when DEBUG is on"""
+    with override_settings(DEBUG=True):
+        user, _ = authenticate('Bearer test-token')
+        assert user.id == 'test_user'
+    with override_settings(DEBUG=False):
+        with pytest.raises(AuthenticationFailed):
+            authenticate('Bearer test-token')
+
+@pytest.mark.django_db
+def test_lifecycle_authenticates_without_queries(client, django_assert_num_queries):
+    """Test that an authenticated lifecycle request issues no database queries"""
+    headers = {'HTTP_AUTHORIZATION': f'Bearer {generate_jwt_token()}'}
+    data = json.dumps({'username': 'query_free_user', 'password': 'pw'})
+
+    with django_assert_num_queries(0):
+        response = client.post(reverse('test_user_lifecycle'), data=data, content_type='application/json', **headers)
+
+    assert response.status_code == status.HTTP_200_OK
+
+def test_lifecycle_invalid_token_keeps_error_shape(client):
+    """Test that invalid tokens still get the lifecycle's error body"""
+    headers = {'HTTP_AUTHORIZATION': 'Bearer invalid-token'}
+    data = json.dumps({'username': 'someone', 'password': 'pw'})
+    response = client.post(reverse('test_user_lifecycle'), data=data, content_type='application/json', **headers)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()['error'] == 'Invalid token'
+    assert response['WWW-Authenticate'].startswith('Bearer')
+
+def test_lifecycle_missing_token_keeps_error_shape(client):
+    """Test that requests without a token get the missing-header error"""
+    data = json.dumps({'username': 'someone', 'password': 'pw'})
+    response = client.post(reverse('test_user_lifecycle'), data=data, content_type='application/json')
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert 'Missing or invalid Authorization header' in response.json()['error']
@@ -0,0 +1 @@
+"""Endpoint benchmarks checked against a stored baseline."""
@@ -0,0 +1,48 @@
+"""
+Endpoint benchmarks, failing when a case regresses past its stored baseline.
+
+Skipped unless RUN_BENCHMARKS is set, so the correctness suite stays fast
+and free of timing noise:
+
+    RUN_BENCHMARKS=1 pytest api_app/tests/benchmarks/test_benchmark.py
+
+Set BENCHMARK_UPDATE_BASELINE=1 to store this run as the new baseline.json,
+BENCHMARK_REGRESSION_THRESHOLD to change the allowed slowdown (0.3 = 30%)
+and BENCHMARK_ITERATIONS to change the calls per timed run.
+"""
+import os
+from pathlib import Path
+import pytest
+from api_app.benchmarks import endpoints
+from api_app.benchmarks.baseline import calibrate, find_regressions, load_baseline, save_baseline
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(not os.getenv('RUN_BENCHMARKS'), reason='RUN_BENCHMARKS is not set'),
+]
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+THRESHOLD = float(os.getenv('BENCHMARK_REGRESSION_THRESHOLD', '0.3'))
+ITERATIONS = int(os.getenv('BENCHMARK_ITERATIONS', '2000'))
+
+
+@pytest.fixture(scope='module')
+def measured():
+    """Time every case once per run; each test then checks one of them"""
+    calibration = calibrate()
+    timings = endpoints.measure(ITERATIONS)
+    if os.getenv('BENCHMARK_UPDATE_BASELINE') == '1':
+        save_baseline(BASELINE_PATH, timings, calibration)
+    return timings, calibration
+
+
+@pytest.mark.parametrize('case', list(endpoints.CASES))
+def test_no_regression(measured, case):
+    timings, calibration = measured
+    baseline = load_baseline(BASELINE_PATH)
+    if baseline is None or case not in baseline['cases']:
+        pytest.skip(f"No baseline for {case}; run with BENCHMARK_UPDATE_BASELINE=1")
+
+    regressions = find_regressions(baseline, {case: timings[case]}, calibration, THRESHOLD)
+
+    assert not regressions, f"{case} regressed beyond {THRESHOLD:.0%}: {regressions[0]}"
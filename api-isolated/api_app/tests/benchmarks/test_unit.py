@@ -0,0 +1,63 @@
+import pytest
+from django.test import Client
+from api_app.benchmarks import endpoints
+from api_app.benchmarks.baseline import calibrate, find_regressions, load_baseline, save_baseline
+from api_app.views.generate_jwt_token import generate_jwt_token
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    # Recorded where the calibration workload took 10us
+    return save_baseline(str(tmp_path / 'baseline.json'), {'fast': 20e-6, 'slow': 1e-3}, 10e-6)
+
+
+def test_baseline_round_trip(tmp_path, baseline):
+    stored = load_baseline(str(tmp_path / 'baseline.json'))
+
+    assert stored == baseline
+    assert stored['cases']['fast'] == {'per_call_us': 20.0, 'relative': 2.0}
+
+
+def test_missing_baseline_loads_as_none(tmp_path):
+    assert load_baseline(str(tmp_path / 'missing.json')) is None
+
+
+def test_regression_beyond_threshold_is_reported(baseline):
+    regressions = find_regressions(baseline, {'fast': 30e-6, 'slow': 1.1e-3}, 10e-6, threshold=0.3)
+
+    assert [regression['case'] for regression in regressions] == ['fast']
+    assert regressions[0]['change'] == '+50%'
+
+
+def test_slower_machine_is_not_a_regression(baseline):
+    """Test that timings are compared after scaling by each machine's calibration"""
+    assert find_regressions(baseline, {'fast': 40e-6, 'slow': 2e-3}, 20e-6, threshold=0.3) == []
+
+
+def test_new_cases_are_not_checked(baseline):
+    assert find_regressions(baseline, {'new': 1.0}, 10e-6, threshold=0.3) == []
+
+
+def test_calibrate_is_positive():
+    assert calibrate(iterations=10) > 0
+
+
+def test_every_endpoint_case_runs():
+    """Test that each case answers successfully, so the benchmark times real work"""
+    timings = endpoints.measure(iterations=50)
+
+    assert set(timings) == set(endpoints.CASES)
+    assert all(seconds > 0 for seconds in timings.values())
+
+
+def test_cases_get_successful_responses():
+    """Test that no case times an error path (401, 429, missing Supabase config)"""
+    with endpoints.benchmark_environment():
+        client, token = Client(), generate_jwt_token()
+        for name, (_, factory) in endpoints.CASES.items():
+            result = factory(client, token)()
+            # Views return responses, run_lifecycle and snapshot_response (body, status)
+            status_code = result[1] if isinstance(result, tuple) else getattr(result, 'status_code', 200)
+            assert status_code == 200, name
@@ -0,0 +1 @@
+"""Circuit breaker tests"""
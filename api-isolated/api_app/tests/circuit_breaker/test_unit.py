@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from api_app.utils import circuit_breaker, supabase_prober
+from api_app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock, **kwargs):
+    options = dict(failure_rate_threshold=0.5, slow_call_seconds=1.0, window_size=4, minimum_calls=2, cooldown=10.0)
+    options.update(kwargs)
+    return CircuitBreaker('test', clock=clock, **options)
+
+def fail():
+    raise ValueError('upstream down')
+
+def test_breaker_opens_after_failure_rate_reached():
+    """Test that the circuit opens once the failure rate crosses the threshold"""
+    breaker = make_breaker(FakeClock())
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            breaker.call(fail)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'never called')
+
+def test_breaker_counts_slow_calls_as_failures():
+    """Test that calls slower than the latency threshold trip the circuit"""
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    def slow():
+        clock.now += 2.0
+        return 'late'
+
+    breaker.call(slow)
+    breaker.call(slow)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_breaker_allows_single_trial_when_half_open():
+    """Test that only one trial call is let through after the cool-down"""
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(2):
+        breaker.record(False, 0.0)
+
+    clock.now = 10.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record(True, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_breaker_reopens_when_trial_fails():
+    """Test that a failed trial call restarts the cool-down"""
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(2):
+        breaker.record(False, 0.0)
+
+    clock.now = 10.0
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 15.0
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_probe_fails_fast_when_circuit_open(monkeypatch):
+    """Test that the Supabase probe skips the network while the circuit is open"""
+    breaker = make_breaker(FakeClock())
+    breaker.record(False, 0.0)
+    breaker.record(False, 0.0)
+    monkeypatch.setattr(circuit_breaker, '_supabase_breaker', breaker)
+
+    def unexpected_request(*args, **kwargs):
+        raise AssertionError('Supabase should not be called while the circuit is open')
+
+    monkeypatch.setattr(supabase_prober, 'supabase_request', unexpected_request)
+    snapshot = supabase_prober.probe_supabase()
+
+    assert snapshot['connected'] is False
+    assert snapshot['circuit_state'] == CircuitBreaker.OPEN
+    assert 'is open' in snapshot['error']
+
+def _half_open_breaker(monkeypatch):
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    breaker.record(False, 0.0)
+    breaker.record(False, 0.0)
+    clock.now = 10.0
+    monkeypatch.setattr(circuit_breaker, '_supabase_breaker', breaker)
+    return breaker, clock
+
+def test_unexpected_probe_error_releases_trial(monkeypatch):
+    """Test that a non-requests error during the half-open trial cannot wedge the breaker"""
+    breaker, clock = _half_open_breaker(monkeypatch)
+
+    def bad_header(timeout):
+        raise UnicodeEncodeError('latin-1', 'apikey\u2028', 6, 7, 'ordinal not in range(256)')
+
+    monkeypatch.setitem(supabase_prober.PROBE_STRATEGIES, 'head', bad_header)
+    snapshot = supabase_prober.probe_supabase()
+
+    assert snapshot['connected'] is False
+    assert 'latin-1' in snapshot['error']
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 20.0
+    breaker.before_call()
+
+def test_unexpected_async_probe_error_releases_trial(monkeypatch):
+    breaker, clock = _half_open_breaker(monkeypatch)
+
+    async def invalid_url(timeout):
+        raise ValueError('Invalid URL')
+
+    monkeypatch.setitem(supabase_prober.ASYNC_PROBE_STRATEGIES, 'head', invalid_url)
+    snapshot = asyncio.run(supabase_prober.probe_supabase_async())
+
+    assert snapshot['connected'] is False
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 20.0
+    breaker.before_call()
+
+def test_cancelled_probe_releases_trial(monkeypatch):
+    """Test that a probe cancelled mid-flight still records its trial before propagating"""
+    breaker, clock = _half_open_breaker(monkeypatch)
+
+    async def cancelled(timeout):
+        raise asyncio.CancelledError()
+
+    monkeypatch.setitem(supabase_prober.ASYNC_PROBE_STRATEGIES, 'head', cancelled)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(supabase_prober.probe_supabase_async())
+
+    clock.now = 20.0
+    breaker.before_call()
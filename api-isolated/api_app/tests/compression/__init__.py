@@ -0,0 +1 @@
+"""Tests for the response compression middleware."""
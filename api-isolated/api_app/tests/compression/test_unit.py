@@ -0,0 +1,156 @@
+import asyncio
+import gzip
+import json
+import brotli
+import pytest
+from django.http import HttpResponse
+from django.urls import reverse
+from rest_framework import status
+from api_app.benchmarks import compression as compression_benchmark
+from api_app.middleware import CompressionMiddleware
+from api_app.utils import compression
+from api_app.utils.constant_json import ConstantJSONView
+from api_app.views.generate_jwt_token import generate_jwt_token
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip', 'gzip'),
+    ('br;q=0.5, gzip;q=0.8', 'gzip'),
+    ('gzip;q=0, br;q=0', None),
+    ('*', 'br'),
+    ('*;q=0.1, gzip', 'gzip'),
+    ('identity', None),
+    ('', None),
+])
+def test_negotiate_encoding(header, expected):
+    assert compression.negotiate_encoding(header) == expected
+
+
+def test_negotiate_without_brotli(monkeypatch):
+    """Test that only gzip is offered when the brotli module is missing"""
+    monkeypatch.setattr(compression, 'brotli', None)
+
+    assert compression.negotiate_encoding('br') is None
+    assert compression.negotiate_encoding('br, gzip') == 'gzip'
+
+
+@pytest.mark.parametrize('content_type, expected', [
+    ('application/json', True),
+    ('application/x-ndjson', True),
+    ('text/plain; version=0.0.4; charset=utf-8', True),
+    ('image/png', False),
+    (None, False),
+])
+def test_is_compressible(content_type, expected):
+    assert compression.is_compressible(content_type) is expected
+
+
+@pytest.mark.parametrize('encoding, decompress', [('gzip', gzip.decompress), ('br', brotli.decompress)])
+def test_large_json_is_compressed(client, encoding, decompress):
+    """Test that a token batch is compressed with the negotiated encoding"""
+    response = client.get(reverse('get_test_token'), {'count': 100}, HTTP_ACCEPT_ENCODING=encoding)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Encoding'] == encoding
+    assert 'Accept-Encoding' in response['Vary']
+    assert response['Content-Length'] == str(len(response.content))
+    assert len(json.loads(decompress(response.content))['tokens']) == 100
+
+
+def test_identity_when_client_does_not_ask(client):
+    response = client.get(reverse('get_test_token'), {'count': 100})
+
+    assert 'Content-Encoding' not in response
+    assert 'Accept-Encoding' in response['Vary']
+    assert len(response.json()['tokens']) == 100
+
+
+def test_small_payloads_are_skipped(client):
+    """Test that bodies under COMPRESSION_MIN_SIZE are sent as they are"""
+    response = client.get(reverse('index'), HTTP_ACCEPT_ENCODING='gzip, br')
+
+    assert 'Content-Encoding' not in response
+    assert 'Accept-Encoding' not in response.get('Vary', '')
+    assert response.content == b'{"message":"API is working!"}'
+
+
+
+@pytest.mark.parametrize('status_code, content_range', [(206, 'bytes 0-4095/8192'), (416, 'bytes */8192')])
+def test_range_responses_are_skipped(rf, status_code, content_range):
+    """Test that a Content-Range in uncompressed bytes is not paired with a compressed body"""
+    body = b'a' * 4096
+
+    def ranged(request):
+        response = HttpResponse(body, status=status_code, content_type='text/css')
+        response['Content-Range'] = content_range
+        response['Content-Length'] = str(len(body))
+        return response
+
+    response = CompressionMiddleware(ranged)(rf.get('/static/site.css', HTTP_ACCEPT_ENCODING='gzip, br'))
+
+    assert 'Content-Encoding' not in response
+    assert response['Content-Length'] == str(len(body))
+    assert response.content == body
+
+def test_compressed_etag_is_weak_and_still_revalidates(rf):
+    """Test that compression weakens the ETag and the weak form still gets a 304"""
+    view = CompressionMiddleware(ConstantJSONView({'items': ['constant'] * 500}))
+
+    response = view(rf.get('/', HTTP_ACCEPT_ENCODING='gzip'))
+    revalidated = view(rf.get('/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag']))
+
+    assert response['Content-Encoding'] == 'gzip'
+    assert response['ETag'].startswith('W/"')
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+    assert 'Content-Encoding' not in revalidated
+
+
+def test_streaming_ndjson_is_compressed(client):
+    """Test that the bulk stream is compressed without buffering it"""
+    users = [{'username': f'gzip_stream_{i}', 'password': 'pw'} for i in range(3)]
+    response = client.post(
+        reverse('test_user_lifecycle_bulk'),
+        users,
+        content_type='application/json',
+        HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token()}',
+        HTTP_ACCEPT_ENCODING='gzip'
+    )
+
+    assert response.streaming
+    assert response['Content-Encoding'] == 'gzip'
+    assert not response.has_header('Content-Length')
+    lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+    assert len(lines) == 4
+    assert 'summary' in json.loads(lines[-1])
+
+
+@pytest.mark.parametrize('encoding, decompress', [('gzip', gzip.decompress), ('br', brotli.decompress)])
+def test_stream_compressor_flushes_every_chunk(encoding, decompress):
+    """Test that each chunk produces output, so lines are not held back"""
+    chunks = [b'{"n": %d}\n' % i for i in range(5)]
+    output = list(compression.stream_compressor(chunks, encoding))
+
+    assert all(output[:5])
+    assert decompress(b''.join(output)) == b''.join(chunks)
+
+
+def test_async_stream_compressor():
+    async def chunks():
+        for i in range(3):
+            yield b'line %d\n' % i
+
+    async def collect():
+        return [data async for data in compression.astream_compressor(chunks(), 'gzip')]
+
+    assert gzip.decompress(b''.join(asyncio.run(collect()))) == b'line 0\nline 1\nline 2\n'
+
+
+def test_compression_benchmark_reports_savings():
+    rows = compression_benchmark.run(iterations=1)
+
+    compressed = [row for row in rows if 'compressed' in row]
+    assert compressed and all(int(row['saved_pct']) > 0 for row in compressed)
+    assert any(row['encoding'].startswith('none') for row in rows)
@@ -0,0 +1 @@
+"""Tests for the pre-encoded constant JSON responses."""
@@ -0,0 +1,111 @@
+import pytest
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from api_app.benchmarks import constant_responses
+from api_app.utils.constant_json import ConstantJSONView
+from api_app.views.get_api_message import api_message
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize('name', ['index', 'api-test'])
+def test_api_message_has_strong_etag(client, name):
+    """Test that the uptime endpoints answer with pre-encoded bytes and validators"""
+    response = client.get(reverse(name))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b'{"message":"API is working!"}'
+    assert response['Content-Type'] == 'application/json'
+    assert response['Content-Length'] == str(len(response.content))
+    assert response['ETag'] == api_message.etag
+    assert not response['ETag'].startswith('W/')
+    assert response['Cache-Control'] == 'no-cache'
+
+
+@pytest.mark.parametrize('if_none_match', [
+    lambda etag: etag,
+    lambda etag: f'W/{etag}',
+    lambda etag: f'"other", {etag}',
+    lambda etag: '*',
+])
+def test_matching_if_none_match_is_304(client, if_none_match):
+    """Test that a cached copy is revalidated with an empty 304"""
+    response = client.get(reverse('index'), HTTP_IF_NONE_MATCH=if_none_match(api_message.etag))
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b''
+    assert response['ETag'] == api_message.etag
+    assert response['Cache-Control'] == 'no-cache'
+
+
+def test_stale_if_none_match_gets_the_body(client):
+    response = client.get(reverse('index'), HTTP_IF_NONE_MATCH='"stale"')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"message": "API is working!"}
+
+
+def test_head_sends_headers_only(client):
+    response = client.head(reverse('index'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b''
+    assert response['Content-Length'] == str(len(api_message.body))
+
+
+def test_unsafe_methods_are_405(client):
+    """Test that POST keeps DRF's 405 body rather than failing CSRF"""
+    response = client.post(reverse('index'))
+
+    assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+    assert response.json() == {"detail": 'Method "POST" not allowed.'}
+    assert response['Allow'] == 'GET, HEAD'
+
+
+def test_api_message_skips_authentication(client):
+    """Test that a bad bearer token does not matter to the constant endpoint"""
+    response = client.get(reverse('index'), HTTP_AUTHORIZATION='Bearer not-a-token')
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_cache_control_is_configurable(client):
+    with override_settings(CONSTANT_RESPONSE_CACHE_CONTROL='public, max-age=30'):
+        response = client.get(reverse('index'))
+
+    assert response['Cache-Control'] == 'public, max-age=30'
+
+
+def test_etag_follows_the_body():
+    """Test that a different body gets a different strong ETag"""
+    first, second = ConstantJSONView({'a': 1}), ConstantJSONView({'a': 2})
+
+    assert first.etag != second.etag
+    assert first.etag == ConstantJSONView({'a': 1}).etag
+
+
+def test_error_handlers_are_not_cacheable(client):
+    """Test that the 404 handler serves its pre-encoded body without validators"""
+    with override_settings(DEBUG=False):
+        response = client.get('/no-such-page/', HTTP_IF_NONE_MATCH='*')
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {'error': '404 error, Not Found'}
+    assert 'ETag' not in response
+    assert 'Cache-Control' not in response
+
+
+def test_error_500_handler_body():
+    from api_app.views import custom_error_500
+
+    response = custom_error_500(None)
+
+    assert response.status_code == 500
+    assert response.content == b'{"error":"500 error, Internal Server Error"}'
+
+
+def test_constant_responses_benchmark_rows():
+    rows = constant_responses.run(iterations=2)
+
+    assert [row['path'] for row in rows] == ['APITest (DRF)', 'api_message', 'api_message 304']
@@ -0,0 +1 @@
+"""Tests for the fast JSON renderer, parser and response."""
@@ -0,0 +1,129 @@
+import io
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+import pytest
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from api_app.benchmarks import json_encoding
+from api_app.parsers import FastJSONParser
+from api_app.renderers import FastJSONRenderer
+from api_app.utils import fast_json
+from api_app.utils.fast_json import FastJsonResponse
+
+pytestmark = pytest.mark.unit
+
+PAYLOAD = {
+    'message': 'héllo',
+    'count': 3,
+    'ratio': 0.1,
+    'nested': {'items': [1, None, True]},
+    'when': datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+    'price': Decimal('1.50'),
+    'label': gettext_lazy('Not Found'),
+}
+
+
+def test_renderer_matches_drf_output():
+    """Test that the fast renderer produces the bytes DRF's compact renderer would"""
+    assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+
+def test_renderer_escapes_line_separators():
+    """Test that U+2028/U+2029 are escaped like DRF does"""
+    rendered = FastJSONRenderer().render({'text': 'a\u2028b\u2029c'})
+
+    assert rendered == b'{"text":"a\\u2028b\\u2029c"}'
+
+
+def test_renderer_pretty_prints_with_indent():
+    rendered = FastJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+
+    assert rendered == JSONRenderer().render({'a': 1}, 'application/json; indent=2')
+
+
+def test_renderer_renders_none_as_empty():
+    assert FastJSONRenderer().render(None) == b''
+
+
+def test_parser_reads_json_body():
+    assert FastJSONParser().parse(io.BytesIO(b'{"username": "u", "n": [1, 2]}')) == {'username': 'u', 'n': [1, 2]}
+
+
+def test_parser_reports_bad_json_like_drf():
+    with pytest.raises(ParseError, match='JSON parse error'):
+        FastJSONParser().parse(io.BytesIO(b'{"username": '))
+
+
+def test_parser_decodes_other_charsets():
+    body = '{"name": "é"}'.encode('latin-1')
+
+    assert FastJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'latin-1'}) == {'name': 'é'}
+
+
+def test_drf_uses_fast_json_classes():
+    """Test that REST_FRAMEWORK registers the fast renderer and parser first"""
+    assert api_settings.DEFAULT_RENDERER_CLASSES[0] is FastJSONRenderer
+    assert api_settings.DEFAULT_PARSER_CLASSES[0] is FastJSONParser
+
+
+def test_fast_json_response_is_drop_in():
+    """Test that FastJsonResponse keeps JsonResponse's content type, status and encoding"""
+    response = FastJsonResponse({'error': 'nope', 'when': PAYLOAD['when']}, status=404)
+
+    assert response.status_code == 404
+    assert response['Content-Type'] == 'application/json'
+    assert json.loads(response.content) == {'error': 'nope', 'when': '2024-01-02T03:04:05.678Z'}
+
+
+def test_fast_json_response_requires_dict_unless_unsafe():
+    with pytest.raises(TypeError):
+        FastJsonResponse([1, 2])
+    assert json.loads(FastJsonResponse([1, 2], safe=False).content) == [1, 2]
+
+
+def test_fast_json_response_honours_dumps_params():
+    response = FastJsonResponse({'a': 1}, json_dumps_params={'indent': 2})
+
+    assert response.content == b'{\n  "a": 1\n}'
+
+
+def test_stdlib_fallback(monkeypatch):
+    """Test that dumps/loads still work when orjson is not installed"""
+    monkeypatch.setattr(fast_json, 'orjson', None)
+
+    assert fast_json.backend() == 'json'
+    assert fast_json.dumps({'a': [1, 'é']}) == '{"a":[1,"é"]}'.encode()
+    assert fast_json.loads(b'{"a": 1}') == {'a': 1}
+
+
+@pytest.mark.parametrize('name', ['index', 'get_test_token', 'test_config'])
+def test_endpoints_answer_json(client, name):
+    """Test that plain Django and DRF endpoints both answer through the fast layer"""
+    response = client.get(reverse(name))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'application/json'
+    response.json()
+
+
+def test_error_handler_answers_json(client):
+    with override_settings(DEBUG=False):
+        response = client.get('/no-such-page/')
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {'error': '404 error, Not Found'}
+
+
+def test_json_encoding_benchmark_covers_each_payload():
+    """Test that the benchmark times every endpoint payload and the parser"""
+    rows = json_encoding.run(iterations=2)
+
+    assert [row['payload'] for row in rows][-1] == 'parse POST /api/auth/test/'
+    assert len(rows) == len(json_encoding._payloads()) + 1
+    assert all(float(row['speedup'].rstrip('x')) > 0 for row in rows)
@@ -1,9 +1,12 @@
 import pytest
 import json
 import re
+import jwt
+from django.conf import settings
 from django.urls import reverse
 from rest_framework import status
 from django.test.utils import override_settings
+from api_app.views.generate_jwt_token import generate_jwt_tokens
 
 pytestmark = pytest.mark.jwt
 
@@ -31,3 +34,63 @@ def test_jwt_token_format(client):
     token = data['token']
     assert token and len(token) > 0
     assert re.match(r"^[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+$", token)
+
+@pytest.mark.unit
+def test_batch_tokens_verify_with_pyjwt():
+    """Test that batch-minted tokens decode exactly like single-path tokens"""
+    tokens = generate_jwt_tokens(3, claims=[{'user_id': 'alice', 'role': 'tester', 'lifetime': 60}])
+
+    assert len(tokens) == 3
+    first = jwt.decode(tokens[0], settings.JWT_SECRET, algorithms=['HS256'])
+    assert first['user_id'] == 'alice'
+    assert first['role'] == 'tester'
+    assert first['exp'] - first['iat'] == 60
+
+    rest = jwt.decode(tokens[2], settings.JWT_SECRET, algorithms=['HS256'])
+    assert rest['user_id'] == 'test_user'
+    assert rest['role'] == 'service_role'
+
+@pytest.mark.unit
+def test_batch_endpoint_get_with_count(client):
+    """Test that GET with count returns that many tokens with shared claims"""
+    response = client.get(reverse('get_test_token'), {'count': 5, 'role': 'anon'})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data['count'] == 5
+    assert len(data['tokens']) == 5
+    for token in data['tokens']:
+        assert jwt.decode(token, settings.JWT_SECRET, algorithms=['HS256'])['role'] == 'anon'
+
+@pytest.mark.unit
+def test_batch_endpoint_post_per_token_claims(client):
+    """Test that POST accepts per-token claims"""
+    body = {'claims': [{'user_id': 'u1'}, {'user_id': 'u2', 'lifetime': 120}]}
+    response = client.post(reverse('get_test_token'), data=body, content_type='application/json')
+
+    assert response.status_code == status.HTTP_200_OK
+    tokens = response.json()['tokens']
+    decoded = [jwt.decode(token, settings.JWT_SECRET, algorithms=['HS256']) for token in tokens]
+    assert [claims['user_id'] for claims in decoded] == ['u1', 'u2']
+    assert decoded[1]['exp'] - decoded[1]['iat'] == 120
+
+@pytest.mark.unit
+@pytest.mark.parametrize('params', [
+    {'count': 0},
+    {'count': 1001},
+    {'count': 'many'},
+    {'count': 2, 'lifetime': -5},
+])
+def test_batch_endpoint_rejects_invalid_requests(client, params):
+    """Test that the batch endpoint enforces its bounds"""
+    response = client.get(reverse('get_test_token'), params)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()['error'] == 'Invalid token request'
+
+@pytest.mark.unit
+@pytest.mark.parametrize('body', ['[1, 2]', '"text"', '3'])
+def test_token_endpoint_rejects_non_object_body(client, body):
+    """Test that a JSON body that is not an object is a 400 rather than a 500"""
+    response = client.post(reverse('get_test_token'), data=body, content_type='application/json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()['error'] == 'Invalid token request'
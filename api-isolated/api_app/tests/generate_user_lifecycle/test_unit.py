@@ -41,4 +41,60 @@ def test_user_lifecycle_success(client, test_credentials):
     assert response_data['message'] == 'User lifecycle test completed successfully'
     assert response_data['details']['signup'] == 'success'
     assert response_data['details']['signin'] == 'success'
-    assert response_data['details']['delete'] == 'success'
\ No newline at end of file
+    assert response_data['details']['delete'] == 'success'
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_user_lifecycle_server_timing_header(client, test_credentials):
+    """Test that each lifecycle step and the token check appear in Server-Timing"""
+    response = client.post(
+        reverse('test_user_lifecycle'),
+        data={'username': test_credentials['username'], 'password': test_credentials['password']},
+        content_type='application/json',
+        HTTP_AUTHORIZATION=f'Bearer {test_credentials["token"]}'
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    steps = [part.strip().split(';')[0] for part in response['Server-Timing'].split(',')]
+    assert steps == ['auth', 'signup', 'signin', 'delete', 'total']
+    assert 'timings_ms' not in json.loads(response.content)['details']
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_user_lifecycle_timings_in_details(client, test_credentials):
+    """Test that ?timings=1 also reports step durations in the JSON details"""
+    response = client.post(
+        reverse('test_user_lifecycle') + '?timings=1',
+        data={'username': test_credentials['username'], 'password': test_credentials['password']},
+        content_type='application/json',
+        HTTP_AUTHORIZATION=f'Bearer {test_credentials["token"]}'
+    )
+
+    timings = json.loads(response.content)['details']['timings_ms']
+    assert set(timings) == {'auth', 'signup', 'signin', 'delete'}
+    assert all(value >= 0 for value in timings.values())
+
+@pytest.mark.unit
+def test_server_timing_header_format():
+    """Test Server-Timing serialisation with descriptions"""
+    from api_app.utils.server_timing import ServerTiming
+
+    timing = ServerTiming()
+    timing.add('db', 0.0123, 'Query "users"')
+    timing.add('cache', 0.0005)
+
+    assert timing.header_value() == 'db;dur=12.300;desc="Query \\"users\\"", cache;dur=0.500'
+    assert timing.as_dict() == {'db': 12.3, 'cache': 0.5}
+
+@pytest.mark.unit
+def test_user_lifecycle_rejects_non_object_body(client, test_credentials):
+    """Test that a JSON body that is not an object is a 400 rather than a 500"""
+    response = client.post(
+        reverse('test_user_lifecycle'),
+        data='["user", "pw"]',
+        content_type='application/json',
+        HTTP_AUTHORIZATION=f'Bearer {test_credentials["token"]}'
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "JSON body must be an object"}
@@ -0,0 +1 @@
+"""Bulk user lifecycle endpoint tests"""
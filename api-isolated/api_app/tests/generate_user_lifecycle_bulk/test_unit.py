@@ -0,0 +1,106 @@
+import json
+import pytest
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from api_app.views.generate_jwt_token import generate_jwt_token
+
+pytestmark = pytest.mark.unit
+
+@pytest.fixture
+def auth_headers():
+    return {'HTTP_AUTHORIZATION': f'Bearer {generate_jwt_token()}'}
+
+def read_lines(response):
+    assert response.streaming
+    return [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+
+def test_bulk_json_array_streams_result_per_user(client, auth_headers):
+    """Test that a JSON array yields one NDJSON line per user plus a summary"""
+    users = [{'username': f'bulk_user_{i}', 'password': 'pw'} for i in range(10)]
+    response = client.post(
+        reverse('test_user_lifecycle_bulk'),
+        data=json.dumps(users),
+        content_type='application/json',
+        **auth_headers
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'application/x-ndjson'
+    lines = read_lines(response)
+    results, summary = lines[:-1], lines[-1]['summary']
+
+    assert sorted(result['index'] for result in results) == list(range(10))
+    assert all(result['status'] == 200 for result in results)
+    assert all(result['details']['delete'] == 'success' for result in results)
+    assert summary == {'total': 10, 'succeeded': 10, 'failed': 0}
+
+def test_bulk_ndjson_reports_bad_lines(client, auth_headers):
+    """Test that NDJSON input is processed line by line, including bad lines"""
+    body = '\n'.join([
+        json.dumps({'username': 'ndjson_ok', 'password': 'pw'}),
+        '{not json',
+        json.dumps({'username': 'ndjson_no_password'}),
+    ])
+    response = client.post(
+        reverse('test_user_lifecycle_bulk'),
+        data=body,
+        content_type='application/x-ndjson',
+        **auth_headers
+    )
+
+    lines = read_lines(response)
+    by_index = {line['index']: line for line in lines[:-1]}
+    assert by_index[0]['status'] == 200
+    assert by_index[1]['status'] == 400
+    assert by_index[1]['error'] == 'Invalid JSON line'
+    assert by_index[2]['error'] == 'Missing credentials'
+    assert lines[-1]['summary'] == {'total': 3, 'succeeded': 1, 'failed': 2}
+
+def test_bulk_ndjson_stops_at_limit(client, auth_headers):
+    """Test that streamed input beyond the per-request limit is not processed"""
+    body = '\n'.join(json.dumps({'username': f'capped_{i}', 'password': 'pw'}) for i in range(5))
+    with override_settings(LIFECYCLE_BULK_MAX_USERS=3):
+        response = client.post(
+            reverse('test_user_lifecycle_bulk'),
+            data=body,
+            content_type='application/x-ndjson',
+            **auth_headers
+        )
+        lines = read_lines(response)
+
+    summary = lines[-1]['summary']
+    assert summary['total'] == 3
+    assert summary['truncated'] is True
+
+def test_bulk_json_array_over_limit_rejected(client, auth_headers):
+    """Test that oversized JSON arrays are rejected up front"""
+    users = [{'username': f'too_many_{i}', 'password': 'pw'} for i in range(3)]
+    with override_settings(LIFECYCLE_BULK_MAX_USERS=2):
+        response = client.post(
+            reverse('test_user_lifecycle_bulk'),
+            data=json.dumps(users),
+            content_type='application/json',
+            **auth_headers
+        )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_bulk_requires_token(client):
+    """Test that the bulk endpoint needs a bearer token"""
+    response = client.post(reverse('test_user_lifecycle_bulk'), data='[]', content_type='application/json')
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_bulk_lines_are_compact_json(client, auth_headers):
+    """Test that result lines use the API's compact encoder, like every other response"""
+    response = client.post(
+        reverse('test_user_lifecycle_bulk'),
+        data=json.dumps([{'username': 'compact_user', 'password': 'pw'}]),
+        content_type='application/json',
+        **auth_headers
+    )
+
+    lines = b''.join(response.streaming_content).splitlines()
+    assert len(lines) == 2
+    for line in lines:
+        assert b'": ' not in line and b', "' not in line
+        assert json.dumps(json.loads(line), separators=(',', ':')).encode() == line
@@ -0,0 +1 @@
+"""Deep health endpoint tests"""
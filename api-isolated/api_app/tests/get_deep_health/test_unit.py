@@ -0,0 +1,83 @@
+import time
+import pytest
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from api_app.views import get_deep_health
+
+pytestmark = pytest.mark.unit
+
+def ok_check(budget):
+    pass
+
+def slow_check(budget):
+    time.sleep(0.2)
+
+def failing_check(budget):
+    raise ConnectionError('dependency down')
+
+@pytest.mark.django_db
+def test_deep_health_reports_each_dependency(client, monkeypatch):
+    """Test that database and JWT checks run and every dependency is reported"""
+    monkeypatch.setitem(get_deep_health.DEPENDENCY_CHECKS, 'supabase_rest', ok_check)
+    monkeypatch.setitem(get_deep_health.DEPENDENCY_CHECKS, 'supabase_auth', ok_check)
+
+    response = client.get(reverse('deep_health_check'))
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data['status'] == 'healthy'
+    assert set(data['checks']) == {'database', 'supabase_rest', 'supabase_auth', 'jwt'}
+    for check in data['checks'].values():
+        assert check['status'] == 'ok'
+        assert check['latency_ms'] >= 0
+
+def test_deep_health_runs_checks_concurrently(client, monkeypatch):
+    """Test that total duration is close to the slowest check, not the sum"""
+    monkeypatch.setattr(get_deep_health, 'DEPENDENCY_CHECKS', {
+        'a': slow_check,
+        'b': slow_check,
+        'c': slow_check,
+    })
+
+    response = client.get(reverse('deep_health_check'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['duration_ms'] < 500
+
+def test_deep_health_marks_failures_and_deadline(client, monkeypatch):
+    """Test that failing checks and checks past the deadline are reported"""
+    monkeypatch.setattr(get_deep_health, 'DEPENDENCY_CHECKS', {
+        'broken': failing_check,
+        'stuck': slow_check,
+        'fine': ok_check,
+    })
+
+    with override_settings(DEEP_HEALTH_DEADLINE=0.05):
+        response = client.get(reverse('deep_health_check'))
+
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    data = response.json()
+    assert data['status'] == 'unhealthy'
+    assert data['checks']['broken']['status'] == 'error'
+    assert 'dependency down' in data['checks']['broken']['message']
+    assert data['checks']['stuck']['status'] == 'timeout'
+    assert data['checks']['fine']['status'] == 'ok'
+
+def test_deep_health_flags_checks_over_budget(client, monkeypatch):
+    """Test that a check slower than its budget degrades the overall status"""
+    monkeypatch.setattr(get_deep_health, 'DEPENDENCY_CHECKS', {'sluggish': slow_check})
+
+    with override_settings(DEEP_HEALTH_PROBE_BUDGET=0.05):
+        response = client.get(reverse('deep_health_check'))
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data['status'] == 'degraded'
+    assert data['checks']['sluggish']['status'] == 'slow'
+
+def test_basic_health_shape_unchanged(client):
+    """Test that the frontend's /api/health/ keeps its original fields"""
+    data = client.get(reverse('health_check')).json()
+    for field in ['status', 'message', 'supabase_connected', 'supabase_url_configured', 'supabase_key_configured']:
+        assert field in data
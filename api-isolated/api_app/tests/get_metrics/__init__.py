@@ -0,0 +1 @@
+"""Metrics endpoint tests"""
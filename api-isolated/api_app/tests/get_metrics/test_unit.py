@@ -0,0 +1,125 @@
+import os
+import json
+import pytest
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from api_app.utils import metrics
+
+pytestmark = pytest.mark.unit
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    """Give every test an empty metrics registry"""
+    registry = metrics.MetricsRegistry()
+    registry._help = dict(metrics.registry._help)
+    monkeypatch.setattr(metrics, 'registry', registry)
+    return registry
+
+@pytest.mark.django_db
+def test_metrics_count_requests_per_url_name(client):
+    """Test that requests are counted by URL name, method and status"""
+    client.get(reverse('index'))
+    client.get(reverse('index'))
+    client.get('/api/does-not-exist/')
+
+    response = client.get(reverse('metrics'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'].startswith('text/plain')
+    body = response.content.decode()
+    assert 'http_requests_total{method="GET",status="200",view="index"} 2' in body
+    assert 'http_requests_total{method="GET",status="404",view="unmatched"} 1' in body
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_request_duration_seconds_count{view="index"} 2' in body
+
+def test_histogram_buckets_are_cumulative():
+    """Test that rendered histogram buckets accumulate up to +Inf"""
+    metrics.observe('probe_seconds', 0.003, buckets=(0.001, 0.01, 0.1))
+    metrics.observe('probe_seconds', 0.05, buckets=(0.001, 0.01, 0.1))
+    metrics.observe('probe_seconds', 3.0, buckets=(0.001, 0.01, 0.1))
+
+    with override_settings(METRICS_MULTIPROC_DIR=''):
+        body = metrics.render_prometheus()
+
+    assert 'probe_seconds_bucket{le="0.001"} 0' in body
+    assert 'probe_seconds_bucket{le="0.01"} 1' in body
+    assert 'probe_seconds_bucket{le="0.1"} 2' in body
+    assert 'probe_seconds_bucket{le="+Inf"} 3' in body
+    assert 'probe_seconds_count 3' in body
+
+def test_metrics_merge_other_worker_files(tmp_path):
+    """Test that a scrape sums the metrics dumped by other worker processes"""
+    other_worker = metrics.MetricsRegistry()
+    other_worker.inc('http_requests_total', {'view': 'health_check', 'method': 'GET', 'status': '200'}, 3)
+    other_worker.observe('http_request_duration_seconds', 0.02, {'view': 'health_check'})
+    (tmp_path / 'metrics_999999.json').write_text(json.dumps(other_worker.snapshot()))
+
+    metrics.inc('http_requests_total', {'view': 'health_check', 'method': 'GET', 'status': '200'})
+    metrics.observe('http_request_duration_seconds', 0.2, {'view': 'health_check'})
+
+    with override_settings(METRICS_MULTIPROC_DIR=str(tmp_path)):
+        body = metrics.render_prometheus()
+
+    assert 'http_requests_total{method="GET",status="200",view="health_check"} 4' in body
+    assert 'http_request_duration_seconds_count{view="health_check"} 2' in body
+    assert any(path.name.startswith('metrics_') and path.name != 'metrics_999999.json' for path in tmp_path.iterdir())
+
+def test_label_values_are_escaped():
+    """Test that quotes and backslashes in label values are escaped"""
+    metrics.inc('odd_total', {'view': 'a"b\\c'})
+    with override_settings(METRICS_MULTIPROC_DIR=''):
+        body = metrics.render_prometheus()
+    assert 'odd_total{view="a\\"b\\\\c"} 1' in body
+
+def test_gauges_are_per_live_worker(tmp_path):
+    """Test that gauges keep a pid label and dead workers' gauges are dropped"""
+    dead_worker = metrics.MetricsRegistry()
+    dead_worker.set_gauge('lifecycle_user_store_entries', 7, {'backend': 'LockStripedUserStore'})
+    dead_worker.inc('lifecycle_user_store_evictions_total', {'reason': 'ttl'}, 2)
+    (tmp_path / 'metrics_999999.json').write_text(json.dumps(dead_worker.snapshot()))
+
+    metrics.set_gauge('lifecycle_user_store_entries', 3, {'backend': 'LockStripedUserStore'})
+
+    with override_settings(METRICS_MULTIPROC_DIR=str(tmp_path)):
+        body = metrics.render_prometheus()
+
+    assert '# TYPE lifecycle_user_store_entries gauge' in body
+    assert f'lifecycle_user_store_entries{{backend="LockStripedUserStore",pid="{os.getpid()}"}} 3' in body
+    assert 'pid="999999"' not in body
+    assert 'lifecycle_user_store_evictions_total{reason="ttl"} 2' in body
+
+def _dead_worker_file(directory, pid, requests):
+    worker = metrics.MetricsRegistry()
+    worker.inc('http_requests_total', {'view': 'index', 'method': 'GET', 'status': '200'}, requests)
+    worker.observe('http_request_duration_seconds', 0.01, {'view': 'index'})
+    (directory / f'metrics_{pid}.json').write_text(json.dumps(worker.snapshot()))
+
+def test_exited_workers_are_archived(tmp_path):
+    """Test that exited workers' files are folded into one archive, counted once per scrape"""
+    _dead_worker_file(tmp_path, 999998, 2)
+    _dead_worker_file(tmp_path, 999999, 3)
+
+    with override_settings(METRICS_MULTIPROC_DIR=str(tmp_path)):
+        first = metrics.render_prometheus()
+        _dead_worker_file(tmp_path, 999997, 4)
+        second = metrics.render_prometheus()
+
+    assert 'http_requests_total{method="GET",status="200",view="index"} 5' in first
+    assert 'http_requests_total{method="GET",status="200",view="index"} 9' in second
+    assert 'http_request_duration_seconds_count{view="index"} 3' in second
+    assert not any(path.name.startswith('metrics_9999') for path in tmp_path.iterdir())
+    assert (tmp_path / metrics.ARCHIVE_FILE).exists()
+
+def test_recycled_pid_keeps_predecessor_totals(tmp_path, monkeypatch):
+    """Test that a new worker reusing an exited worker's pid does not overwrite its counters"""
+    _dead_worker_file(tmp_path, os.getpid(), 5)
+    monkeypatch.setattr(metrics, '_flushed', False)
+    metrics.inc('http_requests_total', {'view': 'index', 'method': 'GET', 'status': '200'})
+
+    with override_settings(METRICS_MULTIPROC_DIR=str(tmp_path)):
+        first = metrics.render_prometheus()
+        second = metrics.render_prometheus()
+
+    assert 'http_requests_total{method="GET",status="200",view="index"} 6' in first
+    assert 'http_requests_total{method="GET",status="200",view="index"} 6' in second
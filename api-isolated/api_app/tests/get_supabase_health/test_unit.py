@@ -2,6 +2,14 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 from django.test import Client
+import threading
+import time
+from django.test.utils import override_settings
+from api_app.utils import circuit_breaker, supabase_prober
+from api_app.utils.circuit_breaker import CircuitBreaker
+from api_app.utils.supabase_prober import SupabaseProber
+from api_app.utils.supabase_transport import reset_session
+from ..utils.local_http import StubHandler, local_http_server
 
 @pytest.mark.unit
 def test_health_check_endpoint(client):
@@ -44,4 +52,105 @@ def test_health_check_response_structure(client):
     assert isinstance(data['message'], str)
     assert data['supabase_connected'] is False
     assert isinstance(data['supabase_url_configured'], bool)
-    assert isinstance(data['supabase_key_configured'], bool) 
\ No newline at end of file
+    assert isinstance(data['supabase_key_configured'], bool) 
+
+def _fake_snapshot(connected=True, error=''):
+    return {
+        'connected': connected,
+        'error': error,
+        'checked_at': time.time(),
+        'checked_monotonic': time.monotonic(),
+        'latency_ms': 1.0,
+    }
+
+@pytest.mark.unit
+def test_prober_reuses_cached_snapshot():
+    """Test that the prober answers from its snapshot once it has one"""
+    calls = []
+
+    def probe():
+        calls.append(1)
+        return _fake_snapshot()
+
+    prober = SupabaseProber(interval=60, probe=probe)
+    try:
+        first = prober.snapshot()
+        second = prober.snapshot()
+    finally:
+        prober.stop()
+
+    assert first is second
+    assert len(calls) == 1
+
+@pytest.mark.unit
+def test_prober_refreshes_in_background():
+    """Test that the background thread refreshes the snapshot on its interval"""
+    refreshed = threading.Event()
+    calls = []
+
+    def probe():
+        calls.append(1)
+        if len(calls) > 1:
+            refreshed.set()
+        return _fake_snapshot()
+
+    prober = SupabaseProber(interval=0.01, probe=probe)
+    try:
+        prober.snapshot()
+        assert refreshed.wait(timeout=2)
+    finally:
+        prober.stop()
+
+@pytest.mark.unit
+def test_prober_without_interval_probes_every_time():
+    """Test that an interval of 0 probes inline on every read"""
+    calls = []
+
+    def probe():
+        calls.append(1)
+        return _fake_snapshot()
+
+    prober = SupabaseProber(interval=0, probe=probe)
+    prober.snapshot()
+    prober.snapshot()
+    assert len(calls) == 2
+
+@pytest.mark.unit
+def test_health_check_reports_snapshot_age(client, monkeypatch):
+    """Test that the health check answers from the cached snapshot with its age"""
+    prober = SupabaseProber(interval=0, probe=_fake_snapshot)
+    monkeypatch.setattr(supabase_prober, '_prober', prober)
+
+    response = client.get(reverse('health_check'))
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data['status'] == 'healthy'
+    assert data['supabase_connected'] is True
+    assert data['snapshot_age_seconds'] >= 0
+    assert 'checked_at' in data
+
+@pytest.mark.unit
+@pytest.mark.parametrize('strategy, method, path, reads_body', [
+    ('head', 'HEAD', '/rest/v1/', False),
+    ('stream', 'GET', '/rest/v1/', False),
+    ('rpc', 'POST', '/rest/v1/rpc/health_ping', True),
+    ('get', 'GET', '/rest/v1/', True),
+])
+def test_probe_strategies_record_bytes_and_latency(local_http_server, monkeypatch, strategy, method, path, reads_body):
+    """Test that each probe strategy hits the expected endpoint and records its cost"""
+    monkeypatch.setattr(circuit_breaker, '_supabase_breaker', CircuitBreaker('test'))
+    reset_session()
+    try:
+        with override_settings(SUPABASE_URL=local_http_server.url, SUPABASE_HEALTH_PROBE_STRATEGY=strategy):
+            snapshot = supabase_prober.probe_supabase()
+    finally:
+        reset_session()
+
+    assert snapshot['connected'] is True
+    assert snapshot['strategy'] == strategy
+    assert snapshot['latency_ms'] > 0
+    assert local_http_server.requests == [(method, path)]
+
+    header_bytes = snapshot['bytes_transferred'] - (len(StubHandler.body) if reads_body else 0)
+    assert 0 < header_bytes < 500
@@ -0,0 +1 @@
+"""Gunicorn configuration tests"""
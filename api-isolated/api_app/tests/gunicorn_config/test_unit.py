@@ -0,0 +1,133 @@
+import importlib.util
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import time
+import pytest
+import requests
+from django.test.utils import override_settings
+from api_app.utils import metrics
+
+pytestmark = pytest.mark.unit
+
+CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    'gunicorn.conf.py'
+)
+
+class FakeServer:
+    log = logging.getLogger('gunicorn.test')
+
+def load_config(monkeypatch, **env):
+    """Execute gunicorn.conf.py with ``env`` applied and return it as a module"""
+    for name in ('GUNICORN_WORKER_CLASS', 'GUNICORN_WORKERS', 'GUNICORN_THREADS', 'DJANGO_ASYNC_VIEWS'):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    spec = importlib.util.spec_from_file_location('gunicorn_conf_under_test', CONFIG_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.mark.parametrize('worker_class,cpus,memory_mb,expected', [
+    ('sync', 2, 4096, 5),
+    ('gthread', 2, 4096, 3),
+    ('uvicorn', 2, 4096, 2),
+    ('sync', 8, 512, 4),    # memory-bound: 512 MB / 128 MB per worker
+    ('sync', 1, None, 3),   # unknown memory leaves the CPU target alone
+    ('gthread', 1, 64, 1),  # never below one worker
+])
+def test_compute_workers(monkeypatch, worker_class, cpus, memory_mb, expected):
+    """Test that worker counts follow CPUs and are capped by memory"""
+    config = load_config(monkeypatch)
+    assert config.compute_workers(worker_class, cpus, memory_mb, 128) == expected
+
+def test_worker_class_selects_app_and_threads(monkeypatch):
+    """Test that each worker class gets the matching entry point and threads"""
+    gthread = load_config(monkeypatch, GUNICORN_WORKER_CLASS='gthread', GUNICORN_THREADS='8')
+    assert (gthread.worker_class, gthread.threads, gthread.wsgi_app) == ('gthread', 8, 'api_project.wsgi:application')
+
+    uvicorn = load_config(monkeypatch, GUNICORN_WORKER_CLASS='uvicorn')
+    assert uvicorn.worker_class == 'uvicorn.workers.UvicornWorker'
+    assert uvicorn.wsgi_app == 'api_project.asgi:application'
+    assert uvicorn.threads == 1
+
+def test_uvicorn_workers_get_async_views(monkeypatch):
+    """Test that the config, not asgi.py, turns on the async views for uvicorn workers"""
+    assert load_config(monkeypatch, GUNICORN_WORKER_CLASS='uvicorn').raw_env == ['DJANGO_ASYNC_VIEWS=True']
+    assert load_config(monkeypatch, GUNICORN_WORKER_CLASS='gthread').raw_env == []
+    pinned = load_config(monkeypatch, GUNICORN_WORKER_CLASS='uvicorn', DJANGO_ASYNC_VIEWS='False')
+    assert pinned.raw_env == ['DJANGO_ASYNC_VIEWS=False']
+
+@pytest.mark.skipif(not shutil.which('gunicorn'), reason='gunicorn is not installed')
+def test_uvicorn_server_serves_async_views(tmp_path):
+    """Test that a real uvicorn-worker gunicorn answers with the async views, not DRF's"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    env = {name: value for name, value in os.environ.items() if name != 'DJANGO_ASYNC_VIEWS'}
+    env.update(
+        DJANGO_SETTINGS_MODULE='api_project.settings',
+        GUNICORN_WORKER_CLASS='uvicorn',
+        GUNICORN_WORKERS='1',
+        METRICS_MULTIPROC_DIR=str(tmp_path),
+        PORT=str(port),
+    )
+    server = subprocess.Popen(
+        ['gunicorn', '--config', 'gunicorn.conf.py'],
+        cwd=os.path.dirname(CONFIG_PATH),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                response = requests.get(f"http://127.0.0.1:{port}/api/auth/token/", timeout=5)
+                break
+            except requests.ConnectionError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.2)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    assert response.status_code == 200
+    # DRF's views add both; the async views do not
+    assert 'Allow' not in response.headers
+    assert 'Accept' not in response.headers.get('Vary', '')
+
+def test_explicit_worker_count_wins(monkeypatch):
+    """Test that GUNICORN_WORKERS overrides auto-sizing"""
+    config = load_config(monkeypatch, GUNICORN_WORKERS='7')
+    assert config.workers == 7
+    assert config.max_requests_jitter > 0
+
+def test_unknown_worker_class_rejected(monkeypatch):
+    """Test that a typo in GUNICORN_WORKER_CLASS fails at startup"""
+    with pytest.raises(ValueError):
+        load_config(monkeypatch, GUNICORN_WORKER_CLASS='gevent')
+
+def test_on_starting_clears_stale_metrics(monkeypatch, tmp_path):
+    """Test that the master wipes metrics files left by a previous run"""
+    config = load_config(monkeypatch)
+    (tmp_path / 'metrics_12345.json').write_text('{}')
+
+    with override_settings(METRICS_MULTIPROC_DIR=str(tmp_path)):
+        config.on_starting(FakeServer())
+
+    assert list(tmp_path.iterdir()) == []
+
+def test_worker_exit_flushes_metrics(monkeypatch, tmp_path):
+    """Test that an exiting worker writes its last counters"""
+    config = load_config(monkeypatch)
+    metrics.inc('http_requests_total', {'view': 'index', 'method': 'GET', 'status': '200'})
+
+    with override_settings(METRICS_MULTIPROC_DIR=str(tmp_path)):
+        config.worker_exit(FakeServer(), worker=None)
+
+    assert (tmp_path / f'metrics_{os.getpid()}.json').exists()
@@ -0,0 +1 @@
+"""Lifecycle password hashing tests"""
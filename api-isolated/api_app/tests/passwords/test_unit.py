@@ -0,0 +1,91 @@
+import json
+import os
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from api_app import user_stores
+from api_app.user_stores import LockStripedUserStore
+from api_app.utils import passwords
+from api_app.utils.passwords import PasswordHasherBusy, hash_password, verify_password
+from api_app.views.generate_jwt_token import generate_jwt_token
+
+pytestmark = pytest.mark.unit
+
+@pytest.fixture
+def fresh_pool(monkeypatch):
+    """Build a new hashing pool for the test and shut it down afterwards"""
+    monkeypatch.setattr(passwords, '_pool', None)
+    yield
+    if passwords._pool is not None:
+        passwords._pool.shutdown(wait=True, cancel_futures=True)
+
+def test_hash_uses_configured_work_factor():
+    """Test that hashes carry PASSWORD_HASH_ITERATIONS and verify correctly"""
+    with override_settings(PASSWORD_HASH_ITERATIONS=1234):
+        encoded = hash_password('s3cret')
+
+    assert encoded.startswith('pbkdf2_sha256$1234$')
+    assert verify_password('s3cret', encoded)
+    assert not verify_password('wrong', encoded)
+
+def test_offloaded_hashing_matches_inline(fresh_pool):
+    """Test that hashing through the process pool produces verifiable hashes"""
+    with override_settings(PASSWORD_HASH_OFFLOAD=True, PASSWORD_HASH_WORKERS=1):
+        encoded = hash_password('pooled')
+        assert verify_password('pooled', encoded)
+
+    assert verify_password('pooled', encoded)
+
+def test_full_queue_raises_busy(fresh_pool):
+    """Test that callers fail fast once every hashing slot is taken"""
+    with override_settings(
+        PASSWORD_HASH_OFFLOAD=True,
+        PASSWORD_HASH_WORKERS=1,
+        PASSWORD_HASH_MAX_PENDING=1,
+        PASSWORD_HASH_QUEUE_TIMEOUT=0.01
+    ):
+        running = passwords.submit(passwords._encode, 'slow', 'salt', 3_000_000)
+        with pytest.raises(PasswordHasherBusy):
+            hash_password('queued')
+        running.result()
+
+def test_pool_recovers_after_child_dies(fresh_pool):
+    """Test that a killed hashing child does not leave the pool (or its slots) broken"""
+    with override_settings(
+        PASSWORD_HASH_OFFLOAD=True,
+        PASSWORD_HASH_WORKERS=1,
+        PASSWORD_HASH_MAX_PENDING=1,
+        PASSWORD_HASH_QUEUE_TIMEOUT=0.5
+    ):
+        hash_password('warm')
+        broken = passwords._pool
+        crashed = passwords.submit(os._exit, 1)
+        with pytest.raises(BrokenProcessPool):
+            crashed.result(timeout=10)
+
+        encoded = hash_password('after crash')
+        assert verify_password('after crash', encoded)
+        assert passwords._pool is not broken
+        # The slot held by the failed submit was released
+        assert hash_password('again')
+
+def test_lifecycle_never_stores_plaintext(client, monkeypatch):
+    """Test that the lifecycle endpoint stores a hash instead of the password"""
+    stored = []
+
+    class RecordingStore(LockStripedUserStore):
+        def create(self, username, record):
+            stored.append(record)
+            return super().create(username, record)
+
+    monkeypatch.setattr(user_stores, '_store', RecordingStore())
+    headers = {'HTTP_AUTHORIZATION': f'Bearer {generate_jwt_token()}'}
+    data = json.dumps({'username': 'hashed_user', 'password': 'plaintext-pw'})
+
+    response = client.post(reverse('test_user_lifecycle'), data=data, content_type='application/json', **headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert stored[0]['password'] != 'plaintext-pw'
+    assert stored[0]['password'].startswith('pbkdf2_sha256$')
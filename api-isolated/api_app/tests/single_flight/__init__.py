@@ -0,0 +1 @@
+"""Tests for coalescing concurrent upstream calls."""
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+import pytest
+from django.test import Client
+from django.urls import reverse
+from api_app.utils import metrics
+from api_app.utils.single_flight import SingleFlight
+from api_app.utils.supabase_prober import SupabaseProber
+from api_app.views import get_deep_health
+
+pytestmark = pytest.mark.unit
+
+CALLERS = 8
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    """Give every test an empty metrics registry"""
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, 'registry', registry)
+    return registry
+
+
+def _snapshot():
+    return {
+        'connected': True,
+        'error': '',
+        'checked_at': time.time(),
+        'checked_monotonic': time.monotonic(),
+        'latency_ms': 1.0,
+    }
+
+
+def _run_together(target, count=CALLERS):
+    """Call ``target`` from ``count`` threads and return their results"""
+    results = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+class _Upstream:
+    """A slow upstream call that stays in flight until every caller has joined it"""
+
+    def __init__(self, flight, result='ok', error=None):
+        self.flight = flight
+        self.result = result
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        deadline = time.monotonic() + 2
+        while self.flight._flights and time.monotonic() < deadline:
+            if next(iter(self.flight._flights.values())).callers >= CALLERS:
+                break
+            time.sleep(0.001)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def test_concurrent_calls_share_one_call(fresh_registry):
+    """Test that callers arriving mid-flight get the leader's result"""
+    flight = SingleFlight('test')
+    upstream = _Upstream(flight, result={'answer': 42})
+
+    results = _run_together(lambda: flight.do('key', upstream))
+
+    assert upstream.calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight.in_flight() == 0
+    snapshot = fresh_registry.snapshot()
+    counters = {tuple(map(tuple, labels)): value for _, labels, value in snapshot['counters']}
+    assert counters[(('name', 'test'), ('role', 'leader'))] == 1
+    assert counters[(('name', 'test'), ('role', 'shared'))] == CALLERS - 1
+    [[_, _, histogram]] = snapshot['histograms']
+    assert histogram['sum'] == CALLERS
+
+
+def test_error_is_shared_and_not_cached():
+    """Test that every waiter sees the leader's exception and the next call retries"""
+    flight = SingleFlight('test')
+    upstream = _Upstream(flight, error=ConnectionError('down'))
+
+    results = _run_together(lambda: flight.do('key', upstream))
+
+    assert upstream.calls == 1
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert flight.do('key', lambda: 'recovered') == 'recovered'
+
+
+def test_sequential_and_distinct_calls_are_not_coalesced():
+    flight = SingleFlight('test')
+    calls = []
+
+    for key in ('a', 'a', 'b'):
+        flight.do(key, calls.append, key)
+
+    assert calls == ['a', 'a', 'b']
+
+
+def test_fork_forgets_parent_flights(monkeypatch):
+    """Test that a flight copied into a forked child does not make it wait forever"""
+    flight = SingleFlight('test')
+    flight._flights['key'] = object()
+    monkeypatch.setattr(flight, '_pid', -1)
+
+    assert flight.do('key', lambda: 'child') == 'child'
+
+
+def test_async_calls_share_one_call():
+    flight = SingleFlight('test')
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'ok'
+
+    async def main():
+        return await asyncio.gather(*(flight.ado('key', upstream) for _ in range(CALLERS)))
+
+    assert asyncio.run(main()) == ['ok'] * CALLERS
+    assert calls == [1]
+    assert flight.in_flight() == 0
+
+
+def test_async_leader_cancellation_does_not_fail_waiters():
+    """Test that a cancelled first caller (say, a client hanging up) leaves the call running"""
+    flight = SingleFlight('test')
+
+    async def upstream():
+        await asyncio.sleep(0.02)
+        return 'ok'
+
+    async def main():
+        leader = asyncio.ensure_future(flight.ado('key', upstream))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.ado('key', upstream))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == 'ok'
+
+
+def test_prober_refreshes_share_one_probe():
+    """Test that health checks racing a cold (or interval 0) prober send one probe"""
+    prober = SupabaseProber(interval=0, probe=None)
+    prober._probe = _Upstream(prober._flight, result=_snapshot())
+
+    results = _run_together(prober.snapshot)
+
+    assert prober._probe.calls == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_prober_async_refreshes_share_one_probe():
+    calls = []
+
+    async def aprobe():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return _snapshot()
+
+    prober = SupabaseProber(interval=0, aprobe=aprobe)
+
+    async def main():
+        return await asyncio.gather(*(prober.asnapshot() for _ in range(CALLERS)))
+
+    results = asyncio.run(main())
+
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+
+
+def test_deep_health_checks_share_dependency_checks(monkeypatch):
+    """Test that concurrent deep health checks run each dependency check once"""
+    flight = get_deep_health._checks_in_flight
+    monkeypatch.setattr(flight, '_flights', {})
+    upstream = _Upstream(flight)
+    monkeypatch.setattr(get_deep_health, 'DEPENDENCY_CHECKS', {'supabase_rest': upstream})
+
+    results = _run_together(lambda: Client().get(reverse('deep_health_check')).json(), count=CALLERS)
+
+    assert upstream.calls == 1
+    assert all(result['checks']['supabase_rest']['status'] == 'ok' for result in results)
@@ -0,0 +1 @@
+"""Startup profiling and lazy view import tests"""
@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+from io import StringIO
+import pytest
+from django.core.management import call_command
+from django.urls import resolve, reverse
+from api_app import views
+from api_app.management.commands.startup_profile import parse_importtime
+from api_app.utils.lazy_urls import LazyView
+
+pytestmark = pytest.mark.unit
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+def test_parse_importtime_output():
+    """Test parsing of python -X importtime lines"""
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     api_app.utils.metrics",
+        "import time:      1500 |       2000 | api_app.middleware",
+        "unrelated log line",
+    ])
+
+    assert parse_importtime(output) == [
+        ('api_app.utils.metrics', 120, 120),
+        ('api_app.middleware', 1500, 2000),
+    ]
+
+def test_startup_profile_command_reports_project_modules():
+    """Test that the command profiles a real boot in a subprocess"""
+    out = StringIO()
+    call_command('startup_profile', '--project-only', '--limit', '50', stdout=out)
+    output = out.getvalue()
+
+    assert 'api_app.middleware' in output
+    assert 'ms to first-request readiness' in output
+
+def test_url_resolution_imports_only_the_matched_view():
+    """Test that loading the URLconf and resolving one URL imports one view module"""
+    script = (
+        "import json, sys, django\n"
+        "django.setup()\n"
+        "from django.urls import resolve\n"
+        "resolve('/api/auth/token/').func.csrf_exempt\n"
+        "print(json.dumps(sorted(name for name in sys.modules if name.startswith('api_app.views'))))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=PROJECT_DIR,
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'api_project.settings',
+             'SUPABASE_URL': 'https://test.supabase.co', 'SUPABASE_KEY': 'test-key'},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == [
+        'api_app.views',
+        'api_app.views.generate_jwt_token',
+    ]
+
+def test_lazy_view_exposes_real_view_attributes():
+    """Test that middleware-visible attributes come from the real view"""
+    match = resolve(reverse('index'))
+
+    assert isinstance(match.func, LazyView)
+    assert match.func.csrf_exempt is True
+    assert match.func.etag == views.api_message.etag
+    assert match._func_path == 'api_app.views.get_api_message.api_message'
+
+def test_views_package_exports_resolve_lazily():
+    """Test that views re-exports are importable and unknown names still fail"""
+    from api_app.views import get_test_token
+
+    assert get_test_token.__module__ == 'api_app.views.generate_jwt_token'
+    assert 'health_check' in dir(views)
+    with pytest.raises(AttributeError):
+        views.does_not_exist
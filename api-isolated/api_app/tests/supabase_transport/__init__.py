@@ -0,0 +1 @@
+"""Shared Supabase HTTP transport tests"""
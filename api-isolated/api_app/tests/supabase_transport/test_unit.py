@@ -0,0 +1,90 @@
+import os
+import pytest
+from django.test.utils import override_settings
+from api_app.utils import supabase_transport
+from api_app.utils.supabase_transport import get_session, get_transport_stats, reset_session, supabase_request
+from ..utils.local_http import StubHandler, local_http_server
+
+pytestmark = pytest.mark.unit
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    """Start every test with a new session and zeroed counters"""
+    reset_session()
+    supabase_transport.stats = supabase_transport.TransportStats()
+    yield
+    reset_session()
+
+def test_session_is_shared_within_process():
+    """Test that repeated calls return the same pooled session"""
+    assert get_session() is get_session()
+
+def test_session_is_rebuilt_after_fork(monkeypatch):
+    """Test that a different pid gets its own session"""
+    parent_session = get_session()
+    monkeypatch.setattr(os, 'getpid', lambda: -1)
+    assert get_session() is not parent_session
+
+def test_requests_reuse_keep_alive_connection(local_http_server):
+    """Test that sequential requests share a single connection"""
+    with override_settings(SUPABASE_URL=local_http_server.url):
+        for _ in range(5):
+            response = supabase_request('GET', '/rest/v1/')
+            assert response.status_code == 200
+
+    stats = get_transport_stats()
+    assert stats['requests'] == 5
+    assert stats['connections_opened'] == 1
+    assert stats['connections_reused'] == 4
+class UnavailableThenOkHandler(StubHandler):
+    """503 on a kept-alive connection for the server's first ``failures`` requests"""
+
+    def do_GET(self):
+        if self.server.failures:
+            self.server.failures -= 1
+            self.server.requests.append((self.command, self.path))
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._respond()
+
+class ClosingHandler(StubHandler):
+    def end_headers(self):
+        self.send_header('Connection', 'close')
+        super().end_headers()
+
+def test_retries_are_counted_on_the_connection_they_reuse(local_http_server):
+    """Test that retried attempts on a kept-alive connection count as reuse"""
+    local_http_server.RequestHandlerClass = UnavailableThenOkHandler
+    local_http_server.failures = 2
+    with override_settings(SUPABASE_URL=local_http_server.url, SUPABASE_HTTP_RETRIES=2, SUPABASE_HTTP_BACKOFF=0):
+        response = supabase_request('GET', '/rest/v1/')
+
+    assert response.status_code == 200
+    assert len(local_http_server.requests) == 3
+    stats = get_transport_stats()
+    assert (stats['requests'], stats['connections_opened'], stats['connections_reused']) == (1, 1, 2)
+
+def test_closed_connections_are_not_counted_as_reused(local_http_server):
+    """Test that a server closing every connection shows no reuse"""
+    local_http_server.RequestHandlerClass = ClosingHandler
+    with override_settings(SUPABASE_URL=local_http_server.url):
+        for _ in range(3):
+            assert supabase_request('GET', '/rest/v1/').status_code == 200
+
+    stats = get_transport_stats()
+    assert (stats['requests'], stats['connections_opened'], stats['connections_reused']) == (3, 3, 0)
+
+def test_requests_send_apikey_header(local_http_server):
+    """Test that the Supabase key is attached to every request"""
+    with override_settings(SUPABASE_URL=local_http_server.url, SUPABASE_KEY='local-key'):
+        response = supabase_request('GET', '/rest/v1/')
+    assert response.request.headers['apikey'] == 'local-key'
+
+def test_config_view_reports_transport_stats(client):
+    """Test that the config endpoint exposes the transport counters"""
+    response = client.get('/api/test-config/')
+    assert response.status_code == 200
+    transport = response.json()['transport']
+    assert {'requests', 'connections_opened', 'connections_reused', 'pool_size'} <= transport.keys()
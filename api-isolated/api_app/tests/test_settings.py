@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 # Set DEBUG environment variable before importing settings
 os.environ['DJANGO_DEBUG'] = 'True'
@@ -25,6 +26,23 @@ SUPABASE_URL = 'https://test.supabase.co'
 SUPABASE_KEY = 'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test-key'
 DEBUG = True  # Ensure DEBUG is True for tests
 
+# Probe Supabase inline so health tests do not depend on a background thread
+SUPABASE_HEALTH_PROBE_INTERVAL = 0
+
+# Cheap password hashing, inline, so lifecycle tests stay fast
+PASSWORD_HASH_ITERATIONS = 1000
+PASSWORD_HASH_OFFLOAD = False
+
+# Tests call the user store sweeper directly
+USER_STORE_SWEEP_INTERVAL = 0
+
+# Suites hammer the auth views from one address; throttle tests turn this on
+THROTTLE_ENABLED = False
+THROTTLE_SQLITE_PATH = os.path.join(tempfile.mkdtemp(prefix='antelope-throttle-'), 'throttle.sqlite3')
+
+# Keep metrics in-process unless a test points them at a directory
+METRICS_MULTIPROC_DIR = ''
+
 # Configure logging for tests
 LOGGING = {
     'version': 1,
@@ -0,0 +1 @@
+"""Tests for the token-bucket throttles on the auth views."""
@@ -0,0 +1,198 @@
+import asyncio
+import multiprocessing
+import threading
+import pytest
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from api_app.benchmarks import throttle as throttle_benchmark
+from api_app.throttling import AuthTokenThrottle, athrottled_response, throttled_response
+from api_app.utils.token_bucket import SQLiteTokenBuckets, parse_rate
+from api_app.views.generate_jwt_token import generate_jwt_token
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def buckets(tmp_path):
+    return SQLiteTokenBuckets(str(tmp_path / 'throttle.sqlite3'), sweep_every=0)
+
+
+@pytest.fixture
+def throttling(tmp_path):
+    """Turn throttling on with tight limits and a fresh bucket file"""
+    with override_settings(
+        THROTTLE_ENABLED=True,
+        THROTTLE_SQLITE_PATH=str(tmp_path / 'throttle.sqlite3'),
+        THROTTLE_BURST_SECONDS=1,
+        THROTTLE_RATES={
+            'auth_token': '3/s',
+            'auth_token_global': '5/s',
+            'auth_test': '1/m',
+            'auth_test_global': '10/m',
+            'auth_test_bulk': '1/m',
+            'auth_test_bulk_global': '1/m',
+        },
+    ):
+        yield
+
+
+@pytest.mark.parametrize('rate, per_second', [('10/s', 10), ('120/min', 2), ('36/hour', 0.01), ('86400/day', 1)])
+def test_parse_rate(rate, per_second):
+    assert parse_rate(rate) == pytest.approx(per_second)
+
+
+def test_bucket_spends_burst_then_refills(buckets):
+    """Test that a bucket allows its capacity, then refills at its rate"""
+    results = [buckets.take('k', rate=2, capacity=3, now=100.0) for _ in range(4)]
+
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+    assert results[-1][1] == pytest.approx(0.5)
+    assert buckets.take('k', rate=2, capacity=3, now=100.4)[0] is False
+    assert buckets.take('k', rate=2, capacity=3, now=100.5)[0] is True
+
+
+def test_bucket_never_exceeds_capacity(buckets):
+    buckets.take('k', rate=1, capacity=2, now=0.0)
+
+    allowed = [buckets.take('k', rate=1, capacity=2, now=1000.0)[0] for _ in range(3)]
+
+    assert allowed == [True, True, False]
+
+
+def test_buckets_are_independent(buckets):
+    assert buckets.take('a', rate=1, capacity=1, now=0.0)[0]
+    assert buckets.take('b', rate=1, capacity=1, now=0.0)[0]
+    assert not buckets.take('a', rate=1, capacity=1, now=0.0)[0]
+
+
+def test_sweep_drops_only_refilled_buckets(buckets):
+    """Test that full buckets are deleted and partly spent ones kept"""
+    buckets.take('idle', rate=1, capacity=2, now=0.0)
+    buckets.take('busy', rate=1, capacity=2, now=9.5)
+
+    assert buckets.sweep(now=10.0) == 1
+    # A deleted bucket would start full again and allow both
+    allowed = [buckets.take('busy', rate=1, capacity=2, now=9.6)[0] for _ in range(2)]
+    assert allowed == [True, False]
+
+
+def _spend(path, results):
+    buckets = SQLiteTokenBuckets(path, sweep_every=0)
+    results.put(sum(buckets.take('shared', rate=1e-6, capacity=50)[0] for _ in range(40)))
+
+
+def test_workers_share_buckets_without_overspending(tmp_path):
+    """Test that forked workers together get exactly the bucket's capacity"""
+    path = str(tmp_path / 'throttle.sqlite3')
+    SQLiteTokenBuckets(path)
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    workers = [context.Process(target=_spend, args=(path, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    allowed = sum(results.get(timeout=30) for _ in workers)
+    for worker in workers:
+        worker.join()
+
+    assert allowed == 50
+
+
+def test_token_endpoint_returns_429_with_retry_after(client, throttling):
+    """Test that a client over its burst gets DRF's 429 and a Retry-After"""
+    codes = [client.get(reverse('get_test_token')).status_code for _ in range(3)]
+    response = client.get(reverse('get_test_token'))
+
+    assert codes == [status.HTTP_200_OK] * 3
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response['Retry-After']) >= 1
+    assert 'Request was throttled' in response.json()['detail']
+
+
+def test_global_bucket_limits_all_clients(client, throttling):
+    """Test that many clients together are held to the global rate"""
+    codes = [
+        client.get(reverse('get_test_token'), REMOTE_ADDR=f'198.51.100.{i}').status_code
+        for i in range(6)
+    ]
+
+    assert codes.count(status.HTTP_200_OK) == 5
+    assert codes[-1] == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_clients_keyed_by_router_address(client, throttling):
+    """Test that a spoofed X-Forwarded-For entry does not get a client a new bucket"""
+    for spoofed in ('10.0.0.1', '10.0.0.2', '10.0.0.3', '10.0.0.4'):
+        response = client.get(reverse('get_test_token'), HTTP_X_FORWARDED_FOR=f'{spoofed}, 203.0.113.9')
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_lifecycle_is_throttled(client, throttling):
+    token = generate_jwt_token()
+
+    def run():
+        return client.post(
+            reverse('test_user_lifecycle'),
+            data={'username': 'throttled_user', 'password': 'pw'},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+    assert run().status_code == status.HTTP_200_OK
+    response = run()
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response['Retry-After']) == 60
+
+
+def test_disabled_throttle_allows_everything(client, throttling):
+    with override_settings(THROTTLE_ENABLED=False):
+        codes = {client.get(reverse('get_test_token')).status_code for _ in range(10)}
+
+    assert codes == {status.HTTP_200_OK}
+
+
+def test_unavailable_store_fails_open(client, throttling):
+    """Test that a limiter that cannot open its file lets requests through"""
+    with override_settings(THROTTLE_SQLITE_PATH='/nonexistent/dir/throttle.sqlite3'):
+        codes = {client.get(reverse('get_test_token')).status_code for _ in range(5)}
+
+    assert codes == {status.HTTP_200_OK}
+
+
+def test_throttled_response_for_async_views(rf, throttling):
+    """Test that views outside DRF get the same 429 body and header"""
+    request = rf.get('/api/auth/token/')
+    responses = [throttled_response(request, AuthTokenThrottle()) for _ in range(4)]
+
+    assert responses[:3] == [None, None, None]
+    assert responses[3].status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert responses[3]['Retry-After'] == '1'
+    assert 'Request was throttled' in responses[3].content.decode()
+
+
+
+def test_async_throttle_check_runs_off_the_event_loop(rf, throttling, monkeypatch):
+    """Test that the async views' SQLite check runs in a worker thread, not on the loop"""
+    threads = []
+    allow_request = AuthTokenThrottle.allow_request
+
+    def recording(self, request, view):
+        threads.append(threading.get_ident())
+        return allow_request(self, request, view)
+
+    monkeypatch.setattr(AuthTokenThrottle, 'allow_request', recording)
+
+    async def check():
+        return threading.get_ident(), await athrottled_response(rf.get('/api/auth/token/'), AuthTokenThrottle())
+
+    loop_thread, response = asyncio.run(check())
+
+    assert response is None
+    assert threads and threads[0] != loop_thread
+
+def test_throttle_benchmark_rows():
+    rows = throttle_benchmark.run(iterations=5)
+
+    assert len(rows) == 4
+    assert all(float(row['per_request_us']) > 0 for row in rows)
@@ -0,0 +1 @@
+"""Verified token cache tests"""
@@ -0,0 +1,91 @@
+import jwt
+import pytest
+from django.test.utils import override_settings
+from api_app.utils import token_cache
+from api_app.utils.token_cache import VerifiedTokenCache
+from api_app import authentication
+from api_app.views import generate_user_lifecycle
+from api_app.views.generate_jwt_token import generate_jwt_token
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hit_after_put():
+    """Test that a stored token is answered from the cache"""
+    cache = VerifiedTokenCache(clock=FakeClock())
+    assert cache.get('token-a', 'secret') is None
+    cache.put('token-a', 'secret', {'user_id': 'a'})
+
+    assert cache.get('token-a', 'secret') == {'user_id': 'a'}
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+def test_entry_never_outlives_token_exp():
+    """Test that entries expire at the token's exp even if the TTL is longer"""
+    clock = FakeClock()
+    cache = VerifiedTokenCache(ttl=300, clock=clock)
+    cache.put('token-a', 'secret', {'exp': clock.now + 10})
+
+    clock.now += 11
+    assert cache.get('token-a', 'secret') is None
+
+def test_entry_expires_after_ttl():
+    """Test that entries expire after the TTL even if exp is further away"""
+    clock = FakeClock()
+    cache = VerifiedTokenCache(ttl=5, clock=clock)
+    cache.put('token-a', 'secret', {'exp': clock.now + 3600})
+
+    clock.now += 6
+    assert cache.get('token-a', 'secret') is None
+
+def test_secret_rotation_invalidates_cache():
+    """Test that verifying with a new secret drops every cached entry"""
+    cache = VerifiedTokenCache(clock=FakeClock())
+    cache.put('token-a', 'old-secret', {'user_id': 'a'})
+
+    assert cache.get('token-a', 'new-secret') is None
+    assert cache.get('token-a', 'old-secret') is None
+
+def test_cache_is_bounded_lru():
+    """Test that the least recently used entry is evicted at capacity"""
+    cache = VerifiedTokenCache(max_entries=2, clock=FakeClock())
+    cache.put('token-a', 'secret', {'user_id': 'a'})
+    cache.put('token-b', 'secret', {'user_id': 'b'})
+    cache.get('token-a', 'secret')
+    cache.put('token-c', 'secret', {'user_id': 'c'})
+
+    assert cache.get('token-b', 'secret') is None
+    assert cache.get('token-a', 'secret') is not None
+    assert cache.get('token-c', 'secret') is not None
+
+def test_validate_token_decodes_each_token_once(monkeypatch):
+    """Test that replaying the same token skips repeated jwt.decode calls"""
+    monkeypatch.setattr(token_cache, '_token_cache', VerifiedTokenCache())
+    decode_calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decode_calls.append(1)
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(authentication.jwt, 'decode', counting_decode)
+    token = generate_jwt_token()
+
+    assert all(generate_user_lifecycle.validate_token(token) for _ in range(5))
+    assert len(decode_calls) == 1
+
+def test_validate_token_rejects_token_after_secret_rotation(monkeypatch):
+    """Test that a cached token stops validating once JWT_SECRET changes"""
+    monkeypatch.setattr(token_cache, '_token_cache', VerifiedTokenCache())
+    token = generate_jwt_token()
+    assert generate_user_lifecycle.validate_token(token)
+
+    with override_settings(JWT_SECRET='rotated-secret'):
+        assert not generate_user_lifecycle.validate_token(token)
@@ -0,0 +1 @@
+"""Lifecycle user store tests"""
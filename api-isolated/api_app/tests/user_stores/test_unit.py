@@ -0,0 +1,170 @@
+import multiprocessing
+import threading
+import time
+import pytest
+from django.test.utils import override_settings
+from api_app import user_stores
+from api_app.user_stores import LockStripedUserStore, SQLiteUserStore, SupabaseUserStore, UserStore, UserStoreSweeper
+from api_app.utils import metrics
+from api_app.utils.supabase_transport import reset_session
+from ..utils.postgrest_stub import postgrest_stub
+
+pytestmark = pytest.mark.unit
+
+@pytest.fixture(params=['memory', 'sqlite', 'supabase'])
+def store(request, tmp_path):
+    """Each backend, with Supabase pointed at a local PostgREST stand-in"""
+    if request.param == 'memory':
+        yield LockStripedUserStore()
+    elif request.param == 'sqlite':
+        yield SQLiteUserStore(path=str(tmp_path / 'users.sqlite3'))
+    else:
+        server = request.getfixturevalue('postgrest_stub')
+        reset_session()
+        with override_settings(SUPABASE_URL=server.url):
+            yield SupabaseUserStore()
+        reset_session()
+
+def record(password='pw'):
+    return {'password': password, 'created_at': time.time()}
+
+def test_store_lifecycle(store):
+    """Test create, get and delete on every backend"""
+    assert store.create('alice', record('secret'))
+    assert store.get('alice')['password'] == 'secret'
+    assert store.count() == 1
+
+    assert store.delete('alice')
+    assert store.get('alice') is None
+    assert not store.delete('alice')
+    assert store.count() == 0
+
+def test_store_rejects_duplicate_usernames(store):
+    """Test that creating an existing username fails"""
+    assert store.create('bob', record())
+    assert not store.create('bob', record())
+
+def test_concurrent_signup_has_single_winner(store):
+    """Test that concurrent signups for one username let exactly one succeed"""
+    results = []
+    barrier = threading.Barrier(8)
+
+    def signup():
+        barrier.wait()
+        results.append(store.create('racer', record()))
+
+    threads = [threading.Thread(target=signup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 1
+
+def _create_in_child(path, username):
+    SQLiteUserStore(path=path).create(username, {'password': 'pw', 'created_at': 0})
+
+def test_sqlite_store_is_shared_across_processes(tmp_path):
+    """Test that a user created in another process is visible to this one"""
+    path = str(tmp_path / 'shared.sqlite3')
+    store = SQLiteUserStore(path=path)
+
+    child = multiprocessing.get_context('fork').Process(target=_create_in_child, args=(path, 'from_child'))
+    child.start()
+    child.join(timeout=10)
+
+    assert child.exitcode == 0
+    assert store.get('from_child') is not None
+
+def test_backend_selected_by_settings(monkeypatch, tmp_path):
+    """Test that USER_STORE_BACKEND picks the store class"""
+    monkeypatch.setattr(user_stores, '_store', None)
+    with override_settings(
+        USER_STORE_BACKEND='api_app.user_stores.SQLiteUserStore',
+        USER_STORE_SQLITE_PATH=str(tmp_path / 'selected.sqlite3')
+    ):
+        assert isinstance(user_stores.get_user_store(), SQLiteUserStore)
+    monkeypatch.setattr(user_stores, '_store', None)
+
+def test_evict_expired_removes_only_old_users(store):
+    """Test that TTL eviction keys off created_at on every backend"""
+    store.create('stale', {'password': 'pw', 'created_at': 100.0})
+    store.create('fresh', {'password': 'pw', 'created_at': 200.0})
+
+    assert store.evict_expired(150.0) == 1
+    assert store.get('stale') is None
+    assert store.get('fresh') is not None
+
+def test_evict_lru_trims_to_cap(store):
+    """Test that capacity eviction keeps at most max_entries users"""
+    for index in range(40):
+        store.create(f'user_{index}', {'password': 'pw', 'created_at': float(index)})
+
+    assert store.evict_lru(20) == 20
+    assert store.count() == 20
+    assert store.evict_lru(20) == 0
+
+def test_incomplete_store_fails_when_instantiated():
+    """Test that a store missing part of the interface is rejected up front, not on first use"""
+    class PartialStore(UserStore):
+        def create(self, username, record):
+            return True
+
+    with pytest.raises(TypeError, match='abstract'):
+        PartialStore()
+
+def test_memory_store_caps_on_insert():
+    """Test that the in-process store never grows past its cap"""
+    store = LockStripedUserStore(stripes=1, max_entries=3)
+    for name in ['a', 'b', 'c']:
+        store.create(name, record())
+    store.get('a')
+    store.create('d', record())
+
+    assert store.count() == 3
+    assert store.get('b') is None
+    assert store.get('a') is not None
+
+def test_sqlite_evict_lru_drops_least_recently_read(tmp_path):
+    """Test that SQLite capacity eviction follows reads, not insert order"""
+    store = SQLiteUserStore(path=str(tmp_path / 'lru.sqlite3'))
+    for name in ['a', 'b', 'c']:
+        store.create(name, record())
+        time.sleep(0.01)
+    store.get('a')
+
+    assert store.evict_lru(2) == 1
+    assert store.get('b') is None
+    assert store.get('a') is not None
+
+def test_sweeper_evicts_and_publishes_gauges(monkeypatch):
+    """Test that a sweep evicts orphans and records size and eviction metrics"""
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, 'registry', registry)
+    store = LockStripedUserStore(stripes=1, max_entries=0)
+    store.create('orphan', {'password': 'pw', 'created_at': 0.0})
+    for index in range(5):
+        store.create(f'live_{index}', {'password': 'pw', 'created_at': 1000.0})
+
+    sweeper = UserStoreSweeper(store, interval=0, ttl=60, max_entries=3, clock=lambda: 1010.0)
+    result = sweeper.sweep()
+
+    assert result == {'expired': 1, 'evicted': 2, 'size': 3}
+    snapshot = registry.snapshot()
+    assert ['lifecycle_user_store_entries', [('backend', 'LockStripedUserStore')], 3] in snapshot['gauges']
+    assert ['lifecycle_user_store_evictions_total', [('reason', 'ttl')], 1] in snapshot['counters']
+    assert ['lifecycle_user_store_evictions_total', [('reason', 'capacity')], 2] in snapshot['counters']
+
+def test_sweeper_thread_runs_in_background():
+    """Test that a positive interval starts a sweeping daemon thread"""
+    store = LockStripedUserStore(max_entries=0)
+    store.create('orphan', {'password': 'pw', 'created_at': 0.0})
+    sweeper = UserStoreSweeper(store, interval=0.01, ttl=1, max_entries=0)
+    sweeper.ensure_running()
+    try:
+        deadline = time.time() + 2
+        while store.count() and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        sweeper.stop()
+    assert store.count() == 0
@@ -0,0 +1,55 @@
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Generator
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler that answers every request with a small JSON body"""
+    protocol_version = 'HTTP/1.1'
+    body = b'{"ok": true}'
+
+    def _respond(self, include_body=True):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.requests.append((self.command, self.path))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(self.body)
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self._respond()
+
+    def do_HEAD(self):
+        self._respond(include_body=False)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_http_server() -> Generator[ThreadingHTTPServer, None, None]:
+    """Fixture that runs a local keep-alive HTTP server on a free port.
+
+    Returns:
+        ThreadingHTTPServer: The running server; ``server.url`` is its base URL
+        and ``server.requests`` records each (method, path) it received.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,95 @@
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Generator
+from urllib.parse import parse_qs, urlparse
+
+
+class PostgRESTStubHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the PostgREST calls SupabaseUserStore makes"""
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status, body=None, headers=None):
+        payload = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    def _matching(self):
+        query = parse_qs(urlparse(self.path).query)
+        rows = self.server.rows
+        names = list(rows)
+
+        condition = query.get('username', [''])[0]
+        if condition.startswith('eq.'):
+            names = [name for name in names if name == condition[3:]]
+        elif condition.startswith('in.('):
+            wanted = {json.loads(item) for item in condition[4:-1].split(',')}
+            names = [name for name in names if name in wanted]
+
+        created = query.get('created_at', [''])[0]
+        if created.startswith('lt.'):
+            names = [name for name in names if rows[name]['created_at'] < float(created[3:])]
+
+        if query.get('order', [''])[0] == 'created_at.asc':
+            names.sort(key=lambda name: rows[name]['created_at'])
+        if 'limit' in query:
+            names = names[:int(query['limit'][0])]
+        return names
+
+    def do_POST(self):
+        row = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with self.server.lock:
+            if row['username'] in self.server.rows:
+                return self._send(409, {'code': '23505', 'message': 'duplicate key'})
+            self.server.rows[row['username']] = row
+        self._send(201)
+
+    def do_GET(self):
+        with self.server.lock:
+            select = parse_qs(urlparse(self.path).query).get('select', ['data'])[0]
+            rows = [{select: self.server.rows[name][select]} for name in self._matching()]
+        self._send(200, rows)
+
+    def do_HEAD(self):
+        with self.server.lock:
+            total = len(self.server.rows)
+        self._send(200, headers={'Content-Range': f'*/{total}'})
+
+    def do_DELETE(self):
+        with self.server.lock:
+            deleted = [{'username': name} for name in self._matching()]
+            for row in deleted:
+                del self.server.rows[row['username']]
+        self._send(200, deleted)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def postgrest_stub() -> Generator[ThreadingHTTPServer, None, None]:
+    """Fixture that runs a local PostgREST stand-in.
+
+    Returns:
+        ThreadingHTTPServer: The running server; ``server.url`` is its base URL
+        and ``server.rows`` holds the stored rows keyed by username.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PostgRESTStubHandler)
+    server.daemon_threads = True
+    server.rows = {}
+    server.lock = threading.Lock()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,83 @@
+import logging
+import math
+import sqlite3
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+from .utils import metrics
+from .utils.fast_json import FastJsonResponse
+from .utils.token_bucket import get_token_buckets, parse_rate
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Per-client and dyno-wide token buckets for one ``scope``.
+
+    Rates come from THROTTLE_RATES: ``<scope>`` for each client IP and
+    ``<scope>_global`` for all clients together; each bucket holds
+    THROTTLE_BURST_SECONDS worth of its rate. The buckets live in a SQLite
+    file that every gunicorn worker on the dyno shares. If that file cannot
+    be written the request is let through: an unavailable limiter must not
+    take the API down with it.
+    """
+    scope = None
+
+    def __init__(self):
+        self.retry_after = None
+
+    def allow_request(self, request, view):
+        if not settings.THROTTLE_ENABLED:
+            return True
+        buckets = (
+            ('client', f"{self.scope}:{self.get_ident(request)}", settings.THROTTLE_RATES[self.scope]),
+            ('global', f"{self.scope}:*", settings.THROTTLE_RATES[f"{self.scope}_global"]),
+        )
+        try:
+            store = get_token_buckets()
+            for bucket, key, rate in buckets:
+                per_second = parse_rate(rate)
+                capacity = max(1.0, per_second * settings.THROTTLE_BURST_SECONDS)
+                allowed, self.retry_after = store.take(key, per_second, capacity)
+                if not allowed:
+                    metrics.inc('throttle_rejections_total', {'scope': self.scope, 'bucket': bucket})
+                    return False
+        except sqlite3.Error as e:
+            logger.warning(f"Rate limiter unavailable, allowing request: {str(e)}")
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class AuthTokenThrottle(TokenBucketThrottle):
+    scope = 'auth_token'
+
+
+class LifecycleThrottle(TokenBucketThrottle):
+    scope = 'auth_test'
+
+
+class LifecycleBulkThrottle(TokenBucketThrottle):
+    scope = 'auth_test_bulk'
+
+
+def throttled_response(request, throttle):
+    """
+    Run ``throttle`` for a view outside DRF (the async views).
+
+    Returns the 429 DRF would send, with Retry-After, or None when allowed.
+    """
+    if throttle.allow_request(request, None):
+        return None
+    exc = Throttled(throttle.wait())
+    response = FastJsonResponse({"detail": exc.detail}, status=exc.status_code)
+    response['Retry-After'] = str(math.ceil(throttle.wait()))
+    return response
+
+
+async def athrottled_response(request, throttle):
+    """``throttled_response`` off the event loop: SQLite's busy wait would stall every request on it"""
+    return await sync_to_async(throttled_response, thread_sensitive=False)(request, throttle)
@@ -1,25 +1,36 @@
-from django.urls import path
-from .views import (
-    APITest,
-    health_check,
-    test_user_lifecycle,
-    get_test_token,
-    test_supabase_config
-)
+from django.conf import settings
+from .utils.lazy_urls import lazy_path
+
+# View modules are imported on first resolution rather than at URLconf load
+VIEWS = 'api_app.views'
+
+
+def dual_path(route, sync_view, async_view, name, as_view=False):
+    """Route to ``async_view`` when ASYNC_VIEWS is on (under ASGI), else to the sync DRF view"""
+    if settings.ASYNC_VIEWS:
+        return lazy_path(route, f'{VIEWS}.async_views.{async_view}', name=name, is_async=True)
+    return lazy_path(route, f'{VIEWS}.{sync_view}', name=name, as_view=as_view)
+
 
 urlpatterns = [
     # 1. Basic API Message Test
-    path('', APITest.as_view(), name='index'),
-    path('test/', APITest.as_view(), name='api-test'),
+    # Constant body served from pre-encoded bytes with ETag/304, bypassing DRF
+    dual_path('', 'get_api_message.api_message', 'api_test', name='index'),
+    dual_path('test/', 'get_api_message.api_message', 'api_test', name='api-test'),
 
     # 2. Supabase Test - check if the supabase is connected
-    path('health/', health_check, name='health_check'),
+    dual_path('health/', 'get_supabase_health.health_check', 'health_check', name='health_check'),
+    lazy_path('health/deep/', f'{VIEWS}.get_deep_health.deep_health_check', name='deep_health_check'),
 
     # 3. Simple JWT token generation
-    path('auth/token/', get_test_token, name='get_test_token'),
+    dual_path('auth/token/', 'generate_jwt_token.get_test_token', 'get_test_token', name='get_test_token'),
 
     # 4. User lifecycle Test - full test including auth
-    path('auth/test/', test_user_lifecycle, name='test_user_lifecycle'),
+    dual_path('auth/test/', 'generate_user_lifecycle.test_user_lifecycle', 'test_user_lifecycle', name='test_user_lifecycle'),
+    dual_path('auth/test/bulk/', 'generate_user_lifecycle.test_user_lifecycle_bulk', 'test_user_lifecycle_bulk', name='test_user_lifecycle_bulk'),
+
+    lazy_path('test-config/', f'{VIEWS}.test_supabase_config.test_supabase_config', name='test_config'),
 
-    path('test-config/', test_supabase_config, name='test_config'),
-] 
\ No newline at end of file
+    # Prometheus metrics aggregated across the dyno's workers
+    lazy_path('metrics/', f'{VIEWS}.get_metrics.get_metrics', name='metrics'),
+]
@@ -0,0 +1,48 @@
+import threading
+from django.conf import settings
+from django.utils.module_loading import import_string
+from .base import UserStore
+from .memory import LockStripedUserStore
+from .sqlite import SQLiteUserStore
+from .supabase import SupabaseUserStore
+from .sweeper import UserStoreSweeper
+
+_store = None
+_sweeper = None
+_store_lock = threading.Lock()
+
+
+def get_user_store():
+    """Return the process-wide store selected by USER_STORE_BACKEND"""
+    global _store, _sweeper
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = import_string(settings.USER_STORE_BACKEND)()
+                _sweeper = UserStoreSweeper(
+                    store,
+                    interval=settings.USER_STORE_SWEEP_INTERVAL,
+                    ttl=settings.USER_STORE_TTL,
+                    max_entries=settings.USER_STORE_MAX_ENTRIES
+                )
+                _store = store
+    if _sweeper is not None:
+        _sweeper.ensure_running()
+    return _store
+
+
+def get_sweeper():
+    """Return the sweeper attached to the process-wide store"""
+    get_user_store()
+    return _sweeper
+
+
+__all__ = [
+    'UserStore',
+    'LockStripedUserStore',
+    'SQLiteUserStore',
+    'SupabaseUserStore',
+    'UserStoreSweeper',
+    'get_sweeper',
+    'get_user_store',
+]
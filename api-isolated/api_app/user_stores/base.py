@@ -0,0 +1,39 @@
+import abc
+
+
+class UserStore(abc.ABC):
+    """
+    Storage interface for the lifecycle endpoint's test users.
+
+    Records are plain dicts (at least ``password`` and ``created_at``).
+    Implementations must be safe to call from several threads at once, and
+    must implement every method below before they can be instantiated.
+    """
+
+    @abc.abstractmethod
+    def create(self, username, record):
+        """Store ``record`` under ``username``; return False if it already exists"""
+
+    @abc.abstractmethod
+    def get(self, username):
+        """Return the record stored under ``username``, or None"""
+
+    @abc.abstractmethod
+    def delete(self, username):
+        """Remove ``username``; return False if it did not exist"""
+
+    @abc.abstractmethod
+    def count(self):
+        """Return the number of stored users"""
+
+    @abc.abstractmethod
+    def clear(self):
+        """Remove every stored user"""
+
+    @abc.abstractmethod
+    def evict_expired(self, cutoff):
+        """Remove users created before ``cutoff``; return how many were removed"""
+
+    @abc.abstractmethod
+    def evict_lru(self, max_entries):
+        """Remove the least recently used users beyond ``max_entries``; return how many"""
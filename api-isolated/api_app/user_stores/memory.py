@@ -0,0 +1,94 @@
+import math
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from ..utils import metrics
+from .base import UserStore
+
+
+class LockStripedUserStore(UserStore):
+    """
+    In-process store split into independently locked stripes.
+
+    Requests for different usernames rarely contend for the same lock, and
+    each check-then-insert happens under its stripe's lock so two concurrent
+    signups for one username cannot both succeed. Only visible to the
+    current worker process.
+
+    Each stripe holds at most its share of ``max_entries`` (default
+    ``USER_STORE_MAX_ENTRIES``, 0 for no cap) and evicts its least recently
+    used user on insert, so memory stays bounded even between sweeps.
+    """
+
+    def __init__(self, stripes=16, max_entries=None):
+        if max_entries is None:
+            max_entries = settings.USER_STORE_MAX_ENTRIES
+        self._stripes = [(threading.Lock(), OrderedDict()) for _ in range(stripes)]
+        self._stripe_cap = math.ceil(max_entries / stripes) if max_entries else None
+
+    def _stripe(self, username):
+        return self._stripes[hash(username) % len(self._stripes)]
+
+    def create(self, username, record):
+        lock, users = self._stripe(username)
+        evicted = 0
+        with lock:
+            if username in users:
+                return False
+            if self._stripe_cap is not None:
+                while len(users) >= self._stripe_cap:
+                    users.popitem(last=False)
+                    evicted += 1
+            users[username] = record
+        if evicted:
+            metrics.inc('lifecycle_user_store_evictions_total', {'reason': 'capacity'}, evicted)
+        return True
+
+    def get(self, username):
+        lock, users = self._stripe(username)
+        with lock:
+            record = users.get(username)
+            if record is not None:
+                users.move_to_end(username)
+            return record
+
+    def delete(self, username):
+        lock, users = self._stripe(username)
+        with lock:
+            return users.pop(username, None) is not None
+
+    def count(self):
+        total = 0
+        for lock, users in self._stripes:
+            with lock:
+                total += len(users)
+        return total
+
+    def clear(self):
+        for lock, users in self._stripes:
+            with lock:
+                users.clear()
+
+    def evict_expired(self, cutoff):
+        removed = 0
+        for lock, users in self._stripes:
+            with lock:
+                expired = [name for name, record in users.items() if record.get('created_at', 0) < cutoff]
+                for name in expired:
+                    del users[name]
+                removed += len(expired)
+        return removed
+
+    def evict_lru(self, max_entries):
+        # Recency is tracked per stripe, so take the excess from the fullest
+        # stripes, oldest entry first within each
+        excess = self.count() - max_entries
+        removed = 0
+        while removed < excess:
+            lock, users = max(self._stripes, key=lambda stripe: len(stripe[1]))
+            with lock:
+                if not users:
+                    break
+                users.popitem(last=False)
+            removed += 1
+        return removed
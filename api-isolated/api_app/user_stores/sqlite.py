@@ -0,0 +1,81 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from django.conf import settings
+from .base import UserStore
+
+
+class SQLiteUserStore(UserStore):
+    """
+    Store backed by a local SQLite file in WAL mode.
+
+    Every gunicorn worker on the dyno opens the same file, so a user created
+    by one worker is visible to the others. WAL lets readers proceed while a
+    writer commits; each thread keeps its own connection. Reads stamp
+    ``last_used`` so capacity eviction can drop the least recently used rows.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or settings.USER_STORE_SQLITE_PATH
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS test_users ('
+                'username TEXT PRIMARY KEY, data TEXT NOT NULL, created_at REAL NOT NULL, '
+                'last_used REAL NOT NULL DEFAULT 0)'
+            )
+            columns = {row[1] for row in connection.execute('PRAGMA table_info(test_users)')}
+            if 'last_used' not in columns:
+                # Files created before eviction existed
+                connection.execute('ALTER TABLE test_users ADD COLUMN last_used REAL NOT NULL DEFAULT 0')
+            connection.execute('CREATE INDEX IF NOT EXISTS test_users_created_at ON test_users (created_at)')
+            connection.execute('CREATE INDEX IF NOT EXISTS test_users_last_used ON test_users (last_used)')
+
+    def _connection(self):
+        # Connections must not cross a fork or be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def create(self, username, record):
+        cursor = self._connection().execute(
+            'INSERT OR IGNORE INTO test_users (username, data, created_at, last_used) VALUES (?, ?, ?, ?)',
+            (username, json.dumps(record), record.get('created_at', 0), time.time())
+        )
+        return cursor.rowcount == 1
+
+    def get(self, username):
+        row = self._connection().execute(
+            'UPDATE test_users SET last_used = ? WHERE username = ? RETURNING data', (time.time(), username)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, username):
+        cursor = self._connection().execute('DELETE FROM test_users WHERE username = ?', (username,))
+        return cursor.rowcount == 1
+
+    def count(self):
+        return self._connection().execute('SELECT COUNT(*) FROM test_users').fetchone()[0]
+
+    def clear(self):
+        self._connection().execute('DELETE FROM test_users')
+
+    def evict_expired(self, cutoff):
+        cursor = self._connection().execute('DELETE FROM test_users WHERE created_at < ?', (cutoff,))
+        return cursor.rowcount
+
+    def evict_lru(self, max_entries):
+        cursor = self._connection().execute(
+            'DELETE FROM test_users WHERE username IN ('
+            'SELECT username FROM test_users ORDER BY last_used '
+            'LIMIT max(0, (SELECT COUNT(*) FROM test_users) - ?))',
+            (max_entries,)
+        )
+        return cursor.rowcount
@@ -0,0 +1,86 @@
+from django.conf import settings
+from ..utils.supabase_transport import supabase_request
+from .base import UserStore
+
+
+class SupabaseUserStore(UserStore):
+    """
+    Store backed by a Supabase table through PostgREST.
+
+    Uses the shared keep-alive transport; the table is created by the
+    ``lifecycle_test_users`` migration in ``supabase/migrations``. Reads are
+    not tracked (that would cost a write per lookup), so capacity eviction
+    drops the oldest users by ``created_at`` instead of true LRU.
+    """
+
+    def __init__(self, table=None):
+        self.table = table or settings.USER_STORE_SUPABASE_TABLE
+        self.path = f"/rest/v1/{self.table}"
+
+    def _request(self, method, headers=None, **kwargs):
+        request_headers = {"Authorization": f"Bearer {settings.SUPABASE_KEY}"}
+        request_headers.update(headers or {})
+        response = supabase_request(method, self.path, headers=request_headers, **kwargs)
+        if response.status_code >= 400 and response.status_code != 409:
+            response.raise_for_status()
+        return response
+
+    def create(self, username, record):
+        response = self._request(
+            'POST',
+            headers={"Prefer": "return=minimal"},
+            json={'username': username, 'data': record, 'created_at': record.get('created_at', 0)}
+        )
+        return response.status_code != 409
+
+    def get(self, username):
+        response = self._request('GET', params={'username': f'eq.{username}', 'select': 'data'})
+        rows = response.json()
+        return rows[0]['data'] if rows else None
+
+    def delete(self, username):
+        response = self._request(
+            'DELETE',
+            headers={"Prefer": "return=representation"},
+            params={'username': f'eq.{username}', 'select': 'username'}
+        )
+        return bool(response.json())
+
+    def count(self):
+        response = self._request(
+            'HEAD',
+            headers={"Prefer": "count=exact"},
+            params={'select': 'username'}
+        )
+        # Content-Range looks like "0-9/42" or "*/0"
+        return int(response.headers.get('Content-Range', '*/0').rsplit('/', 1)[1])
+
+    def clear(self):
+        self._request('DELETE', params={'username': 'not.is.null'})
+
+    def evict_expired(self, cutoff):
+        response = self._request(
+            'DELETE',
+            headers={"Prefer": "return=representation"},
+            params={'created_at': f'lt.{cutoff}', 'select': 'username'}
+        )
+        return len(response.json())
+
+    def evict_lru(self, max_entries):
+        excess = self.count() - max_entries
+        if excess <= 0:
+            return 0
+        oldest = self._request(
+            'GET',
+            params={'select': 'username', 'order': 'created_at.asc', 'limit': excess}
+        ).json()
+        if not oldest:
+            return 0
+        # Quote every name so commas or parentheses cannot break the in.() list
+        names = ','.join('"{}"'.format(row['username'].replace('\\', '\\\\').replace('"', '\\"')) for row in oldest)
+        response = self._request(
+            'DELETE',
+            headers={"Prefer": "return=representation"},
+            params={'username': f'in.({names})', 'select': 'username'}
+        )
+        return len(response.json())
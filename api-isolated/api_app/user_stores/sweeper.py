@@ -0,0 +1,80 @@
+import logging
+import os
+import threading
+import time
+from ..utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class UserStoreSweeper:
+    """
+    Evicts lifecycle users that were never deleted.
+
+    A request that dies between signup and delete leaves its user behind, so
+    a daemon thread periodically drops users older than ``ttl`` seconds and
+    trims the store to ``max_entries``, then publishes the store size as a
+    gauge. Like the Supabase prober, the thread starts lazily and is
+    restarted after a fork; an ``interval`` of 0 disables it.
+    """
+
+    def __init__(self, store, interval, ttl, max_entries, clock=time.time):
+        self.store = store
+        self.interval = interval
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def sweep(self):
+        """Evict expired and excess users now and return what was removed"""
+        expired = self.store.evict_expired(self._clock() - self.ttl) if self.ttl > 0 else 0
+        evicted = self.store.evict_lru(self.max_entries) if self.max_entries > 0 else 0
+        size = self.store.count()
+
+        if expired:
+            metrics.inc('lifecycle_user_store_evictions_total', {'reason': 'ttl'}, expired)
+        if evicted:
+            metrics.inc('lifecycle_user_store_evictions_total', {'reason': 'capacity'}, evicted)
+        metrics.set_gauge('lifecycle_user_store_entries', size, {'backend': type(self.store).__name__})
+        if expired or evicted:
+            logger.info(f"Evicted {expired} expired and {evicted} excess lifecycle users, {size} remain")
+        return {'expired': expired, 'evicted': evicted, 'size': size}
+
+    def stop(self):
+        """Stop the background thread, if it is running"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def ensure_running(self):
+        if self.interval <= 0:
+            return
+
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._pid == pid and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._stop_event,),
+                name='user-store-sweeper',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self, stop_event):
+        while not stop_event.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("User store sweep failed")
@@ -0,0 +1,40 @@
+"""
+Shared infrastructure, re-exported lazily (PEP 562).
+
+The middleware imports ``api_app.utils.metrics`` on every boot; resolving
+the names below on first access keeps that from also importing
+``requests`` and the Supabase transport before any view needs them.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    'CircuitBreaker': 'circuit_breaker',
+    'CircuitOpenError': 'circuit_breaker',
+    'get_supabase_breaker': 'circuit_breaker',
+    'FastJsonResponse': 'fast_json',
+    'SingleFlight': 'single_flight',
+    'SupabaseProber': 'supabase_prober',
+    'get_prober': 'supabase_prober',
+    'probe_supabase': 'supabase_prober',
+    'get_session': 'supabase_transport',
+    'get_transport_stats': 'supabase_transport',
+    'reset_session': 'supabase_transport',
+    'supabase_request': 'supabase_transport',
+    'VerifiedTokenCache': 'token_cache',
+    'get_token_cache': 'token_cache',
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
+
+__all__ = list(_EXPORTS)
@@ -0,0 +1,140 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the circuit is open"""
+
+    def __init__(self, name, retry_in):
+        self.retry_in = retry_in
+        super().__init__(f"circuit '{name}' is open, retrying in {retry_in:.1f}s")
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker over a rolling window of calls.
+
+    Calls that raise or take longer than ``slow_call_seconds`` count as
+    failures. Once the window holds at least ``minimum_calls`` outcomes and
+    the failure rate reaches ``failure_rate_threshold`` the circuit opens and
+    every call fails fast for ``cooldown`` seconds. After that a single trial
+    call is let through: success closes the circuit, failure re-opens it.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_rate_threshold=0.5, slow_call_seconds=2.0,
+                 window_size=10, minimum_calls=5, cooldown=30.0, clock=time.monotonic):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.minimum_calls = minimum_calls
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.cooldown:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """Reserve permission to call upstream or raise CircuitOpenError"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            if self._state == self.OPEN:
+                remaining = self.cooldown - (self._clock() - self._opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(self.name, remaining)
+                self._state = self.HALF_OPEN
+
+            # Half-open: only one trial request may be in flight at a time
+            if self._trial_in_flight:
+                raise CircuitOpenError(self.name, 0.0)
+            self._trial_in_flight = True
+
+    def record(self, success, duration):
+        """Record the outcome of a call that was allowed by ``before_call``"""
+        failed = not success or duration >= self.slow_call_seconds
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._trial_in_flight = False
+                if failed:
+                    self._open()
+                else:
+                    logger.info(f"Circuit '{self.name}' closed after successful trial")
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(failed)
+            if len(self._outcomes) >= self.minimum_calls:
+                failure_rate = sum(self._outcomes) / len(self._outcomes)
+                if failure_rate >= self.failure_rate_threshold:
+                    self._open()
+
+    def call(self, func, *args, **kwargs):
+        """Run ``func`` through the breaker, treating any exception as a failure"""
+        self.before_call()
+        started = self._clock()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            self.record(False, self._clock() - started)
+            raise
+        self.record(True, self._clock() - started)
+        return result
+
+    def _open(self):
+        logger.warning(f"Circuit '{self.name}' opened for {self.cooldown}s")
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._trial_in_flight = False
+        self._outcomes.clear()
+
+
+_supabase_breaker = None
+_supabase_breaker_lock = threading.Lock()
+
+
+def get_supabase_breaker():
+    """Return the process-wide circuit breaker guarding Supabase probes"""
+    global _supabase_breaker
+    if _supabase_breaker is None:
+        with _supabase_breaker_lock:
+            if _supabase_breaker is None:
+                _supabase_breaker = CircuitBreaker(
+                    'supabase',
+                    failure_rate_threshold=settings.SUPABASE_BREAKER_FAILURE_RATE,
+                    slow_call_seconds=settings.SUPABASE_BREAKER_SLOW_CALL_SECONDS,
+                    window_size=settings.SUPABASE_BREAKER_WINDOW,
+                    minimum_calls=settings.SUPABASE_BREAKER_MINIMUM_CALLS,
+                    cooldown=settings.SUPABASE_BREAKER_COOLDOWN
+                )
+    return _supabase_breaker
+
+
+def _forget_parent_breaker():
+    # Each worker tracks upstream health on its own, starting closed
+    global _supabase_breaker, _supabase_breaker_lock
+    _supabase_breaker = None
+    _supabase_breaker_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_parent_breaker)
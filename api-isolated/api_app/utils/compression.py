@@ -0,0 +1,126 @@
+"""
+gzip and Brotli encoders for dynamic responses.
+
+``CompressionMiddleware`` negotiates an encoding from ``Accept-Encoding``
+with ``negotiate_encoding`` and compresses whole bodies with ``compress``,
+or streaming ones chunk by chunk with ``stream_compressor``, which flushes
+after every chunk so each NDJSON line of a bulk run still reaches the client
+as soon as it is produced. Brotli is optional: without the ``brotli`` module
+only gzip is offered.
+"""
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - Brotli is in requirements.txt
+    brotli = None
+
+# Types worth compressing; images and already-compressed files are not
+COMPRESSIBLE_TYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+    'text/',
+)
+
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def available_encodings():
+    """Encodings this process can produce, most preferred first"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def is_compressible(content_type):
+    content_type = (content_type or '').split(';', 1)[0].strip().lower()
+    return any(content_type == kind or (kind.endswith('/') and content_type.startswith(kind))
+               for kind in COMPRESSIBLE_TYPES)
+
+
+def _parse_accept_encoding(header):
+    weights = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding] = quality
+    return weights
+
+
+def negotiate_encoding(accept_encoding, encodings=None):
+    """
+    Pick the encoding to use for an ``Accept-Encoding`` header, or None.
+
+    The highest q-value wins; ties go to our preference order (Brotli
+    first). ``*`` stands for any coding the client did not name.
+    """
+    if not accept_encoding:
+        return None
+    weights = _parse_accept_encoding(accept_encoding)
+    wildcard = weights.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for encoding in encodings or available_encodings():
+        quality = weights.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding, gzip_level=6, brotli_quality=4):
+    """Compress a whole body"""
+    if encoding == 'br':
+        return brotli.compress(data, mode=brotli.MODE_TEXT, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, _GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk"""
+
+    def __init__(self, encoding, gzip_level=6, brotli_quality=4):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(mode=brotli.MODE_TEXT, quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, _GZIP_WBITS)
+
+    def compress(self, chunk):
+        if self.encoding == 'br':
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def stream_compressor(chunks, encoding, gzip_level=6, brotli_quality=4):
+    """Compress an iterable of byte chunks"""
+    compressor = StreamCompressor(encoding, gzip_level, brotli_quality)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def astream_compressor(chunks, encoding, gzip_level=6, brotli_quality=4):
+    """``stream_compressor`` for an async iterable of chunks"""
+    compressor = StreamCompressor(encoding, gzip_level, brotli_quality)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
@@ -0,0 +1,68 @@
+"""
+Views whose JSON body never changes, served from bytes encoded once.
+
+Uptime monitors poll ``/api/`` and ``/api/test/`` constantly; going through
+DRF's ``APIView`` for them meant content negotiation, authentication and a
+fresh ``json.dumps`` of the same dict on every hit. ``ConstantJSONView`` is a
+plain callable view that answers with pre-encoded bytes, a strong ``ETag``
+derived from them and ``CONSTANT_RESPONSE_CACHE_CONTROL``, and turns a
+matching ``If-None-Match`` into an empty 304.
+"""
+import hashlib
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework import status
+from .fast_json import FastJsonResponse, dumps
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+class ConstantJSONView:
+    """
+    Callable view for a constant JSON ``data`` answered with ``status``.
+
+    ``conditional=False`` drops the ETag and Cache-Control, for bodies such as
+    error pages that must not be cached; ``response()`` builds the reply
+    without a request, for Django's error handlers.
+    """
+    # A refused POST is a 405 from this view, not a CSRF 403
+    csrf_exempt = True
+
+    def __init__(self, data, status=status.HTTP_200_OK, conditional=True):
+        self.body = dumps(data)
+        self.status = status
+        self.conditional = conditional
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self._content_length = str(len(self.body))
+
+    def response(self, head=False):
+        response = HttpResponse(b'' if head else self.body, content_type='application/json', status=self.status)
+        response['Content-Length'] = self._content_length
+        if self.conditional:
+            self._add_validators(response)
+        return response
+
+    def __call__(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            response = FastJsonResponse(
+                {"detail": f'Method "{request.method}" not allowed.'},
+                status=status.HTTP_405_METHOD_NOT_ALLOWED
+            )
+            response['Allow'] = ', '.join(SAFE_METHODS)
+            return response
+        if self.conditional and self._matches(request.META.get('HTTP_IF_NONE_MATCH')):
+            return self._add_validators(HttpResponseNotModified())
+        return self.response(head=request.method == 'HEAD')
+
+    def _matches(self, if_none_match):
+        # If-None-Match uses weak comparison, so W/"x" matches "x"
+        if not if_none_match:
+            return False
+        etags = parse_etags(if_none_match)
+        return '*' in etags or self.etag in (etag.removeprefix('W/') for etag in etags)
+
+    def _add_validators(self, response):
+        response['ETag'] = self.etag
+        response['Cache-Control'] = settings.CONSTANT_RESPONSE_CACHE_CONTROL
+        return response
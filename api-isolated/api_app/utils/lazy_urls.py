@@ -0,0 +1,79 @@
+"""
+URL patterns whose view module is imported on first resolution.
+
+``lazy_path('health/', 'api_app.views.get_supabase_health.health_check')``
+behaves like ``path()`` but the URLconf no longer imports every view module
+when it loads; each module is imported the first time a request resolves
+to one of its views.
+"""
+from asgiref.sync import markcoroutinefunction
+from django.urls.resolvers import RoutePattern, URLPattern
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+
+class LazyView:
+    """
+    Callable stand-in for a view given by dotted path.
+
+    Attributes it does not define itself (``csrf_exempt``, ``view_class``,
+    ``cls`` ...) are read from the real view, importing it if needed, so
+    middleware and DRF see the same view they would with ``path()``.
+    """
+
+    def __init__(self, dotted_path, as_view=False):
+        self.lookup_str = dotted_path
+        self.__module__, self.__name__ = dotted_path.rsplit('.', 1)
+        self.__qualname__ = self.__name__
+        self._as_view = as_view
+        self._view = None
+
+    def resolve(self):
+        """Import (and for class-based views, build) the real view"""
+        if self._view is None:
+            view = import_string(self.lookup_str)
+            self._view = view.as_view() if self._as_view else view
+        return self._view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.resolve()(request, *args, **kwargs)
+
+    def __getattr__(self, name):
+        # Only reached for attributes the wrapper lacks; never forward
+        # private names, which copy, pickle and coroutine checks probe for
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        return f"<LazyView {self.lookup_str}>"
+
+
+class AsyncLazyView(LazyView):
+    """LazyView for an ``async def`` view, marked so Django awaits it on the event loop"""
+
+    def __init__(self, dotted_path, as_view=False):
+        super().__init__(dotted_path, as_view=as_view)
+        markcoroutinefunction(self)
+
+    async def __call__(self, request, *args, **kwargs):
+        return await self.resolve()(request, *args, **kwargs)
+
+
+class LazyURLPattern(URLPattern):
+    @cached_property
+    def lookup_str(self):
+        # URLPattern would inspect the callback, importing the view
+        return self.callback.lookup_str
+
+
+def lazy_path(route, view, kwargs=None, name=None, as_view=False, is_async=False):
+    """
+    Like ``path()`` with a dotted view path.
+
+    Pass ``as_view=True`` for class-based views and ``is_async=True`` for
+    ``async def`` views (Django cannot tell without importing them).
+    """
+    pattern = RoutePattern(route, name=name, is_endpoint=True)
+    view_class = AsyncLazyView if is_async else LazyView
+    return LazyURLPattern(pattern, view_class(view, as_view=as_view), kwargs, name)
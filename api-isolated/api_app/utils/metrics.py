@@ -0,0 +1,335 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Every worker process records into its own registry and periodically dumps it
+to ``METRICS_MULTIPROC_DIR/metrics_<pid>.json``. A scrape merges the files of
+every worker on the dyno, so counters and histograms cover the whole dyno no
+matter which worker answers ``/api/metrics/``. Gauges describe a single
+process, so they are exported per worker with a ``pid`` label and dropped
+once that worker has exited. An exited worker's counters and histograms are
+folded into ``metrics_archived.json`` and its file removed, so recycled
+workers neither grow the directory nor lose their totals to a new worker
+that reuses the pid.
+"""
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no cross-process lock needed there
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels):
+    return tuple(sorted((labels or {}).items()))
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms keyed by metric name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._help = {}
+
+    def describe(self, name, kind, help_text):
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name, labels=None, value=1):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, labels=None):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, value, labels=None, buckets=DEFAULT_BUCKETS):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    'buckets': list(buckets),
+                    'counts': [0] * len(buckets),
+                    'sum': 0.0,
+                    'count': 0,
+                }
+            for index, bound in enumerate(histogram['buckets']):
+                if value <= bound:
+                    histogram['counts'][index] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def snapshot(self):
+        """Return a JSON-serialisable copy of every metric"""
+        with self._lock:
+            return {
+                'help': {name: list(meta) for name, meta in self._help.items()},
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'gauges': [[name, list(labels), value] for (name, labels), value in self._gauges.items()],
+                'histograms': [
+                    [name, list(labels), dict(h, counts=list(h['counts']))]
+                    for (name, labels), h in self._histograms.items()
+                ],
+            }
+
+
+registry = MetricsRegistry()
+registry.describe('http_requests_total', 'counter', 'HTTP requests by URL name, method and status code')
+registry.describe('http_request_duration_seconds', 'histogram', 'HTTP request latency by URL name')
+registry.describe('supabase_probe_total', 'counter', 'Supabase reachability probes by strategy and outcome')
+registry.describe('jwt_verify_cache_total', 'counter', 'Verified-token cache lookups by result')
+registry.describe('supabase_probe_duration_seconds', 'histogram', 'Supabase reachability probe latency by strategy')
+registry.describe('lifecycle_user_store_entries', 'gauge', 'Lifecycle test users currently held by the user store')
+registry.describe('lifecycle_user_store_evictions_total', 'counter', 'Lifecycle test users evicted by reason (ttl or capacity)')
+registry.describe('db_pool_connections', 'gauge', 'Pooled database connections by alias and state (idle or in_use)')
+registry.describe('db_pool_checkouts_total', 'counter', 'Database pool checkouts by alias and outcome (reused, new or timeout)')
+registry.describe('db_pool_wait_seconds', 'histogram', 'Time spent waiting for a pooled database connection')
+registry.describe('db_pool_discards_total', 'counter', 'Pooled database connections closed by reason')
+registry.describe('single_flight_calls_total', 'counter', 'Coalesced upstream calls by name and role (leader made the call, shared joined it)')
+registry.describe('single_flight_callers', 'histogram', 'Callers served by each coalesced upstream call')
+registry.describe('throttle_rejections_total', 'counter', 'Requests refused by the auth throttles by scope and bucket (client or global)')
+
+ARCHIVE_FILE = 'metrics_archived.json'
+
+_last_flush = 0.0
+_flush_lock = threading.Lock()
+_flushed = False
+
+
+def inc(name, labels=None, value=1):
+    registry.inc(name, labels, value)
+
+
+def set_gauge(name, value, labels=None):
+    registry.set_gauge(name, value, labels)
+
+
+def observe(name, value, labels=None, buckets=DEFAULT_BUCKETS):
+    registry.observe(name, value, labels, buckets)
+
+
+def _metrics_file(pid):
+    return os.path.join(settings.METRICS_MULTIPROC_DIR, f"metrics_{pid}.json")
+
+
+def flush(force=False):
+    """Write this process's registry to the shared directory (throttled)"""
+    global _last_flush, _flushed
+    directory = settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return
+
+    now = time.monotonic()
+    if not force and now - _last_flush < settings.METRICS_FLUSH_INTERVAL:
+        return
+    if not _flush_lock.acquire(blocking=force):
+        return
+    try:
+        _last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        path = _metrics_file(os.getpid())
+        if not _flushed:
+            # A file under our pid before our first flush was left by an
+            # exited worker the pid was recycled from
+            _archive(directory, [path])
+            _flushed = True
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(registry.snapshot(), f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write metrics file: {str(e)}")
+    finally:
+        _flush_lock.release()
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _file_pid(path):
+    return int(os.path.basename(path)[len('metrics_'):-len('.json')])
+
+
+def _merge(merged, snapshot, gauge_pid=None):
+    """Add a snapshot's counters and histograms to ``merged``, and its gauges when ``gauge_pid`` is given"""
+    merged['help'].update(snapshot['help'])
+    for name, labels, value in snapshot['counters']:
+        key = (name, tuple(tuple(pair) for pair in labels))
+        merged['counters'][key] = merged['counters'].get(key, 0) + value
+    if gauge_pid is not None:
+        for name, labels, value in snapshot.get('gauges', []):
+            key = (name, tuple(tuple(pair) for pair in labels) + (('pid', str(gauge_pid)),))
+            merged['gauges'][key] = value
+    for name, labels, histogram in snapshot['histograms']:
+        key = (name, tuple(tuple(pair) for pair in labels))
+        existing = merged['histograms'].get(key)
+        if existing is None or existing['buckets'] != histogram['buckets']:
+            merged['histograms'][key] = dict(histogram, counts=list(histogram['counts']))
+            continue
+        existing['counts'] = [a + b for a, b in zip(existing['counts'], histogram['counts'])]
+        existing['sum'] += histogram['sum']
+        existing['count'] += histogram['count']
+
+
+def _empty_merged():
+    return {'help': {}, 'counters': {}, 'gauges': {}, 'histograms': {}}
+
+
+def _archive(directory, paths):
+    """Fold the given exited workers' files into the archive and delete them"""
+    archive_path = os.path.join(directory, ARCHIVE_FILE)
+    with open(f"{archive_path}.lock", 'a') as lock:
+        # Every worker on the dyno may be scraped at once
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        # Another worker may have archived some of them while we waited
+        paths = [path for path in paths if os.path.exists(path)]
+        if not paths:
+            return
+        merged = _empty_merged()
+        try:
+            with open(archive_path) as f:
+                _merge(merged, json.load(f))
+        except FileNotFoundError:
+            pass
+        for path in paths:
+            try:
+                with open(path) as f:
+                    _merge(merged, json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable metrics file {path}: {str(e)}")
+        temp_path = f"{archive_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({
+                'help': merged['help'],
+                'counters': [[name, list(labels), value] for (name, labels), value in merged['counters'].items()],
+                'gauges': [],
+                'histograms': [[name, list(labels), h] for (name, labels), h in merged['histograms'].items()],
+            }, f)
+        os.replace(temp_path, archive_path)
+        for path in paths:
+            os.remove(path)
+
+
+def collect():
+    """Merge the snapshots of every worker process sharing the metrics directory"""
+    own_pid = os.getpid()
+    merged = _empty_merged()
+    _merge(merged, registry.snapshot(), gauge_pid=own_pid)
+    directory = settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return merged
+
+    flush(force=True)
+    own_file = _metrics_file(own_pid)
+    live, exited = [], []
+    for path in glob.glob(os.path.join(directory, 'metrics_*.json')):
+        if path == own_file or os.path.basename(path) == ARCHIVE_FILE:
+            continue
+        try:
+            pid = _file_pid(path)
+        except ValueError:
+            logger.warning(f"Skipping unexpected metrics file {path}")
+            continue
+        (live if _pid_alive(pid) else exited).append((pid, path))
+    if exited:
+        try:
+            _archive(directory, [path for _, path in exited])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not archive exited workers' metrics: {str(e)}")
+
+    # Exited workers' counters still count, through the archive; their gauges no longer describe anything
+    sources = [(pid, path) for pid, path in live] + [(None, os.path.join(directory, ARCHIVE_FILE))]
+    for pid, path in sources:
+        try:
+            with open(path) as f:
+                _merge(merged, json.load(f), gauge_pid=pid)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable metrics file {path}: {str(e)}")
+    return merged
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for key, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{key}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def render_prometheus(merged=None):
+    """Render merged metrics in the Prometheus text exposition format"""
+    merged = merged or collect()
+    lines = []
+    described = set()
+
+    def header(name, default_kind):
+        if name in described:
+            return
+        described.add(name)
+        kind, help_text = merged['help'].get(name, (default_kind, ''))
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in sorted(merged['counters'].items()):
+        header(name, 'counter')
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for (name, labels), value in sorted(merged.get('gauges', {}).items()):
+        header(name, 'gauge')
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for (name, labels), histogram in sorted(merged['histograms'].items()):
+        header(name, 'histogram')
+        cumulative = 0
+        for bound, count in zip(histogram['buckets'], histogram['counts']):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', repr(float(bound)))])} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {histogram['count']}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram['sum']}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+
+    return '\n'.join(lines) + '\n'
+
+
+def _forget_parent_metrics():
+    # A forked worker starts counting from zero under its own pid
+    global registry, _last_flush, _flush_lock, _flushed
+    help_texts = registry._help
+    registry = MetricsRegistry()
+    registry._help = dict(help_texts)
+    _last_flush = 0.0
+    _flush_lock = threading.Lock()
+    _flushed = False
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_parent_metrics)
@@ -0,0 +1,101 @@
+"""
+Password hashing for the lifecycle endpoint, optionally offloaded to a pool.
+
+Hashes use Django's PBKDF2 hasher with ``PASSWORD_HASH_ITERATIONS`` as the
+work factor, so tests can stay cheap while production stays strong. With
+``PASSWORD_HASH_OFFLOAD`` on, hashing runs in a small per-worker process
+pool and at most ``PASSWORD_HASH_MAX_PENDING`` hashes may be queued; callers
+that cannot get a slot within ``PASSWORD_HASH_QUEUE_TIMEOUT`` seconds get
+``PasswordHasherBusy`` instead of piling up behind the CPU.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.utils.crypto import get_random_string
+
+_hasher = PBKDF2PasswordHasher()
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when every hashing slot is taken for longer than the queue timeout"""
+
+
+def _encode(password, salt, iterations):
+    return _hasher.encode(password, salt, iterations)
+
+
+def _verify(password, encoded):
+    return _hasher.verify(password, encoded)
+
+
+_pool = None
+_pool_pid = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool, _pool_pid, _slots
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                # forkserver children never inherit the worker's threads or sockets
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context(settings.PASSWORD_HASH_START_METHOD)
+                )
+                _slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+                _pool_pid = pid
+    return _pool, _slots
+
+
+def _discard_pool(pool):
+    """Drop a pool whose child died, so the next call builds a new one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def submit(func, *args):
+    """Run ``func`` in the hashing pool and return a Future for its result"""
+    # A child killed by the OOM killer breaks its pool for good; retry once on a new one
+    for attempt in range(2):
+        pool, slots = _get_pool()
+        if not slots.acquire(timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT):
+            raise PasswordHasherBusy("All password hashing slots are busy")
+        try:
+            future = pool.submit(func, *args)
+        except BrokenProcessPool:
+            slots.release()
+            _discard_pool(pool)
+            if attempt:
+                raise
+            continue
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+
+def _run(func, *args):
+    if not settings.PASSWORD_HASH_OFFLOAD:
+        return func(*args)
+    return submit(func, *args).result()
+
+
+def hash_password(password):
+    """Return a PBKDF2 hash of ``password`` using the configured work factor"""
+    return _run(_encode, password, get_random_string(22), settings.PASSWORD_HASH_ITERATIONS)
+
+
+def verify_password(password, encoded):
+    """Check ``password`` against a hash produced by ``hash_password``"""
+    return _run(_verify, password, encoded)
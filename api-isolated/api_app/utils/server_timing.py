@@ -0,0 +1,52 @@
+"""
+Per-request step timings reported through the ``Server-Timing`` header.
+
+Code that wants a step attributed wraps it in ``get_server_timing(request)
+.measure(name)``; ``ServerTimingMiddleware`` turns whatever was recorded
+into the header, so browsers' network panels and load tests can see where a
+request spent its time.
+"""
+import time
+from contextlib import contextmanager
+
+
+class ServerTiming:
+    """Ordered step durations measured with a monotonic clock"""
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self.entries = []
+
+    def add(self, name, seconds, description=None):
+        self.entries.append((name, seconds, description))
+
+    @contextmanager
+    def measure(self, name, description=None):
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.add(name, self._clock() - started, description)
+
+    def as_dict(self):
+        """Durations in milliseconds keyed by step name"""
+        return {name: round(seconds * 1000, 3) for name, seconds, _ in self.entries}
+
+    def header_value(self):
+        parts = []
+        for name, seconds, description in self.entries:
+            part = f"{name};dur={seconds * 1000:.3f}"
+            if description:
+                escaped = description.replace('\\', '\\\\').replace('"', '\\"')
+                part += f';desc="{escaped}"'
+            parts.append(part)
+        return ', '.join(parts)
+
+
+def get_server_timing(request):
+    """Return the timing recorder for ``request`` (Django or DRF), creating it on first use"""
+    request = getattr(request, '_request', request)
+    timing = getattr(request, 'server_timing', None)
+    if timing is None:
+        timing = request.server_timing = ServerTiming()
+    return timing
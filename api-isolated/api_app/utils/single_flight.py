@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+from . import metrics
+
+CALLER_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250)
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'error', 'task', 'callers')
+
+    def __init__(self, task=None):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.task = task
+        self.callers = 1
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key onto one in-flight call.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and get the same result (or exception). Once it
+    lands the key is free again, so nothing is cached. Threads coalesce
+    through ``do`` and coroutines on one event loop through ``ado``. Every
+    flight records how many callers it served in ``single_flight_callers``.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._pid = os.getpid()
+
+    def do(self, key, fn, *args, **kwargs):
+        """Call ``fn`` or wait for the call already in flight for ``key``"""
+        with self._lock:
+            self._forget_parent_flights()
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.callers += 1
+        metrics.inc('single_flight_calls_total', {'name': self.name, 'role': 'leader' if leader else 'shared'})
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(*args, **kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self._land(key, flight)
+            flight.done.set()
+
+    async def ado(self, key, fn, *args, **kwargs):
+        """``do`` for coroutine functions; coalesces callers on the running event loop"""
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            self._forget_parent_flights()
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                # A task, so a caller being cancelled does not cancel the others' call
+                flight = self._flights[flight_key] = _Flight(loop.create_task(fn(*args, **kwargs)))
+                flight.task.add_done_callback(lambda task: self._land(flight_key, flight))
+            else:
+                flight.callers += 1
+        metrics.inc('single_flight_calls_total', {'name': self.name, 'role': 'leader' if leader else 'shared'})
+        return await asyncio.shield(flight.task)
+
+    def in_flight(self):
+        """Number of calls currently in flight"""
+        with self._lock:
+            return len(self._flights)
+
+    def _land(self, key, flight):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            callers = flight.callers
+        if flight.task is not None and not flight.task.cancelled():
+            # Mark the exception retrieved even if every caller was cancelled
+            flight.task.exception()
+        metrics.observe('single_flight_callers', callers, {'name': self.name}, buckets=CALLER_BUCKETS)
+
+    def _forget_parent_flights(self):
+        # Called with the lock held. Flights copied by a fork have no leader
+        # in this process, so waiting on them would hang.
+        pid = os.getpid()
+        if self._pid != pid:
+            self._flights = {}
+            self._pid = pid
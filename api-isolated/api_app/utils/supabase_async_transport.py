@@ -0,0 +1,51 @@
+"""
+Non-blocking Supabase transport for async views.
+
+One ``httpx.AsyncClient`` per event loop (uvicorn runs one loop per worker),
+so hundreds of concurrent requests share keep-alive connections without
+holding a thread each. Sync code keeps using ``supabase_transport``.
+"""
+import asyncio
+import weakref
+import httpx
+from django.conf import settings
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    """Return the shared AsyncClient for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.SUPABASE_HTTP_READ_TIMEOUT, connect=settings.SUPABASE_HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_HTTP_POOL_SIZE
+            ),
+            # Connection failures only; like the sync adapter, never replay a sent request
+            transport=httpx.AsyncHTTPTransport(retries=settings.SUPABASE_HTTP_RETRIES)
+        )
+    return client
+
+
+async def close_async_client():
+    """Close the running loop's client, e.g. on ASGI lifespan shutdown or in tests"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def supabase_request_async(method, path, **kwargs):
+    """Send a request to ``SUPABASE_URL + path`` through the loop's shared client"""
+    headers = {"apikey": settings.SUPABASE_KEY}
+    headers.update(kwargs.pop('headers', None) or {})
+    return await get_async_client().request(method, f"{settings.SUPABASE_URL}{path}", headers=headers, **kwargs)
+
+
+def supabase_stream_async(method, path, **kwargs):
+    """Like ``supabase_request_async`` but returns a streaming context manager"""
+    headers = {"apikey": settings.SUPABASE_KEY}
+    headers.update(kwargs.pop('headers', None) or {})
+    return get_async_client().stream(method, f"{settings.SUPABASE_URL}{path}", headers=headers, **kwargs)
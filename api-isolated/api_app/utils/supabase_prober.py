@@ -0,0 +1,304 @@
+import logging
+import os
+import threading
+import time
+import requests
+from django.conf import settings
+from . import metrics
+from .circuit_breaker import CircuitOpenError, get_supabase_breaker
+from .single_flight import SingleFlight
+from .supabase_transport import supabase_request
+
+logger = logging.getLogger(__name__)
+
+
+def _header_bytes(response):
+    # Approximate wire size of the status line and headers
+    # (requests calls it ``reason``, httpx ``reason_phrase``)
+    reason = getattr(response, 'reason', None) or getattr(response, 'reason_phrase', '')
+    status_line = len(reason or '') + 15
+    return status_line + sum(len(k) + len(v) + 4 for k, v in response.headers.items()) + 2
+
+
+def _probe_get(timeout):
+    """Full GET of /rest/v1/ (downloads the whole PostgREST OpenAPI document)"""
+    response = supabase_request('GET', '/rest/v1/', timeout=timeout)
+    return _header_bytes(response) + len(response.content)
+
+
+def _probe_head(timeout):
+    """HEAD of /rest/v1/: headers only, and the connection stays reusable"""
+    response = supabase_request('HEAD', '/rest/v1/', timeout=timeout)
+    return _header_bytes(response)
+
+
+def _probe_stream(timeout):
+    """GET of /rest/v1/ closed as soon as the headers arrive"""
+    # Closing with an unread body discards the connection instead of
+    # returning it to the pool, so prefer ``head`` when keep-alive matters
+    response = supabase_request('GET', '/rest/v1/', timeout=timeout, stream=True)
+    response.close()
+    return _header_bytes(response)
+
+
+def _probe_rpc(timeout):
+    """POST to a tiny dedicated RPC (see supabase/migrations) returning one row"""
+    response = supabase_request(
+        'POST',
+        f"/rest/v1/rpc/{settings.SUPABASE_HEALTH_PROBE_RPC}",
+        json={},
+        timeout=timeout
+    )
+    return _header_bytes(response) + len(response.content)
+
+
+PROBE_STRATEGIES = {
+    'get': _probe_get,
+    'head': _probe_head,
+    'stream': _probe_stream,
+    'rpc': _probe_rpc,
+}
+
+
+def _new_snapshot(strategy, breaker):
+    started = time.monotonic()
+    return {
+        'connected': False,
+        'error': '',
+        'checked_at': time.time(),
+        'checked_monotonic': started,
+        'latency_ms': 0.0,
+        'bytes_transferred': 0,
+        'strategy': strategy,
+        'circuit_state': breaker.state,
+    }
+
+
+def _circuit_open(snapshot, breaker):
+    """Return True (and mark the snapshot) when the breaker refuses the call"""
+    try:
+        breaker.before_call()
+    except CircuitOpenError as e:
+        # Fail fast without touching the network while Supabase is degraded
+        snapshot['error'] = str(e)
+        metrics.inc('supabase_probe_total', {'strategy': snapshot['strategy'], 'outcome': 'circuit_open'})
+        return True
+    return False
+
+
+def _finish_snapshot(snapshot, breaker):
+    strategy = snapshot['strategy']
+    elapsed = time.monotonic() - snapshot['checked_monotonic']
+    breaker.record(snapshot['connected'], elapsed)
+    snapshot['latency_ms'] = elapsed * 1000
+    snapshot['circuit_state'] = breaker.state
+    outcome = 'ok' if snapshot['connected'] else 'error'
+    metrics.inc('supabase_probe_total', {'strategy': strategy, 'outcome': outcome})
+    metrics.observe('supabase_probe_duration_seconds', elapsed, {'strategy': strategy})
+    logger.debug(
+        f"Supabase probe ({strategy}): connected={snapshot['connected']} "
+        f"latency={snapshot['latency_ms']:.1f}ms bytes={snapshot['bytes_transferred']}"
+    )
+    return snapshot
+
+
+def probe_supabase(timeout=None):
+    """Check once whether Supabase is reachable and return a snapshot of the result"""
+    breaker = get_supabase_breaker()
+    strategy = settings.SUPABASE_HEALTH_PROBE_STRATEGY
+    snapshot = _new_snapshot(strategy, breaker)
+    if _circuit_open(snapshot, breaker):
+        return snapshot
+
+    try:
+        snapshot['bytes_transferred'] = PROBE_STRATEGIES[strategy](timeout or settings.SUPABASE_HEALTH_PROBE_TIMEOUT)
+        snapshot['connected'] = True
+    except requests.RequestException as e:
+        logger.error(f"Error checking Supabase health: {str(e)}")
+        snapshot['error'] = str(e)
+    except Exception as e:
+        # e.g. a bad apikey header; still a failed probe, and the breaker's trial must be released
+        logger.exception("Unexpected error checking Supabase health")
+        snapshot['error'] = str(e)
+    except BaseException:
+        _finish_snapshot(snapshot, breaker)
+        raise
+
+    return _finish_snapshot(snapshot, breaker)
+
+
+async def _aprobe_get(timeout):
+    from .supabase_async_transport import supabase_request_async
+    response = await supabase_request_async('GET', '/rest/v1/', timeout=timeout)
+    return _header_bytes(response) + len(response.content)
+
+
+async def _aprobe_head(timeout):
+    from .supabase_async_transport import supabase_request_async
+    response = await supabase_request_async('HEAD', '/rest/v1/', timeout=timeout)
+    return _header_bytes(response)
+
+
+async def _aprobe_stream(timeout):
+    from .supabase_async_transport import supabase_stream_async
+    async with supabase_stream_async('GET', '/rest/v1/', timeout=timeout) as response:
+        return _header_bytes(response)
+
+
+async def _aprobe_rpc(timeout):
+    from .supabase_async_transport import supabase_request_async
+    response = await supabase_request_async(
+        'POST',
+        f"/rest/v1/rpc/{settings.SUPABASE_HEALTH_PROBE_RPC}",
+        json={},
+        timeout=timeout
+    )
+    return _header_bytes(response) + len(response.content)
+
+
+ASYNC_PROBE_STRATEGIES = {
+    'get': _aprobe_get,
+    'head': _aprobe_head,
+    'stream': _aprobe_stream,
+    'rpc': _aprobe_rpc,
+}
+
+
+async def probe_supabase_async(timeout=None):
+    """
+    Non-blocking ``probe_supabase`` for async views.
+
+    Same strategies, breaker, metrics and snapshot shape, sent through the
+    event loop's shared httpx client instead of a worker thread.
+    """
+    # httpx is only needed (and only imported) on the async serving path
+    import httpx
+
+    breaker = get_supabase_breaker()
+    strategy = settings.SUPABASE_HEALTH_PROBE_STRATEGY
+    snapshot = _new_snapshot(strategy, breaker)
+    if _circuit_open(snapshot, breaker):
+        return snapshot
+
+    try:
+        snapshot['bytes_transferred'] = await ASYNC_PROBE_STRATEGIES[strategy](timeout or settings.SUPABASE_HEALTH_PROBE_TIMEOUT)
+        snapshot['connected'] = True
+    except httpx.HTTPError as e:
+        logger.error(f"Error checking Supabase health: {str(e)}")
+        snapshot['error'] = str(e)
+    except Exception as e:
+        # e.g. httpx.InvalidURL, which is not an HTTPError
+        logger.exception("Unexpected error checking Supabase health")
+        snapshot['error'] = str(e)
+    except BaseException:
+        # Cancelled mid-probe: record it so the breaker's trial is released
+        _finish_snapshot(snapshot, breaker)
+        raise
+
+    return _finish_snapshot(snapshot, breaker)
+
+
+class SupabaseProber:
+    """
+    Keeps a cached snapshot of Supabase reachability for the current process.
+
+    A daemon thread refreshes the snapshot every ``interval`` seconds so
+    readers never wait on the network. The thread is started lazily on first
+    use and restarted after a fork, so every gunicorn worker owns its prober.
+    An ``interval`` of 0 disables the thread and probes on every read;
+    async views read through ``asnapshot`` so those probes never block the
+    event loop. Concurrent refreshes share one in-flight probe, so a burst
+    of health checks costs Supabase a single request.
+    """
+
+    def __init__(self, interval, probe=probe_supabase, aprobe=probe_supabase_async):
+        self.interval = interval
+        self._probe = probe
+        self._aprobe = aprobe
+        self._flight = SingleFlight('supabase_probe')
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def snapshot(self):
+        """Return the latest snapshot, probing inline only when none exists yet"""
+        self._ensure_running()
+        snapshot = self._snapshot
+        if snapshot is None or self.interval <= 0:
+            snapshot = self.refresh()
+        return snapshot
+
+    def refresh(self):
+        """Probe Supabase now (or join the probe in flight) and store the result"""
+        snapshot = self._flight.do('probe', self._probe)
+        self._snapshot = snapshot
+        return snapshot
+
+    async def asnapshot(self):
+        """``snapshot`` for async callers; inline probes go through the event loop"""
+        self._ensure_running()
+        snapshot = self._snapshot
+        if snapshot is None or self.interval <= 0:
+            snapshot = await self.arefresh()
+        return snapshot
+
+    async def arefresh(self):
+        """``refresh`` without blocking; joins a probe in flight on this event loop"""
+        snapshot = await self._flight.ado('probe', self._aprobe)
+        self._snapshot = snapshot
+        return snapshot
+
+    def stop(self):
+        """Stop the background thread, if it is running"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def _ensure_running(self):
+        if self.interval <= 0:
+            return
+
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._pid == pid and self._thread is not None and self._thread.is_alive():
+                return
+            if self._pid != pid:
+                # Forked from a parent that already probed: its snapshot and
+                # thread belong to another process.
+                self._snapshot = None
+            self._pid = pid
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._stop_event,),
+                name='supabase-prober',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self, stop_event):
+        while not stop_event.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Background Supabase probe failed")
+
+
+_prober = None
+_prober_lock = threading.Lock()
+
+
+def get_prober():
+    """Return the process-wide Supabase prober, creating it on first use"""
+    global _prober
+    if _prober is None:
+        with _prober_lock:
+            if _prober is None:
+                _prober = SupabaseProber(settings.SUPABASE_HEALTH_PROBE_INTERVAL)
+    return _prober
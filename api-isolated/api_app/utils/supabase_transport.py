@@ -0,0 +1,156 @@
+"""
+Shared HTTP transport for every call this process makes to Supabase.
+
+One pooled, keep-alive ``requests.Session`` is kept per process and rebuilt
+after a fork, so gunicorn workers never share sockets with the master. The
+connection pools record whether each connection they hand out was already
+open or needs a TCP/TLS handshake, so reuse is counted where it happens.
+"""
+import os
+import threading
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+
+class TransportStats:
+    """Thread-safe counters for requests sent and the connections they were sent on"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self, reused):
+        with self._lock:
+            if reused:
+                self.connections_reused += 1
+            else:
+                self.connections_opened += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'connections_opened': self.connections_opened,
+                'connections_reused': self.connections_reused,
+            }
+
+
+stats = TransportStats()
+
+
+class _CountingPoolMixin:
+    # Every attempt, retries included, takes a connection here. One with a
+    # live socket is reused; a new one, or one dropped by the server, will
+    # connect when the request is sent.
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        stats.record_connection(reused=conn.sock is not None)
+        return conn
+
+
+class CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class SupabaseHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools report to ``stats`` whether each connection was opened or reused"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        stats.record_request()
+        return super().send(request, **kwargs)
+
+
+def build_session():
+    """Create a pooled session configured from the SUPABASE_HTTP_* settings"""
+    retries = Retry(
+        total=settings.SUPABASE_HTTP_RETRIES,
+        read=0,
+        backoff_factor=settings.SUPABASE_HTTP_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        raise_on_status=False
+    )
+    adapter = SupabaseHTTPAdapter(
+        pool_connections=settings.SUPABASE_HTTP_POOL_SIZE,
+        pool_maxsize=settings.SUPABASE_HTTP_POOL_SIZE,
+        max_retries=retries
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return this process's shared Supabase session, rebuilding it after a fork"""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = build_session()
+                _session_pid = pid
+    return _session
+
+
+def reset_session():
+    """Drop the shared session so the next call builds a fresh one"""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def supabase_request(method, path, **kwargs):
+    """Send a request to ``SUPABASE_URL + path`` through the shared session"""
+    headers = {"apikey": settings.SUPABASE_KEY}
+    headers.update(kwargs.pop('headers', None) or {})
+    kwargs.setdefault('timeout', (settings.SUPABASE_HTTP_CONNECT_TIMEOUT, settings.SUPABASE_HTTP_READ_TIMEOUT))
+    return get_session().request(method, f"{settings.SUPABASE_URL}{path}", headers=headers, **kwargs)
+
+
+def get_transport_stats():
+    """Return connection reuse counters along with the pool configuration"""
+    data = stats.as_dict()
+    data['pool_size'] = settings.SUPABASE_HTTP_POOL_SIZE
+    data['retries'] = settings.SUPABASE_HTTP_RETRIES
+    return data
+
+
+def _forget_parent_session():
+    # The child must never reuse sockets that belong to the parent's pools
+    global _session, _session_pid, _session_lock
+    _session = None
+    _session_pid = None
+    _session_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_parent_session)
@@ -0,0 +1,111 @@
+"""
+Token buckets shared by every worker on the dyno, kept in a local SQLite file.
+
+Each bucket is one row: the tokens left after its last successful take and
+when that was. A take is a single UPSERT that refills the bucket for the
+time elapsed, spends ``cost`` tokens and returns the new level, or changes
+nothing when the bucket cannot cover the cost, so concurrent workers never
+double-spend. The file lives on /dev/shm when the dyno has it, where a commit
+never touches disk.
+"""
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Refill the bucket, then spend; the WHERE keeps an empty bucket untouched
+_TAKE_SQL = (
+    'INSERT INTO buckets (key, tokens, updated, full_at) '
+    'VALUES (:key, :capacity - :cost, :now, :now + :cost / :rate) '
+    'ON CONFLICT (key) DO UPDATE SET '
+    'tokens = min(:capacity, tokens + (:now - updated) * :rate) - :cost, '
+    'updated = :now, '
+    'full_at = :now + (:capacity - min(:capacity, tokens + (:now - updated) * :rate) + :cost) / :rate '
+    'WHERE min(:capacity, tokens + (:now - updated) * :rate) >= :cost '
+    'RETURNING tokens'
+)
+
+
+def parse_rate(rate):
+    """Tokens per second for a DRF-style rate such as ``'10/s'`` or ``'100/min'``"""
+    count, _, period = rate.partition('/')
+    return int(count) / PERIODS[period.strip()[0]]
+
+
+class SQLiteTokenBuckets:
+    """
+    Token buckets in a SQLite file in WAL mode, one connection per thread.
+
+    Buckets that have refilled to capacity are indistinguishable from new
+    ones, so a sweep every ``sweep_every`` takes (on average) deletes them
+    and the file stays as small as the set of recently active clients.
+    """
+
+    def __init__(self, path=None, sweep_every=1000):
+        self.path = path or settings.THROTTLE_SQLITE_PATH
+        self.sweep_every = sweep_every
+        self._local = threading.local()
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS buckets ('
+            'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL)'
+        )
+
+    def _connection(self):
+        # Connections must not cross a fork or be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=1, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def take(self, key, rate, capacity, cost=1, now=None):
+        """
+        Spend ``cost`` tokens from bucket ``key``.
+
+        Returns ``(True, 0)`` when allowed, otherwise ``(False, seconds)``
+        until enough tokens will have refilled.
+        """
+        now = time.time() if now is None else now
+        params = {'key': key, 'rate': rate, 'capacity': capacity, 'cost': cost, 'now': now}
+        connection = self._connection()
+        if connection.execute(_TAKE_SQL, params).fetchone() is not None:
+            if self.sweep_every and random.random() * self.sweep_every < 1:
+                self.sweep(now)
+            return True, 0
+
+        row = connection.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+        available = min(capacity, row[0] + (now - row[1]) * rate) if row else capacity
+        return False, max(0.0, (cost - available) / rate)
+
+    def sweep(self, now=None):
+        """Delete buckets that are full again; returns how many"""
+        now = time.time() if now is None else now
+        return self._connection().execute('DELETE FROM buckets WHERE full_at <= ?', (now,)).rowcount
+
+    def clear(self):
+        self._connection().execute('DELETE FROM buckets')
+
+
+_buckets = None
+_buckets_lock = threading.Lock()
+
+
+def get_token_buckets():
+    """Return the process-wide buckets at THROTTLE_SQLITE_PATH"""
+    global _buckets
+    path = settings.THROTTLE_SQLITE_PATH
+    if _buckets is None or _buckets.path != path:
+        with _buckets_lock:
+            if _buckets is None or _buckets.path != path:
+                _buckets = SQLiteTokenBuckets(path)
+    return _buckets
@@ -0,0 +1,91 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of tokens that already passed signature verification.
+
+    Keys are SHA-256 digests of the token so raw bearer tokens are never kept
+    in memory. An entry expires after ``ttl`` seconds or at the token's own
+    ``exp`` claim, whichever comes first, and the whole cache is dropped when
+    the secret it was verified with changes.
+    """
+
+    def __init__(self, max_entries=1024, ttl=300, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._secret_digest = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha256(value.encode()).digest()
+
+    def get(self, token, secret):
+        """Return the cached claims for ``token`` or None on a miss"""
+        key = self._digest(token)
+        with self._lock:
+            self._check_secret(secret)
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, claims = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return claims
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token, secret, claims):
+        """Remember verified ``claims`` for ``token`` until it expires"""
+        expires_at = self._clock() + self.ttl
+        if 'exp' in claims:
+            expires_at = min(expires_at, claims['exp'])
+        key = self._digest(token)
+        with self._lock:
+            self._check_secret(secret)
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def _check_secret(self, secret):
+        # Caller holds the lock
+        digest = self._digest(secret)
+        if digest != self._secret_digest:
+            self._entries.clear()
+            self._secret_digest = digest
+
+
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache():
+    """Return the process-wide verified token cache"""
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                _token_cache = VerifiedTokenCache(
+                    max_entries=settings.JWT_VERIFY_CACHE_SIZE,
+                    ttl=settings.JWT_VERIFY_CACHE_TTL
+                )
+    return _token_cache
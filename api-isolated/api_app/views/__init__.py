@@ -1,16 +1,49 @@
-from .get_api_message import APITest
-from .errors import custom_error_404, custom_error_500
-from .get_supabase_health import health_check
-from .generate_jwt_token import get_test_token
-from .generate_user_lifecycle import test_user_lifecycle
-from .test_supabase_config import test_supabase_config
+"""
+View re-exports, imported on first attribute access (PEP 562).
+
+Importing ``api_app.views`` (as Django does to find ``handler404``) only
+loads the module that defines the requested view, so a worker does not pay
+for ``requests``, ``jwt`` and every DRF view module at boot.
+"""
+from importlib import import_module
+
+_VIEW_MODULES = {
+    'APITest': 'get_api_message',
+    'api_message': 'get_api_message',
+    'custom_error_404': 'errors',
+    'custom_error_500': 'errors',
+    'health_check': 'get_supabase_health',
+    'deep_health_check': 'get_deep_health',
+    'get_test_token': 'generate_jwt_token',
+    'test_user_lifecycle': 'generate_user_lifecycle',
+    'test_user_lifecycle_bulk': 'generate_user_lifecycle',
+    'test_supabase_config': 'test_supabase_config',
+    'get_metrics': 'get_metrics',
+}
+
+
+def __getattr__(name):
+    if name not in _VIEW_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_VIEW_MODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_VIEW_MODULES))
+
 
 __all__ = [
     'APITest',
+    'api_message',
     'custom_error_404',
     'custom_error_500',
     'health_check',
+    'deep_health_check',
     'get_test_token',
     'test_user_lifecycle',
+    'test_user_lifecycle_bulk',
     'test_supabase_config',
-] 
\ No newline at end of file
+    'get_metrics',
+]
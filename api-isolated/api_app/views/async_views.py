@@ -0,0 +1,194 @@
+"""
+Native async versions of the hot endpoints, served under ASGI.
+
+``api_app.urls`` routes to these when ``ASYNC_VIEWS`` is on (``asgi.py``
+turns it on), so the same URLs answer under both WSGI and ASGI with the same
+response bodies. DRF 3.14 has no async views, so these are plain Django
+views that reuse the sync modules' request handling.
+"""
+import logging
+from collections.abc import Mapping
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from ..authentication import StatelessJWTAuthentication, verify_token
+from ..throttling import AuthTokenThrottle, LifecycleBulkThrottle, LifecycleThrottle, athrottled_response
+from ..utils.fast_json import FastJsonResponse, loads
+from ..utils.passwords import PasswordHasherBusy
+from ..utils.server_timing import get_server_timing
+from ..utils.supabase_prober import get_prober
+from .generate_jwt_token import token_request
+from .generate_user_lifecycle import astream_bulk_results, bulk_credentials, iter_ndjson, run_lifecycle, wants_timings
+from .get_api_message import api_message
+from .get_supabase_health import missing_config_response, snapshot_response
+
+logger = logging.getLogger(__name__)
+
+
+class _BadRequestBody(Exception):
+    pass
+
+
+def _method_not_allowed(request, allowed):
+    response = FastJsonResponse(
+        {"detail": f'Method "{request.method}" not allowed.'},
+        status=status.HTTP_405_METHOD_NOT_ALLOWED
+    )
+    response['Allow'] = ', '.join(allowed)
+    return response
+
+
+def _request_data(request, objects_only=True):
+    """Parse a JSON or form body the way DRF's default parsers would"""
+    if request.content_type != 'application/json':
+        return request.POST
+    try:
+        data = loads(request.body or b'{}')
+    except ValueError as e:
+        raise _BadRequestBody(f"JSON parse error - {str(e)}")
+    if objects_only and not isinstance(data, dict):
+        raise _BadRequestBody("JSON body must be an object")
+    return data
+
+
+async def _authenticate_and_throttle(request, timing, throttle):
+    """
+    DRF's order for the authenticated views: an invalid token is a 401,
+    then the throttle, then a 401 for a missing header. Returns the
+    rejection, or None when the request may proceed.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    parts = header.split(' ')
+    has_bearer = len(parts) == 2 and parts[0] == StatelessJWTAuthentication.keyword and bool(parts[1])
+    if has_bearer:
+        with timing.measure('auth', 'Token check'):
+            claims = verify_token(parts[1])
+        if claims is None:
+            response = FastJsonResponse({
+                "error": "Invalid token",
+                "message": "Please provide a valid token"
+            }, status=status.HTTP_401_UNAUTHORIZED)
+            response['WWW-Authenticate'] = StatelessJWTAuthentication().authenticate_header(request)
+            return response
+
+    throttled = await athrottled_response(request, throttle)
+    if throttled:
+        return throttled
+
+    if not has_bearer:
+        return FastJsonResponse({
+            "error": "Missing or invalid Authorization header",
+            "message": "Please provide a valid Bearer token"
+        }, status=status.HTTP_401_UNAUTHORIZED)
+    return None
+
+
+async def api_test(request):
+    """Async ``api_message``: the same pre-encoded bytes, without a thread hop"""
+    return api_message(request)
+
+
+async def health_check(request):
+    """Async ``health_check``: an inline probe awaits Supabase instead of blocking a thread"""
+    if request.method not in ('GET', 'HEAD'):
+        return _method_not_allowed(request, ['GET', 'HEAD'])
+
+    missing = missing_config_response()
+    if missing:
+        return FastJsonResponse(missing[0], status=missing[1])
+
+    body, status_code = snapshot_response(await get_prober().asnapshot())
+    return FastJsonResponse(body, status=status_code)
+
+
+@csrf_exempt
+async def get_test_token(request):
+    """Async ``get_test_token``"""
+    if request.method == 'GET':
+        data, per_token = request.GET, None
+    elif request.method == 'POST':
+        try:
+            # token_request answers a non-object body like the DRF view does
+            data = _request_data(request, objects_only=False)
+        except _BadRequestBody as e:
+            return FastJsonResponse({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        per_token = data.get('claims') if isinstance(data, Mapping) else None
+    else:
+        return _method_not_allowed(request, ['GET', 'POST'])
+
+    throttled = await athrottled_response(request, AuthTokenThrottle())
+    if throttled:
+        return throttled
+    body, status_code = token_request(data, per_token)
+    return FastJsonResponse(body, status=status_code)
+
+
+@csrf_exempt
+async def test_user_lifecycle(request):
+    """Async ``test_user_lifecycle``; hashing and the store run off the event loop"""
+    if request.method != 'POST':
+        return _method_not_allowed(request, ['POST'])
+
+    timing = get_server_timing(request)
+    rejected = await _authenticate_and_throttle(request, timing, LifecycleThrottle())
+    if rejected:
+        return rejected
+
+    try:
+        data = _request_data(request)
+    except _BadRequestBody as e:
+        return FastJsonResponse({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        body, status_code = await sync_to_async(run_lifecycle, thread_sensitive=False)(
+            data.get('username'), data.get('password'), timing
+        )
+        if wants_timings(request.GET) and 'details' in body:
+            body['details']['timings_ms'] = timing.as_dict()
+        return FastJsonResponse(body, status=status_code)
+
+    except PasswordHasherBusy as e:
+        logger.warning(f"Password hashing saturated: {str(e)}")
+        return FastJsonResponse({
+            "error": "Server busy",
+            "message": "Password hashing capacity exhausted, retry shortly"
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    except Exception as e:
+        error_msg = f"Error in user lifecycle test: {str(e)}"
+        logger.error(error_msg)
+        return FastJsonResponse({
+            "error": error_msg
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@csrf_exempt
+async def test_user_lifecycle_bulk(request):
+    """Async ``test_user_lifecycle_bulk``; results stream from an async generator as they finish"""
+    if request.method != 'POST':
+        return _method_not_allowed(request, ['POST'])
+
+    rejected = await _authenticate_and_throttle(request, get_server_timing(request), LifecycleBulkThrottle())
+    if rejected:
+        return rejected
+
+    max_users = settings.LIFECYCLE_BULK_MAX_USERS
+    if request.content_type == 'application/x-ndjson':
+        # The ASGI handler has already spooled the body, so reading its
+        # lines does not wait on the client
+        credentials = iter_ndjson(request)
+    else:
+        try:
+            data = _request_data(request, objects_only=False)
+        except _BadRequestBody as e:
+            return FastJsonResponse({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        credentials, error = bulk_credentials(data, max_users)
+        if error:
+            return FastJsonResponse(error, status=status.HTTP_400_BAD_REQUEST)
+
+    return StreamingHttpResponse(
+        astream_bulk_results(credentials, settings.LIFECYCLE_BULK_WORKERS, max_users, wants_timings(request.GET)),
+        content_type='application/x-ndjson'
+    )
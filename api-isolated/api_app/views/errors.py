@@ -1,7 +1,11 @@
-from django.http import JsonResponse
+from ..utils.constant_json import ConstantJSONView
+
+# Encoded once; errors are not cacheable, so no ETag
+_not_found = ConstantJSONView({'error': '404 error, Not Found'}, status=404, conditional=False)
+_server_error = ConstantJSONView({'error': '500 error, Internal Server Error'}, status=500, conditional=False)
 
 def custom_error_404(request, exception):
-    return JsonResponse({'error': '404 error, Not Found'}, status=404)
+    return _not_found.response()
 
 def custom_error_500(request):
-    return JsonResponse({'error': '500 error, Internal Server Error'}, status=500)
\ No newline at end of file
+    return _server_error.response()
@@ -1,14 +1,27 @@
+import base64
+import hashlib
+import hmac
+import json
 import logging
 import jwt
 import datetime
+import time
+from collections.abc import Mapping
 from django.conf import settings
-from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
+from ..throttling import AuthTokenThrottle
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TOKEN_LIFETIME = int(datetime.timedelta(days=1).total_seconds())
+
+# Encoded once: every HS256 token we mint shares this header segment
+_HS256_HEADER_SEGMENT = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=')
+
+
 def generate_jwt_token():
     """Generate a JWT token for testing"""
     payload = {
@@ -19,10 +32,117 @@ def generate_jwt_token():
     }
     return jwt.encode(payload, settings.JWT_SECRET, algorithm='HS256')
 
-@api_view(['GET'])
+
+def generate_jwt_tokens(count, claims=None, user_id='test_user', role='service_role', lifetime=DEFAULT_TOKEN_LIFETIME):
+    """
+    Mint ``count`` HS256 tokens in one pass.
+
+    The header segment is encoded once and the HMAC key schedule is prepared
+    once and copied per token, so each extra token only costs a payload
+    encode and one HMAC update. ``claims`` is an optional list of per-token
+    overrides for ``user_id``, ``role`` and ``lifetime``.
+    """
+    signer = hmac.new(settings.JWT_SECRET.encode(), digestmod=hashlib.sha256)
+    now = int(time.time())
+    claims = claims or []
+
+    tokens = []
+    for index in range(count):
+        overrides = claims[index] if index < len(claims) else {}
+        payload = {
+            'user_id': overrides.get('user_id', user_id),
+            'exp': now + overrides.get('lifetime', lifetime),
+            'iat': now,
+            'role': overrides.get('role', role),
+        }
+        payload_segment = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode()
+        ).rstrip(b'=')
+        signing_input = _HS256_HEADER_SEGMENT + b'.' + payload_segment
+
+        mac = signer.copy()
+        mac.update(signing_input)
+        signature = base64.urlsafe_b64encode(mac.digest()).rstrip(b'=')
+        tokens.append((signing_input + b'.' + signature).decode())
+    return tokens
+
+
+def _parse_claims(data):
+    """Validate optional claim overrides, returning (claims, error message)"""
+    parsed = {}
+    if 'user_id' in data:
+        if not isinstance(data['user_id'], str) or not data['user_id']:
+            return None, "user_id must be a non-empty string"
+        parsed['user_id'] = data['user_id']
+    if 'role' in data:
+        if not isinstance(data['role'], str) or not data['role']:
+            return None, "role must be a non-empty string"
+        parsed['role'] = data['role']
+    if 'lifetime' in data:
+        try:
+            lifetime = int(data['lifetime'])
+        except (TypeError, ValueError):
+            return None, "lifetime must be a number of seconds"
+        if not 0 < lifetime <= settings.JWT_BATCH_MAX_LIFETIME:
+            return None, f"lifetime must be between 1 and {settings.JWT_BATCH_MAX_LIFETIME} seconds"
+        parsed['lifetime'] = lifetime
+    return parsed, None
+
+
+def _bad_request(message):
+    return {
+        "error": "Invalid token request",
+        "message": message
+    }, status.HTTP_400_BAD_REQUEST
+
+
+def token_request(data, per_token=None):
+    """
+    Build the response body and status for a token request.
+
+    ``data`` holds the shared parameters (query string or JSON body) and
+    ``per_token`` the optional per-token ``claims`` list of a POST.
+    """
+    if not isinstance(data, Mapping):
+        return _bad_request("request body must be a JSON object")
+    if 'count' not in data and per_token is None:
+        token = generate_jwt_token()
+        return {'token': token}, status.HTTP_200_OK
+
+    try:
+        count = int(data.get('count', len(per_token or [])))
+    except (TypeError, ValueError):
+        return _bad_request("count must be an integer")
+    if not 0 < count <= settings.JWT_BATCH_MAX_COUNT:
+        return _bad_request(f"count must be between 1 and {settings.JWT_BATCH_MAX_COUNT}")
+
+    shared, error = _parse_claims(data)
+    if error:
+        return _bad_request(error)
+
+    overrides = []
+    if per_token is not None:
+        if not isinstance(per_token, list) or len(per_token) > count:
+            return _bad_request("claims must be a list with at most count entries")
+        for item in per_token:
+            if not isinstance(item, dict):
+                return _bad_request("each claims entry must be an object")
+            parsed, error = _parse_claims(item)
+            if error:
+                return _bad_request(error)
+            overrides.append(parsed)
+
+    tokens = generate_jwt_tokens(count, overrides, **shared)
+    return {'tokens': tokens, 'count': len(tokens)}, status.HTTP_200_OK
+
+
+@api_view(['GET', 'POST'])
 @authentication_classes([])
 @permission_classes([AllowAny])
+@throttle_classes([AuthTokenThrottle])
 def get_test_token(request):
-    """Generate a test JWT token"""
-    token = generate_jwt_token()
-    return Response({'token': token}, status=status.HTTP_200_OK)
\ No newline at end of file
+    """Generate a test JWT token, or a batch of them when ``count`` is given"""
+    data = request.data if request.method == 'POST' else request.query_params
+    per_token = data.get('claims') if request.method == 'POST' and isinstance(data, Mapping) else None
+    body, status_code = token_request(data, per_token)
+    return Response(body, status=status_code)
@@ -1,107 +1,266 @@
+import asyncio
 import logging
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from django.conf import settings
-from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 import time
-import jwt
+from ..authentication import StatelessJWTAuthentication, verify_token
+from ..throttling import LifecycleBulkThrottle, LifecycleThrottle
+from ..user_stores import get_user_store
+from ..utils.fast_json import dumps, loads
+from ..utils.passwords import PasswordHasherBusy, hash_password, verify_password
+from ..utils.server_timing import ServerTiming, get_server_timing
 
 logger = logging.getLogger(__name__)
 
-# Mock database to store users for testing
-test_users = {}
-
 def validate_token(token):
     """Validate the provided token."""
-    # In dev mode, accept test-token
-    if settings.DEBUG and token == 'test-token':
-        return True
-        
-    # In production or for other tokens, validate JWT
-    try:
-        jwt.decode(token, settings.JWT_SECRET, algorithms=['HS256'])
-        return True
-    except jwt.InvalidTokenError:
-        return False
+    return verify_token(token) is not None
+
+def _unauthenticated_response():
+    return Response({
+        "error": "Missing or invalid Authorization header",
+        "message": "Please provide a valid Bearer token"
+    }, status=status.HTTP_401_UNAUTHORIZED)
+
+def wants_timings(params):
+    return params.get('timings', '').lower() in ('1', 'true', 'yes')
+
+def run_lifecycle(username, password, timing=None):
+    """
+    Run signup -> signin -> delete for one user and return (body, status code).
+
+    Each step is recorded on ``timing`` (a ServerTiming) when one is given.
+    """
+    timing = timing or ServerTiming()
+    if not username or not password:
+        return {
+            "error": "Missing credentials",
+            "message": "Username and password are required"
+        }, status.HTTP_400_BAD_REQUEST
+
+    store = get_user_store()
+
+    # Step 1: Sign up
+    with timing.measure('signup', 'Sign up'):
+        created = store.create(username, {
+            'password': hash_password(password),
+            'created_at': time.time()
+        })
+    if not created:
+        return {
+            "error": "User exists",
+            "message": f"User {username} already exists"
+        }, status.HTTP_400_BAD_REQUEST
+
+    # Step 2: Sign in
+    with timing.measure('signin', 'Sign in'):
+        stored_user = store.get(username)
+        signed_in = bool(stored_user) and verify_password(password, stored_user['password'])
+    if not signed_in:
+        return {
+            "error": "Invalid credentials",
+            "message": "Invalid username or password"
+        }, status.HTTP_401_UNAUTHORIZED
+
+    # Step 3: Delete
+    with timing.measure('delete', 'Delete'):
+        store.delete(username)
+        # Verify deletion
+        deleted = store.get(username) is None
+    if not deleted:
+        return {
+            "error": "Deletion failed",
+            "message": f"Failed to delete user {username}"
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    # Return success response with all lifecycle events
+    return {
+        "message": "User lifecycle test completed successfully",
+        "details": {
+            "signup": "success",
+            "signin": "success",
+            "delete": "success"
+        }
+    }, status.HTTP_200_OK
 
 @api_view(['POST'])
-@authentication_classes([])
+@authentication_classes([StatelessJWTAuthentication])
 @permission_classes([AllowAny])
+@throttle_classes([LifecycleThrottle])
 def test_user_lifecycle(request):
     """Test the full user lifecycle (signup -> signin -> delete)"""
     try:
-        # Check for Authorization header
-        auth_header = request.headers.get('Authorization', request.META.get('HTTP_AUTHORIZATION', ''))
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return Response({
-                "error": "Missing or invalid Authorization header",
-                "message": "Please provide a valid Bearer token"
-            }, status=status.HTTP_401_UNAUTHORIZED)
-            
-        # Extract and validate the token
-        token = auth_header.split(' ')[1]
-        
-        if not validate_token(token):
-            return Response({
-                "error": "Invalid token",
-                "message": "Please provide a valid token"
-            }, status=status.HTTP_401_UNAUTHORIZED)
+        # StatelessJWTAuthentication already rejected invalid tokens; an
+        # anonymous user here means no usable Bearer header was sent
+        if not getattr(request.user, 'is_authenticated', False):
+            return _unauthenticated_response()
 
         # Get username and password from request
         data = request.data
-        username = data.get('username')
-        password = data.get('password')
-
-        if not username or not password:
-            return Response({
-                "error": "Missing credentials",
-                "message": "Username and password are required"
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Step 1: Sign up
-        if username in test_users:
-            return Response({
-                "error": "User exists",
-                "message": f"User {username} already exists"
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        test_users[username] = {
-            'password': password,
-            'created_at': time.time()
-        }
-
-        # Step 2: Sign in
-        stored_user = test_users.get(username)
-        if not stored_user or stored_user['password'] != password:
-            return Response({
-                "error": "Invalid credentials",
-                "message": "Invalid username or password"
-            }, status=status.HTTP_401_UNAUTHORIZED)
+        if not isinstance(data, Mapping):
+            return Response({"detail": "JSON body must be an object"}, status=status.HTTP_400_BAD_REQUEST)
+        timing = get_server_timing(request)
+        body, status_code = run_lifecycle(data.get('username'), data.get('password'), timing)
+        if wants_timings(request.query_params) and 'details' in body:
+            body['details']['timings_ms'] = timing.as_dict()
+        return Response(body, status=status_code)
 
-        # Step 3: Delete
-        del test_users[username]
-
-        # Verify deletion
-        if username in test_users:
-            return Response({
-                "error": "Deletion failed",
-                "message": f"Failed to delete user {username}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # Return success response with all lifecycle events
+    except PasswordHasherBusy as e:
+        logger.warning(f"Password hashing saturated: {str(e)}")
         return Response({
-            "message": "User lifecycle test completed successfully",
-            "details": {
-                "signup": "success",
-                "signin": "success",
-                "delete": "success"
-            }
-        }, status=status.HTTP_200_OK)
-        
+            "error": "Server busy",
+            "message": "Password hashing capacity exhausted, retry shortly"
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
     except Exception as e:
         error_msg = f"Error in user lifecycle test: {str(e)}"
         logger.error(error_msg)
         return Response({
             "error": error_msg
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR) 
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def iter_ndjson(stream):
+    """Yield one parsed object (or the decoding error) per non-empty line"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield loads(line)
+        except ValueError as e:
+            yield e
+
+def _run_bulk_item(index, item, include_timings=False):
+    if isinstance(item, ValueError):
+        body, status_code = {"error": "Invalid JSON line", "message": str(item)}, status.HTTP_400_BAD_REQUEST
+    elif not isinstance(item, dict):
+        body, status_code = {"error": "Invalid entry", "message": "Each entry must be an object"}, status.HTTP_400_BAD_REQUEST
+    else:
+        try:
+            timing = ServerTiming()
+            body, status_code = run_lifecycle(item.get('username'), item.get('password'), timing)
+            if include_timings and 'details' in body:
+                body['details']['timings_ms'] = timing.as_dict()
+        except PasswordHasherBusy as e:
+            body, status_code = {"error": "Server busy", "message": str(e)}, status.HTTP_503_SERVICE_UNAVAILABLE
+        except Exception as e:
+            logger.error(f"Error in bulk user lifecycle test: {str(e)}")
+            body, status_code = {"error": f"Error in user lifecycle test: {str(e)}"}, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    username = item.get('username') if isinstance(item, dict) else None
+    return {"index": index, "username": username, "status": status_code, **body}
+
+def bulk_credentials(data, max_users):
+    """Return (credentials, None) for a parsed JSON body, or (None, error body) for a 400"""
+    credentials = data.get('users') if isinstance(data, dict) else data
+    if not isinstance(credentials, list):
+        return None, {
+            "error": "Invalid payload",
+            "message": "Send a JSON array of credentials or an application/x-ndjson stream"
+        }
+    if len(credentials) > max_users:
+        return None, {
+            "error": "Too many users",
+            "message": f"At most {max_users} users per request"
+        }
+    return credentials, None
+
+def _bulk_line(result, summary):
+    summary["succeeded" if result["status"] == status.HTTP_200_OK else "failed"] += 1
+    return dumps(result) + b"\n"
+
+def _stream_bulk_results(credentials, workers, max_users, include_timings=False):
+    """Run lifecycles with at most ``workers`` in flight, yielding NDJSON lines as they finish"""
+    summary = {"total": 0, "succeeded": 0, "failed": 0}
+
+    def finished(futures):
+        for future in futures:
+            yield _bulk_line(future.result(), summary)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lifecycle-bulk') as executor:
+        pending = set()
+        for index, item in enumerate(credentials):
+            if index >= max_users:
+                summary["truncated"] = True
+                break
+            # Only pull the next credential once a worker is free, so the
+            # request body is consumed no faster than we can process it
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from finished(done)
+            pending.add(executor.submit(_run_bulk_item, index, item, include_timings))
+            summary["total"] += 1
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from finished(done)
+
+    yield dumps({"summary": summary}) + b"\n"
+
+async def astream_bulk_results(credentials, workers, max_users, include_timings=False):
+    """
+    ``_stream_bulk_results`` as an async generator, for the async view.
+
+    The lifecycles still run in a thread pool; the event loop awaits them,
+    so ASGI servers send each line as it is produced.
+    """
+    summary = {"total": 0, "succeeded": 0, "failed": 0}
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lifecycle-bulk')
+    pending = set()
+    try:
+        for index, item in enumerate(credentials):
+            if index >= max_users:
+                summary["truncated"] = True
+                break
+            if len(pending) >= workers:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield _bulk_line(future.result(), summary)
+            pending.add(asyncio.wrap_future(executor.submit(_run_bulk_item, index, item, include_timings)))
+            summary["total"] += 1
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield _bulk_line(future.result(), summary)
+    finally:
+        # A client that disconnects mid-stream closes the generator; drop
+        # the lifecycles it will never read instead of finishing them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    yield dumps({"summary": summary}) + b"\n"
+
+@api_view(['POST'])
+@authentication_classes([StatelessJWTAuthentication])
+@permission_classes([AllowAny])
+@throttle_classes([LifecycleBulkThrottle])
+def test_user_lifecycle_bulk(request):
+    """
+    Run the user lifecycle for many users, streaming one NDJSON result per user.
+
+    Accepts a JSON array (or {"users": [...]}) of {"username", "password"}
+    objects, or an ``application/x-ndjson`` body with one object per line,
+    which is read incrementally rather than buffered. ``?timings=1`` adds
+    per-step durations to each result's details.
+    """
+    if not getattr(request.user, 'is_authenticated', False):
+        return _unauthenticated_response()
+
+    max_users = settings.LIFECYCLE_BULK_MAX_USERS
+    if request.content_type.startswith('application/x-ndjson'):
+        credentials = iter_ndjson(request.stream)
+    else:
+        credentials, error = bulk_credentials(request.data, max_users)
+        if error:
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
+
+    return StreamingHttpResponse(
+        _stream_bulk_results(credentials, settings.LIFECYCLE_BULK_WORKERS, max_users, wants_timings(request.query_params)),
+        content_type='application/x-ndjson'
+    )
@@ -1,6 +1,13 @@
 from rest_framework.views import APIView
-from django.http import JsonResponse
+from ..utils.constant_json import ConstantJSONView
+from ..utils.fast_json import FastJsonResponse
+
+API_MESSAGE = {"message": "API is working!"}
+
+# What /api/ and /api/test/ route to: pre-encoded, with ETag/304 and no DRF dispatch
+api_message = ConstantJSONView(API_MESSAGE)
+
 
 class APITest(APIView):
     def get(self, request):
-        return JsonResponse({"message": "API is working!"})
\ No newline at end of file
+        return FastJsonResponse(API_MESSAGE)
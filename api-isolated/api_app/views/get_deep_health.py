@@ -0,0 +1,141 @@
+import logging
+import os
+import threading
+import time
+import jwt
+from concurrent.futures import ThreadPoolExecutor, wait
+from django.conf import settings
+from django.db import connections
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from ..utils.single_flight import SingleFlight
+from ..utils.supabase_prober import probe_supabase
+from ..utils.supabase_transport import supabase_request
+
+logger = logging.getLogger(__name__)
+
+
+def check_database(budget):
+    """Run a trivial query on the default database"""
+    connection = connections['default']
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    finally:
+        # Executor threads never see request_finished, so nothing else would
+        # hand a pooled connection back (or close a persistent one)
+        connection.close()
+
+
+def check_supabase_rest(budget):
+    """Probe Supabase REST with the configured lightweight strategy"""
+    snapshot = probe_supabase(timeout=budget)
+    if not snapshot['connected']:
+        raise ConnectionError(snapshot['error'])
+
+
+def check_supabase_auth(budget):
+    """Ask Supabase auth (GoTrue) for its health status"""
+    response = supabase_request('GET', '/auth/v1/health', timeout=budget)
+    if response.status_code != 200:
+        raise ConnectionError(f"Supabase auth returned {response.status_code}")
+
+
+def check_jwt_signing(budget):
+    """Sign and verify a short-lived token with JWT_SECRET"""
+    token = jwt.encode({'health': True, 'exp': int(time.time()) + 60}, settings.JWT_SECRET, algorithm='HS256')
+    jwt.decode(token, settings.JWT_SECRET, algorithms=['HS256'])
+
+
+DEPENDENCY_CHECKS = {
+    'database': check_database,
+    'supabase_rest': check_supabase_rest,
+    'supabase_auth': check_supabase_auth,
+    'jwt': check_jwt_signing,
+}
+
+# Concurrent deep checks share each dependency's in-flight check
+_checks_in_flight = SingleFlight('deep_health')
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return this process's probe thread pool, rebuilding it after a fork"""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.DEEP_HEALTH_WORKERS,
+                    thread_name_prefix='deep-health'
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def _run_check(check, budget):
+    started = time.monotonic()
+    try:
+        check(budget)
+        outcome = {"status": "ok", "message": ""}
+    except Exception as e:
+        logger.error(f"Deep health check failed: {str(e)}")
+        outcome = {"status": "error", "message": str(e)}
+    latency = time.monotonic() - started
+    if outcome["status"] == "ok" and latency > budget:
+        outcome.update({"status": "slow", "message": f"Exceeded latency budget of {budget * 1000:.0f}ms"})
+    outcome["latency_ms"] = round(latency * 1000, 3)
+    return outcome
+
+
+@api_view(['GET'])
+def deep_health_check(request):
+    """
+    Check every dependency concurrently and report per-dependency status and timing
+    """
+    started = time.monotonic()
+    budget = settings.DEEP_HEALTH_PROBE_BUDGET
+    deadline = settings.DEEP_HEALTH_DEADLINE
+
+    executor = get_executor()
+    futures = {
+        name: executor.submit(_checks_in_flight.do, name, _run_check, check, budget)
+        for name, check in DEPENDENCY_CHECKS.items()
+    }
+    wait(futures.values(), timeout=deadline)
+
+    checks = {}
+    for name, future in futures.items():
+        if future.done():
+            checks[name] = future.result()
+        else:
+            future.cancel()
+            checks[name] = {
+                "status": "timeout",
+                "message": f"No result within the {deadline * 1000:.0f}ms deadline",
+                "latency_ms": None
+            }
+
+    statuses = {check["status"] for check in checks.values()}
+    if statuses <= {"ok"}:
+        overall = "healthy"
+    elif statuses <= {"ok", "slow"}:
+        overall = "degraded"
+    else:
+        overall = "unhealthy"
+
+    response_data = {
+        "status": overall,
+        "duration_ms": round((time.monotonic() - started) * 1000, 3),
+        "probe_budget_ms": budget * 1000,
+        "deadline_ms": deadline * 1000,
+        "checks": checks
+    }
+    if overall == "unhealthy":
+        return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response(response_data)
@@ -0,0 +1,9 @@
+from django.http import HttpResponse
+from ..utils import metrics
+
+def get_metrics(request):
+    """Expose request and Supabase probe metrics for every worker on this dyno"""
+    return HttpResponse(
+        metrics.render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
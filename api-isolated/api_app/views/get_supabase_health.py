@@ -2,42 +2,64 @@ from django.conf import settings
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-import requests
+from datetime import datetime, timezone
+import time
 import logging
+from ..utils.supabase_prober import get_prober
 
 logger = logging.getLogger(__name__)
 
-@api_view(['GET'])
-def health_check(request):
-    """
-    Simple health check endpoint that verifies Supabase connection
-    """
-    response_data = {
+def _base_response_data():
+    return {
         "status": "unhealthy",
         "message": "",
         "supabase_connected": False,
         "supabase_url_configured": bool(settings.SUPABASE_URL),
         "supabase_key_configured": bool(settings.SUPABASE_KEY)
     }
-    
-    try:
-        if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
-            response_data["message"] = "Missing Supabase configuration"
-            return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # Just check if we can reach the Supabase URL
-        headers = {"apikey": settings.SUPABASE_KEY}
-        requests.get(f"{settings.SUPABASE_URL}/rest/v1/", headers=headers, timeout=5)
-        
-        # If we got here, the connection is working
-        response_data.update({
-            "status": "healthy",
-            "message": "API is configured with Supabase",
-            "supabase_connected": True
-        })
-        return Response(response_data)
-        
-    except requests.RequestException as e:
-        logger.error(f"Error checking Supabase health: {str(e)}")
-        response_data["message"] = f"Error connecting to Supabase: {str(e)}"
-        return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR) 
\ No newline at end of file
+
+def missing_config_response():
+    """Return (body, status) when Supabase is not configured, else None"""
+    if settings.SUPABASE_URL and settings.SUPABASE_KEY:
+        return None
+    response_data = _base_response_data()
+    response_data["message"] = "Missing Supabase configuration"
+    return response_data, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+def snapshot_response(snapshot):
+    """Return (body, status) describing a prober snapshot"""
+    response_data = _base_response_data()
+    response_data.update({
+        "checked_at": datetime.fromtimestamp(snapshot['checked_at'], tz=timezone.utc).isoformat(),
+        "snapshot_age_seconds": round(time.monotonic() - snapshot['checked_monotonic'], 3),
+        "circuit_state": snapshot.get('circuit_state', 'closed'),
+        "probe": {
+            "strategy": snapshot.get('strategy'),
+            "latency_ms": round(snapshot['latency_ms'], 3),
+            "bytes_transferred": snapshot.get('bytes_transferred', 0)
+        }
+    })
+
+    if not snapshot['connected']:
+        response_data["message"] = f"Error connecting to Supabase: {snapshot['error']}"
+        return response_data, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    response_data.update({
+        "status": "healthy",
+        "message": "API is configured with Supabase",
+        "supabase_connected": True
+    })
+    return response_data, status.HTTP_200_OK
+
+@api_view(['GET'])
+def health_check(request):
+    """
+    Simple health check endpoint that reports the cached Supabase connection status
+    """
+    missing = missing_config_response()
+    if missing:
+        return Response(missing[0], status=missing[1])
+
+    # Answer from the background prober's snapshot instead of calling Supabase
+    body, status_code = snapshot_response(get_prober().snapshot())
+    return Response(body, status=status_code)
@@ -1,6 +1,7 @@
-from django.http import JsonResponse
 from django.conf import settings
 import os
+from ..utils.fast_json import FastJsonResponse
+from ..utils.supabase_transport import get_transport_stats
 
 def test_supabase_config(request):
     """Test view to check Supabase configuration"""
@@ -10,5 +11,6 @@ def test_supabase_config(request):
         'has_jwt_secret': bool(settings.SUPABASE_JWT_SECRET),
         'has_anon_key': bool(os.getenv('SUPABASE_ANON_KEY')),
         'env_file_loaded': bool(os.getenv('DJANGO_SECRET_KEY')),
+        'transport': get_transport_stats(),
     }
-    return JsonResponse(config) 
\ No newline at end of file
+    return FastJsonResponse(config) 
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+``DATABASES['default']`` for each DATABASE_POOL_MODE.
+
+    persistent   - one connection per worker thread, kept for CONN_MAX_AGE
+    pool         - an in-process pool per worker (api_app.db_backends.postgresql_pool);
+                   connections go back to it at the end of every request
+    transaction  - for a PgBouncer/Supavisor pooler in transaction mode
+                   (Supabase's port 6543): server-side cursors are disabled
+                   because the next transaction may land on another backend
+
+Prepared statements need no handling in any mode: psycopg2 binds parameters
+client side and never prepares statements on the server. Session settings
+are the other hazard behind a transaction pooler; TIME_ZONE is UTC like
+Supabase's server default, so Django never issues ``SET TIME ZONE``.
+
+Modes other than ``persistent`` only change PostgreSQL URLs; the SQLite
+fallback is returned as is.
+"""
+import dj_database_url
+
+POOL_MODES = ('persistent', 'pool', 'transaction')
+POOL_ENGINE = 'api_app.db_backends.postgresql_pool'
+
+
+def database_config(url, mode='persistent', conn_max_age=600, pool_max_size=10, pool_timeout=5.0, pool_max_idle=300):
+    """Parse ``url`` and apply the connection handling ``mode`` asks for"""
+    if mode not in POOL_MODES:
+        raise ValueError(f"DATABASE_POOL_MODE must be one of {', '.join(POOL_MODES)}")
+
+    # Health checks ping a reused connection once per request before using it
+    config = dj_database_url.parse(url, conn_max_age=conn_max_age, conn_health_checks=True)
+    if mode == 'persistent' or config['ENGINE'] != 'django.db.backends.postgresql':
+        return config
+
+    if mode == 'pool':
+        config['ENGINE'] = POOL_ENGINE
+        # "Closing" after each request returns the connection to the pool
+        config['CONN_MAX_AGE'] = 0
+        config['POOL'] = {
+            'max_size': pool_max_size,
+            'timeout': pool_timeout,
+            'max_idle': pool_max_idle,
+        }
+    else:
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return config
@@ -12,12 +12,15 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 import os
-import dj_database_url
-from dotenv import load_dotenv
+import tempfile
+from .database import database_config
 from datetime import timedelta
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file. Heroku dynos (DYNO is set) get
+# config vars instead, so skip importing dotenv and searching for the file.
+if not os.getenv('DYNO'):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -43,7 +46,16 @@ APPEND_SLASH = True
 
 # Application definition
 
-INSTALLED_APPS = [
+# DJANGO_API_ONLY=True serves the JSON API without the admin's machinery:
+# no sessions, messages, CSRF cookies or clickjacking headers, none of which
+# a token-authenticated or anonymous JSON endpoint uses. The admin stays off
+# in that profile unless DJANGO_ENABLE_ADMIN=True, which brings back the
+# full stack it depends on.
+API_ONLY = os.getenv('DJANGO_API_ONLY', 'False') == 'True'
+ENABLE_ADMIN = os.getenv('DJANGO_ENABLE_ADMIN', 'False' if API_ONLY else 'True') == 'True'
+SLIM_STACK = API_ONLY and not ENABLE_ADMIN
+
+FULL_INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -56,9 +68,26 @@ INSTALLED_APPS = [
     'api_app',
 ]
 
-MIDDLEWARE = [
+# Apps and middleware that only the admin and cookie sessions need
+ADMIN_ONLY_APPS = [
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+]
+ADMIN_ONLY_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+FULL_MIDDLEWARE = [
+    'api_app.middleware.MetricsMiddleware',  # First, so it times the whole stack
+    'api_app.middleware.ServerTimingMiddleware',
+    'api_app.middleware.CompressionMiddleware',  # Before anything else that touches the body
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Add whitenoise for static files
+    'api_app.middleware.StaticFilesMiddleware',  # WhiteNoise static files, async-capable
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -68,6 +97,12 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+API_ONLY_INSTALLED_APPS = [app for app in FULL_INSTALLED_APPS if app not in ADMIN_ONLY_APPS]
+API_ONLY_MIDDLEWARE = [name for name in FULL_MIDDLEWARE if name not in ADMIN_ONLY_MIDDLEWARE]
+
+INSTALLED_APPS = API_ONLY_INSTALLED_APPS if SLIM_STACK else FULL_INSTALLED_APPS
+MIDDLEWARE = API_ONLY_MIDDLEWARE if SLIM_STACK else FULL_MIDDLEWARE
+
 ROOT_URLCONF = 'api_project.urls'
 
 TEMPLATES = [
@@ -80,8 +115,7 @@ TEMPLATES = [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
+            ] + ([] if SLIM_STACK else ['django.contrib.messages.context_processors.messages']),
         },
     },
 ]
@@ -92,10 +126,22 @@ WSGI_APPLICATION = 'api_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DATABASE_POOL_MODE picks how connections are held (see api_project/database.py):
+#   persistent  - one connection per worker thread for DATABASE_CONN_MAX_AGE (default)
+#   pool        - an in-process pool of up to DATABASE_POOL_MAX_SIZE connections per
+#                 worker; a request waits DATABASE_POOL_TIMEOUT seconds for one
+#   transaction - DATABASE_URL points at a transaction-mode pooler (Supavisor/PgBouncer)
+# Reused connections are health-checked in every mode.
+DATABASE_POOL_MODE = os.getenv('DATABASE_POOL_MODE', 'persistent')
+
 DATABASES = {
-    'default': dj_database_url.config(
-        default=os.getenv('DATABASE_URL', 'sqlite:////' + str(BASE_DIR / 'db.sqlite3')),
-        conn_max_age=600
+    'default': database_config(
+        os.getenv('DATABASE_URL', 'sqlite:////' + str(BASE_DIR / 'db.sqlite3')),
+        mode=DATABASE_POOL_MODE,
+        conn_max_age=int(os.getenv('DATABASE_CONN_MAX_AGE', '600')),
+        pool_max_size=int(os.getenv('DATABASE_POOL_MAX_SIZE', '10')),
+        pool_timeout=float(os.getenv('DATABASE_POOL_TIMEOUT', '5')),
+        pool_max_idle=int(os.getenv('DATABASE_POOL_MAX_IDLE', '300')),
     )
 }
 
@@ -161,13 +207,144 @@ SUPABASE_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET')
 if not SUPABASE_URL or not SUPABASE_KEY:
     raise ValueError("Supabase URL and Key must be set in environment variables")
 
+# Shared Supabase HTTP transport (one keep-alive pool per worker process)
+SUPABASE_HTTP_POOL_SIZE = int(os.getenv('SUPABASE_HTTP_POOL_SIZE', '10'))
+SUPABASE_HTTP_RETRIES = int(os.getenv('SUPABASE_HTTP_RETRIES', '2'))
+SUPABASE_HTTP_BACKOFF = float(os.getenv('SUPABASE_HTTP_BACKOFF', '0.2'))
+SUPABASE_HTTP_CONNECT_TIMEOUT = float(os.getenv('SUPABASE_HTTP_CONNECT_TIMEOUT', '3.05'))
+SUPABASE_HTTP_READ_TIMEOUT = float(os.getenv('SUPABASE_HTTP_READ_TIMEOUT', '5'))
+
+# Async serving path. gunicorn.conf.py (for uvicorn workers) and
+# api_project/asgi.py turn DJANGO_ASYNC_VIEWS on, so the
+# same URLs route to native async views under uvicorn and to the DRF views
+# under WSGI. Async views share one httpx client per event loop, allowing up
+# to SUPABASE_ASYNC_MAX_CONNECTIONS concurrent Supabase connections.
+ASYNC_VIEWS = os.getenv('DJANGO_ASYNC_VIEWS', 'False') == 'True'
+SUPABASE_ASYNC_MAX_CONNECTIONS = int(os.getenv('SUPABASE_ASYNC_MAX_CONNECTIONS', '100'))
+
+# Cache-Control sent with constant bodies such as /api/ (ETag'd, 304 on a
+# match). "no-cache" lets clients keep the body but revalidate every time,
+# so an uptime check still reaches the dyno, for the price of a 304.
+CONSTANT_RESPONSE_CACHE_CONTROL = os.getenv('CONSTANT_RESPONSE_CACHE_CONTROL', 'no-cache')
+
+# Response compression (gzip, or Brotli when the client accepts it) for JSON,
+# NDJSON and text bodies of at least COMPRESSION_MIN_SIZE bytes. The levels
+# are tuned for dynamic responses: Brotli's default quality 11 costs far more
+# CPU than the bytes it saves over quality 4 are worth.
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4'))
+
+# Supabase health probing
+# Seconds between background reachability probes (0 probes on every request)
+SUPABASE_HEALTH_PROBE_INTERVAL = float(os.getenv('SUPABASE_HEALTH_PROBE_INTERVAL', '15'))
+SUPABASE_HEALTH_PROBE_TIMEOUT = float(os.getenv('SUPABASE_HEALTH_PROBE_TIMEOUT', '5'))
+# How to probe: 'head' (headers only), 'stream' (GET closed after headers),
+# 'rpc' (POST to SUPABASE_HEALTH_PROBE_RPC) or 'get' (downloads the full
+# PostgREST OpenAPI document)
+SUPABASE_HEALTH_PROBE_STRATEGY = os.getenv('SUPABASE_HEALTH_PROBE_STRATEGY', 'head')
+SUPABASE_HEALTH_PROBE_RPC = os.getenv('SUPABASE_HEALTH_PROBE_RPC', 'health_ping')
+
+if SUPABASE_HEALTH_PROBE_STRATEGY not in ('head', 'stream', 'rpc', 'get'):
+    raise ValueError(f"Unknown SUPABASE_HEALTH_PROBE_STRATEGY: {SUPABASE_HEALTH_PROBE_STRATEGY}")
+
+# Deep health endpoint: every dependency is probed concurrently; a probe
+# slower than the budget is reported as slow, and anything still running at
+# the deadline is reported as timed out
+DEEP_HEALTH_PROBE_BUDGET = float(os.getenv('DEEP_HEALTH_PROBE_BUDGET', '1'))
+DEEP_HEALTH_DEADLINE = float(os.getenv('DEEP_HEALTH_DEADLINE', '3'))
+DEEP_HEALTH_WORKERS = int(os.getenv('DEEP_HEALTH_WORKERS', '8'))
+
+# Circuit breaker around the Supabase probe: open when the failure (or slow
+# call) rate over the last N probes reaches the threshold, then fail fast for
+# the cool-down before letting a single trial probe through
+SUPABASE_BREAKER_FAILURE_RATE = float(os.getenv('SUPABASE_BREAKER_FAILURE_RATE', '0.5'))
+SUPABASE_BREAKER_SLOW_CALL_SECONDS = float(os.getenv('SUPABASE_BREAKER_SLOW_CALL_SECONDS', '2'))
+SUPABASE_BREAKER_WINDOW = int(os.getenv('SUPABASE_BREAKER_WINDOW', '10'))
+SUPABASE_BREAKER_MINIMUM_CALLS = int(os.getenv('SUPABASE_BREAKER_MINIMUM_CALLS', '3'))
+SUPABASE_BREAKER_COOLDOWN = float(os.getenv('SUPABASE_BREAKER_COOLDOWN', '30'))
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Verifies the bearer token and builds the user from its claims,
+        # without a user-table query per request
+        'api_app.authentication.StatelessJWTAuthentication',
     ),
+    # orjson-backed JSON (api_app.utils.fast_json); the browsable API and
+    # form parsers stay as DRF's defaults
+    'DEFAULT_RENDERER_CLASSES': (
+        'api_app.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api_app.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Heroku's router appends the client address to X-Forwarded-For; the
+    # throttles key clients by the address it added, not ones a client sent
+    'NUM_PROXIES': int(os.getenv('THROTTLE_NUM_PROXIES', '1')),
 }
 
+# Token-bucket limits on the auth views (api_app.throttling), shared by every
+# worker on the dyno through a SQLite file (on tmpfs when /dev/shm exists).
+# "<scope>" limits each client IP and "<scope>_global" the whole dyno; a
+# bucket holds THROTTLE_BURST_SECONDS worth of its rate. Over the limit the
+# views answer 429 with Retry-After.
+THROTTLE_ENABLED = os.getenv('THROTTLE_ENABLED', 'True') == 'True'
+THROTTLE_RATES = {
+    'auth_token': os.getenv('THROTTLE_AUTH_TOKEN', '20/s'),
+    'auth_token_global': os.getenv('THROTTLE_AUTH_TOKEN_GLOBAL', '500/s'),
+    'auth_test': os.getenv('THROTTLE_AUTH_TEST', '2/s'),
+    'auth_test_global': os.getenv('THROTTLE_AUTH_TEST_GLOBAL', '20/s'),
+    'auth_test_bulk': os.getenv('THROTTLE_AUTH_TEST_BULK', '6/m'),
+    'auth_test_bulk_global': os.getenv('THROTTLE_AUTH_TEST_BULK_GLOBAL', '1/s'),
+}
+THROTTLE_BURST_SECONDS = float(os.getenv('THROTTLE_BURST_SECONDS', '5'))
+THROTTLE_SQLITE_PATH = os.getenv(
+    'THROTTLE_SQLITE_PATH',
+    os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'antelope-throttle.sqlite3')
+)
+
+# Where /api/auth/test/ keeps its synthetic users:
+#   api_app.user_stores.LockStripedUserStore - in-process (per worker)
+#   api_app.user_stores.SQLiteUserStore      - WAL file shared by every worker on the dyno
+#   api_app.user_stores.SupabaseUserStore    - Supabase table via PostgREST
+USER_STORE_BACKEND = os.getenv('USER_STORE_BACKEND', 'api_app.user_stores.LockStripedUserStore')
+USER_STORE_SQLITE_PATH = os.getenv('USER_STORE_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'antelope-users.sqlite3'))
+USER_STORE_SUPABASE_TABLE = os.getenv('USER_STORE_SUPABASE_TABLE', 'lifecycle_test_users')
+
+# Lifecycle users that outlive their request (signup succeeded, delete never
+# ran) are swept every USER_STORE_SWEEP_INTERVAL seconds once older than
+# USER_STORE_TTL; the store is also capped at USER_STORE_MAX_ENTRIES with
+# least-recently-used eviction. 0 disables the sweeper, TTL or cap.
+USER_STORE_TTL = float(os.getenv('USER_STORE_TTL', '300'))
+USER_STORE_MAX_ENTRIES = int(os.getenv('USER_STORE_MAX_ENTRIES', '10000'))
+USER_STORE_SWEEP_INTERVAL = float(os.getenv('USER_STORE_SWEEP_INTERVAL', '30'))
+
+# Lifecycle password hashing: PBKDF2 work factor (keep it high in
+# production, tests override it), and whether hashing runs in a bounded
+# per-worker process pool instead of the request thread
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', '600000'))
+PASSWORD_HASH_OFFLOAD = os.getenv('PASSWORD_HASH_OFFLOAD', 'True') == 'True'
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '16'))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', '2'))
+PASSWORD_HASH_START_METHOD = os.getenv('PASSWORD_HASH_START_METHOD', 'forkserver')
+
+# Bulk lifecycle endpoint: users per request and concurrent lifecycles
+LIFECYCLE_BULK_MAX_USERS = int(os.getenv('LIFECYCLE_BULK_MAX_USERS', '10000'))
+LIFECYCLE_BULK_WORKERS = int(os.getenv('LIFECYCLE_BULK_WORKERS', '8'))
+
+# Batch minting limits for /api/auth/token/?count=N
+JWT_BATCH_MAX_COUNT = int(os.getenv('JWT_BATCH_MAX_COUNT', '1000'))
+JWT_BATCH_MAX_LIFETIME = int(os.getenv('JWT_BATCH_MAX_LIFETIME', '86400'))
+
+# Cache of already-verified bearer tokens (entries never outlive the token's exp)
+JWT_VERIFY_CACHE_SIZE = int(os.getenv('JWT_VERIFY_CACHE_SIZE', '1024'))
+JWT_VERIFY_CACHE_TTL = float(os.getenv('JWT_VERIFY_CACHE_TTL', '300'))
+
 # JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -184,6 +361,12 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Metrics: each worker dumps its registry into this directory (at most every
+# METRICS_FLUSH_INTERVAL seconds) so /api/metrics/ can merge the whole dyno.
+# An empty value keeps metrics per-process.
+METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'antelope-metrics'))
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '1'))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -0,0 +1,158 @@
+"""
+Gunicorn configuration, sized from the dyno it runs on.
+
+Gunicorn loads this file automatically from the working directory. Workers
+are sized from the CPUs and memory actually available to the container
+(cgroup limits first, then the host), and the worker class is chosen with
+GUNICORN_WORKER_CLASS:
+
+    sync     - one request per process; simplest, no keep-alive
+    gthread  - a few threads per process; default, overlaps Supabase I/O
+    uvicorn  - ASGI via uvicorn's worker, serving api_project.asgi
+
+See .docs/server_configuration.md for every setting and the load-test
+comparison of the three classes.
+"""
+import os
+import shutil
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+
+def _read_first_line(path):
+    try:
+        with open(path) as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def available_cpus():
+    """CPUs this process may use, honouring a cgroup CPU quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2 "max 100000" / "200000 100000", then cgroup v1
+    quota = _read_first_line('/sys/fs/cgroup/cpu.max')
+    if quota:
+        limit, period = (quota.split() + ['100000'])[:2]
+        if limit != 'max':
+            cpus = min(cpus, max(1, int(int(limit) / int(period))))
+    else:
+        limit = _read_first_line('/sys/fs/cgroup/cpu/cpu.cfs_quota_us')
+        period = _read_first_line('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+        if limit and period and int(limit) > 0:
+            cpus = min(cpus, max(1, int(int(limit) / int(period))))
+    return cpus
+
+
+def available_memory_mb():
+    """Memory available to the container in MB, or None if unknown"""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        value = _read_first_line(path)
+        # v1 reports a huge number when unlimited
+        if value and value != 'max' and int(value) < 1 << 60:
+            return int(value) // (1024 * 1024)
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemTotal:'):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def compute_workers(worker_class, cpus, memory_mb, worker_memory_mb):
+    """
+    Processes to run: a CPU-based target capped by how many fit in memory.
+
+    Sync workers block on every Supabase call, so they get the classic
+    2 * CPUs + 1; threaded and async workers overlap I/O inside a process
+    and only need about one per CPU (plus one for gthread to cover the GIL
+    hand-offs).
+    """
+    if worker_class == 'sync':
+        by_cpu = 2 * cpus + 1
+    elif worker_class == 'gthread':
+        by_cpu = cpus + 1
+    else:
+        by_cpu = cpus
+    if memory_mb:
+        by_cpu = min(by_cpu, memory_mb // worker_memory_mb)
+    return max(1, by_cpu)
+
+
+_worker_kind = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+if _worker_kind not in WORKER_CLASSES:
+    raise ValueError(f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}")
+
+# Sizing
+worker_class = WORKER_CLASSES[_worker_kind]
+workers = int(os.getenv('GUNICORN_WORKERS') or compute_workers(
+    _worker_kind,
+    available_cpus(),
+    available_memory_mb(),
+    int(os.getenv('GUNICORN_WORKER_MEMORY_MB', '128')),
+))
+threads = int(os.getenv('GUNICORN_THREADS', '4')) if _worker_kind == 'gthread' else 1
+
+# The uvicorn worker speaks ASGI, so it needs the ASGI entry point
+wsgi_app = 'api_project.asgi:application' if _worker_kind == 'uvicorn' else 'api_project.wsgi:application'
+# ...and the async views. asgi.py cannot turn them on itself: on_starting
+# loads the settings in the master, before any worker imports asgi.py
+raw_env = [f"DJANGO_ASYNC_VIEWS={os.getenv('DJANGO_ASYNC_VIEWS', 'True')}"] if _worker_kind == 'uvicorn' else []
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Connections: Heroku's router reuses keep-alive connections to the dyno
+# (ignored by sync workers); requests past the router's 30s are dropped
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '20'))
+
+# Recycle workers to bound slow leaks; jitter keeps them from restarting together
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# Heartbeat files on tmpfs so a slow disk cannot get workers killed
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+
+def on_starting(server):
+    # Metrics files from a previous run would be merged into this one's
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_project.settings')
+    from django.conf import settings
+
+    directory = settings.METRICS_MULTIPROC_DIR
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+    server.log.info(
+        f"Starting {workers} {_worker_kind} worker(s)"
+        + (f" x {threads} threads" if threads > 1 else '')
+        + f" for {wsgi_app}"
+    )
+
+
+def worker_exit(server, worker):
+    # Counters recorded since the last throttled flush would be lost otherwise
+    try:
+        from api_app.utils import metrics
+        metrics.flush(force=True)
+    except Exception as e:
+        server.log.warning(f"Could not flush metrics on worker exit: {str(e)}")
+    # Pooled connections would otherwise linger until Postgres notices the exit
+    try:
+        from api_app.db_backends.postgresql_pool.pool import close_pools
+        close_pools()
+    except Exception as e:
+        server.log.warning(f"Could not close pooled database connections: {str(e)}")
@@ -0,0 +1,11 @@
+-- Tiny RPC used by the API health probe (SUPABASE_HEALTH_PROBE_STRATEGY=rpc)
+-- so checking reachability does not make PostgREST render its OpenAPI schema.
+create or replace function public.health_ping()
+returns integer
+language sql
+stable
+as $$
+  select 1;
+$$;
+
+grant execute on function public.health_ping() to anon, authenticated, service_role;
@@ -0,0 +1,19 @@
+-- Backing table for USER_STORE_BACKEND=api_app.user_stores.SupabaseUserStore
+create table if not exists public.lifecycle_test_users (
+  username text primary key,
+  data jsonb not null,
+  created_at double precision not null
+);
+
+create index if not exists lifecycle_test_users_created_at_idx
+  on public.lifecycle_test_users (created_at);
+
+alter table public.lifecycle_test_users enable row level security;
+
+-- Only the API (service role) may read or write synthetic lifecycle users
+create policy "service role manages lifecycle test users"
+  on public.lifecycle_test_users
+  for all
+  to service_role
+  using (true)
+  with check (true);